@@ -1,44 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-from datetime import datetime, date
-import io
-
-# ══════════════════════════════════════════════════════
-# NASTAVENIA - uprav len toto!
-# ══════════════════════════════════════════════════════
-
-SHEET_ID = "1MB041dTwz-zfGg6u3wM1XpmrS_ynDe1J"
-
-# GID pre každý mesiac (1=január … 12=december)
-SHEET_GIDS = {
-    1:  "2041175941",
-    2:  "996148749",
-    3:  "1052948469",
-    4:  "1742234642",
-    5:  "1522704266",
-    6:  "318756165",
-    7:  "174620779",
-    8:  "1714534272",
-    9:  "2141494448",
-    10: "953926717",
-    11: "1911464342",
-    12: "33776211",
-}
-
-NAZVY_MESIACOV = {
-    1: "Január", 2: "Február", 3: "Marec", 4: "Apríl",
-    5: "Máj", 6: "Jún", 7: "Júl", 8: "August",
-    9: "September", 10: "Október", 11: "November", 12: "December"
-}
-
-# Počiatočné stavy skladu k 1.1.2026 (tony)
-POCIATOCNY_STAV = {
-    'BC': 955.94,
-    'BH': 222.42
-}
-
-# ══════════════════════════════════════════════════════
 
 st.set_page_config(
     page_title="Evidencia štiepky | HE",
@@ -48,7 +8,7 @@ st.set_page_config(
 )
 
 # CSS štýly — kompatibilné s light aj dark režimom
-st.markdown("""
+STYL = """
 <style>
     .main { padding-top: 1rem; }
 
@@ -97,175 +57,72 @@ st.markdown("""
         margin: 4px 0;
         font-size: 0.9rem;
     }
-</style>
-""", unsafe_allow_html=True)
-
-
-@st.cache_data(ttl=300)   # cache 5 minút
-def nacitaj_z_google_sheets(sheet_id: str, gid: str):
-    """Stiahne dáta priamo z Google Sheets (verejný link)"""
-    url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
-    try:
-        df = pd.read_csv(url)
-        return df, None
-    except Exception as e:
-        return None, str(e)
-
-
-def spracuj_data(df):
-    """Rozdelí a vyčistí dáta pre BC a BH"""
-    bc_cols = ['BC', 'Bodos', 'z Dreva HBP', 'Recyklácia', 'Jankula', 'Spotreba']
-    bh_cols = ['BH', 'Bodos.1', 'z Dreva HBP.1', 'Recyklácia.1', 'Jankula.1', 'Spotreba.1']
-
-    bc = df[bc_cols].copy()
-    bh = df[bh_cols].copy()
-    bc.columns = bh.columns = ['Datum', 'Bodos', 'z Dreva HBP', 'Recyklácia', 'Jankula', 'Spotreba']
-
-    for d in [bc, bh]:
-        d.drop(d[d['Datum'] == 'Spolu'].index, inplace=True, errors='ignore')
-        d['Datum'] = pd.to_datetime(d['Datum'], format='%m/%d/%Y', errors='coerce')
-        d.dropna(subset=['Datum'], inplace=True)
-        for col in ['Bodos', 'z Dreva HBP', 'Recyklácia', 'Jankula', 'Spotreba']:
-            d[col] = pd.to_numeric(
-                d[col].astype(str).str.replace(',', '.').str.strip(),
-                errors='coerce'
-            ).fillna(0)
-        d['Prijem_celkom'] = d[['Bodos', 'z Dreva HBP', 'Recyklácia', 'Jankula']].sum(axis=1)
 
-    return bc.reset_index(drop=True), bh.reset_index(drop=True)
-
-
-def nacitaj_mesiace(od_mesiaca: int, do_mesiaca: int):
-    """
-    Načíta a spracuje dáta pre rozsah mesiacov (vrátane oboch krajných).
-    Vráti spojené DataFramy pre BC a BH.
-    """
-    bc_all = []
-    bh_all = []
-    chyby = []
+    /* Mesačný prehľad — jedna tabuľka */
+    .month-table { width: 100%; table-layout: fixed; border-collapse: collapse; }
+    .month-table th, .month-table td {
+        border: none !important;
+        border-bottom: 1px solid rgba(128,128,128,0.2) !important;
+        padding: 6px 8px;
+        text-align: left;
+    }
+</style>
+"""
 
-    for mesiac in range(od_mesiaca, do_mesiaca + 1):
-        gid = SHEET_GIDS.get(mesiac)
-        if not gid:
-            continue
 
-        df_raw, chyba = nacitaj_z_google_sheets(SHEET_ID, gid)
-        if chyba:
-            chyby.append(f"{NAZVY_MESIACOV[mesiac]}: {chyba}")
-            continue
 
-        bc_m, bh_m = spracuj_data(df_raw)
-        if not bc_m.empty:
-            bc_all.append(bc_m)
-        if not bh_m.empty:
-            bh_all.append(bh_m)
+# Štýly a hlavička idú do prehliadača hneď — pri studenom štarte sa pandas
+# a výpočtové jadro (~0,5 s) načítavajú až za nimi, Plotly až v záložke Grafy.
+# Pri ďalších behoch sú moduly načítané a importy nič nestoja.
+st.markdown(STYL, unsafe_allow_html=True)
+st.title("🌲 Evidencia skladu štiepky")
 
-    bc_final = pd.concat(bc_all, ignore_index=True) if bc_all else pd.DataFrame()
-    bh_final = pd.concat(bh_all, ignore_index=True) if bh_all else pd.DataFrame()
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from datetime import date, datetime  # noqa: E402
+
+# Nastavenia (zošity, GID, počiatočné stavy) a výpočty sú v evidencia.py
+from evidencia import (  # noqa: E402
+    NAZVY_MESIACOV, PRVY_ROK, ZOSITY, CACHE_TTL, LOKALITY, TYP_TON, nazov_obdobia,
+    ZDROJ_CESTA, GoogleSheets, zdroj, aktualna_snimka,
+    vypocitaj, vypocitaj_mesacne_sumare,
+    Obnova, aktualnost, lttb_indexy,
+    METRIKY_PORT, meraj, stav_metrik, spusti_server_metrik,
+    API_PORT, spusti_api,
+    ZOSTAVY, export_xlsx, export_csv, knihy_obdobia,
+    POLOZKY, zapis_pohyb, zapisnik, presne_tony,
+)
 
-    return bc_final, bh_final, chyby
+# Nad koľko bodov sa rad v grafe zjednoduší (LTTB) a kreslí cez WebGL
+MAX_BODOV_GRAFU = 2000
 
+# Zrnitosti prehľadov na výber (z kocky knihy) a prívlastky do titulkov
+ZRNITOSTI_PREHLADU = {'tyzden': 'Týždne', 'mesiac': 'Mesiace', 'stvrtrok': 'Štvrťroky'}
+PRIVLASTOK_OBDOBIA = {'den': 'Denný', 'tyzden': 'Týždenný', 'mesiac': 'Mesačný',
+                      'stvrtrok': 'Štvrťročný', 'rok': 'Ročný'}
 
-def vypocitaj(data, lokalita, datum):
-    """
-    Vypočíta stav skladu k danému dátumu.
-    Rozdeľuje na:
-      - predchádzajúce mesiace → tvoria "počiatočný stav mesiaca"
-      - aktuálny mesiac (do vybraného dátumu) → príjem a spotreba mesiaca
-    """
-    filt = data[data['Datum'] <= pd.Timestamp(datum)]
-    if filt.empty:
-        return None
 
-    mesiac = datum.month
-    poc_orig = POCIATOCNY_STAV[lokalita]
-
-    # Dáta za predchádzajúce mesiace (< aktuálny mesiac)
-    predch = filt[filt['Datum'].dt.month < mesiac]
-    prijem_predch = predch['Prijem_celkom'].sum() if not predch.empty else 0
-    spotreba_predch = predch['Spotreba'].sum() if not predch.empty else 0
-
-    # Počiatočný stav aktuálneho mesiaca = pôvodný + predchádzajúce mesiace
-    poc_mesiac = poc_orig + prijem_predch - spotreba_predch
-
-    # Dáta za aktuálny mesiac (do vybraného dátumu vrátane)
-    aktualny = filt[filt['Datum'].dt.month == mesiac]
-    prijem_mesiac = aktualny['Prijem_celkom'].sum() if not aktualny.empty else 0
-    spotreba_mesiac = aktualny['Spotreba'].sum() if not aktualny.empty else 0
-
-    zostatok = poc_mesiac + prijem_mesiac - spotreba_mesiac
-
-    return {
-        'pociatocny_orig':  poc_orig,
-        'pociatocny':       poc_mesiac,
-        'prijem_celkom':    prijem_mesiac,
-        'prijem_bodos':     aktualny['Bodos'].sum() if not aktualny.empty else 0,
-        'prijem_dreva':     aktualny['z Dreva HBP'].sum() if not aktualny.empty else 0,
-        'prijem_recyklacia':aktualny['Recyklácia'].sum() if not aktualny.empty else 0,
-        'prijem_jankula':   aktualny['Jankula'].sum() if not aktualny.empty else 0,
-        'spotreba_celkom':  spotreba_mesiac,
-        'zostatok':         zostatok,
-        'mesiac':           mesiac,
-        'data_filtered':    filt
-    }
+def formatuj_tony(stlpec, nula=None):
+    """Stĺpec ton ako text '1,234.56' — celý stĺpec naraz, nuly prípadne ako `nula`."""
+    text = stlpec.map('{:,.2f}'.format)
+    return text if nula is None else text.mask(stlpec == 0, nula)
 
 
-def vypocitaj_mesacne_sumare(data, lokalita, do_datumu):
-    """
-    Vypočíta súhrn pre každý mesiac (príjem, spotreba, zostatok na konci mesiaca).
-    Vracia list slovníkov.
-    """
-    poc = POCIATOCNY_STAV[lokalita]
-    filt = data[data['Datum'] <= pd.Timestamp(do_datumu)].copy()
-    if filt.empty:
-        return []
-
-    filt['Mesiac'] = filt['Datum'].dt.month
-    mesiace = sorted(filt['Mesiac'].unique())
-
-    sumare = []
-    kumulativny_zostatok = poc
-
-    for m in mesiace:
-        m_data = filt[filt['Mesiac'] == m]
-        prijem = m_data['Prijem_celkom'].sum()
-        spotreba = m_data['Spotreba'].sum()
-        kumulativny_zostatok += prijem - spotreba
-        sumare.append({
-            'mesiac': m,
-            'nazov': NAZVY_MESIACOV[m],
-            'prijem': prijem,
-            'spotreba': spotreba,
-            'zmena': prijem - spotreba,
-            'zostatok': kumulativny_zostatok,
-            'dni': len(m_data)
-        })
-
-    return sumare
-
-
-def dashboard(stav, lokalita, datum, mesacne_sumare):
-    nazov = "Baňa Cigeľ" if lokalita == 'BC' else "Baňa Handlová"
+@meraj('vykreslenie.dashboard')
+def dashboard(stav, lokalita, datum, kniha):
+    nazov = LOKALITY[lokalita]['nazov']
     zostatok = stav['zostatok']
     mesiac_nazov = NAZVY_MESIACOV[stav['mesiac']]
 
-    # Farebné upozornenie podľa zostatku — rôzne limity pre BC a BH
-    if lokalita == 'BC':
-        # BC: väčšia spotreba
-        if zostatok > 300:
-            stav_ikona, stav_text = "🟢", "Zásoby v poriadku"
-        elif zostatok > 100:
-            stav_ikona, stav_text = "🟡", "Zásoby nízke – sleduj"
-        else:
-            stav_ikona, stav_text = "🔴", "⚠️ KRITICKY NÍZKE ZÁSOBY"
+    # Farebné upozornenie podľa zostatku — limity sú pre každú lokalitu iné
+    # (väčšia spotreba = vyššie limity)
+    zelena_nad, zlta, zlta_vratane = LOKALITY[lokalita]['limity']
+    if zostatok > zelena_nad:
+        stav_ikona, stav_text = "🟢", "Zásoby v poriadku"
+    elif zostatok > zlta or (zlta_vratane and zostatok == zlta):
+        stav_ikona, stav_text = "🟡", "Zásoby nízke – sleduj"
     else:
-        # BH: nižšia spotreba
-        if zostatok > 100:
-            stav_ikona, stav_text = "🟢", "Zásoby v poriadku"
-        elif zostatok >= 50:
-            stav_ikona, stav_text = "🟡", "Zásoby nízke – sleduj"
-        else:
-            stav_ikona, stav_text = "🔴", "⚠️ KRITICKY NÍZKE ZÁSOBY"
+        stav_ikona, stav_text = "🔴", "⚠️ KRITICKY NÍZKE ZÁSOBY"
 
     st.markdown(f"## 📊 {nazov} ({lokalita}) — {datum.strftime('%d.%m.%Y')}")
     st.markdown(f"**Stav zásob:** {stav_ikona} {stav_text}")
@@ -277,7 +134,7 @@ def dashboard(stav, lokalita, datum, mesacne_sumare):
     <div class="metric-big">
         <p>🎯 AKTUÁLNY ZOSTATOK NA SKLADE</p>
         <h1>{zostatok:,.2f} t</h1>
-        <p>{pct:.1f} % z počiatočného stavu (1.1.2026)</p>
+        <p>{pct:.1f} % z počiatočného stavu (1.1.{datum.year})</p>
     </div>
     """, unsafe_allow_html=True)
 
@@ -285,7 +142,7 @@ def dashboard(stav, lokalita, datum, mesacne_sumare):
 
     # Popis odkiaľ sa berie počiatočný stav
     if stav['mesiac'] == 1:
-        poc_label = "📦 Počiatočný stav (1.1.2026)"
+        poc_label = f"📦 Počiatočný stav (1.1.{datum.year})"
     else:
         predch_mesiac = NAZVY_MESIACOV[stav['mesiac'] - 1]
         poc_label = f"📦 Poč. stav ({mesiac_nazov}) = koniec {predch_mesiac}"
@@ -335,54 +192,67 @@ def dashboard(stav, lokalita, datum, mesacne_sumare):
         st.metric("Jankula", f"{stav['prijem_jankula']:,.2f} t",
                   delta=f"{pct_j:.1f} %")
 
-    # Mesačný prehľad
-    if mesacne_sumare and len(mesacne_sumare) > 1:
+    # Prehľad po týždňoch, mesiacoch alebo štvrťrokoch — výrez z kocky knihy
+    if len(kniha.suhrny('tyzden', do=datum)) > 1:
         st.divider()
-        st.markdown("### 📅 Prehľad po mesiacoch")
-
-        cols_header = st.columns([2, 2, 2, 2, 2])
-        with cols_header[0]:
-            st.markdown("**Mesiac**")
-        with cols_header[1]:
-            st.markdown("**Príjem [t]**")
-        with cols_header[2]:
-            st.markdown("**Spotreba [t]**")
-        with cols_header[3]:
-            st.markdown("**Zmena [t]**")
-        with cols_header[4]:
-            st.markdown("**Zostatok [t]**")
-
-        for s in mesacne_sumare:
-            cols_row = st.columns([2, 2, 2, 2, 2])
-            zmena_prefix = "+" if s['zmena'] >= 0 else ""
-            with cols_row[0]:
-                st.markdown(f"**{s['nazov']}** ({s['dni']} dní)")
-            with cols_row[1]:
-                st.markdown(f"📦 {s['prijem']:,.2f}")
-            with cols_row[2]:
-                st.markdown(f"🔥 {s['spotreba']:,.2f}")
-            with cols_row[3]:
-                color = "#06A77D" if s['zmena'] >= 0 else "#D62246"
-                st.markdown(f"<span style='color:{color};font-weight:bold'>{zmena_prefix}{s['zmena']:,.2f}</span>",
-                           unsafe_allow_html=True)
-            with cols_row[4]:
-                st.markdown(f"**{s['zostatok']:,.2f}**")
-
-
-def grafy(data, lokalita, datum):
-    filt = data[data['Datum'] <= pd.Timestamp(datum)].copy()
-    poc = POCIATOCNY_STAV[lokalita]
-    filt = filt.sort_values('Datum').reset_index(drop=True)
-    filt['Kum_prijem']   = filt['Prijem_celkom'].cumsum()
-    filt['Kum_spotreba'] = filt['Spotreba'].cumsum()
-    filt['Zostatok']     = poc + filt['Kum_prijem'] - filt['Kum_spotreba']
+        st.markdown("### 📅 Prehľad po obdobiach")
+        zrnitost = st.radio("Obdobia prehľadu:", list(ZRNITOSTI_PREHLADU), index=1,
+                            format_func=ZRNITOSTI_PREHLADU.get, horizontal=True,
+                            key="zrnitost_prehladu", label_visibility="collapsed")
+
+        # Jedna HTML tabuľka namiesto riadku stĺpcov pre každé obdobie
+        tab = kniha.suhrny(zrnitost, do=datum)
+        nazvy = pd.Series([nazov_obdobia(z, zrnitost) for z in tab.index], index=tab.index)
+        farba = tab['Zmena'].ge(0).map({True: '#06A77D', False: '#D62246'})
+        riadky = (
+            "<tr><td><b>" + nazvy + "</b> (" + tab['Dni'].astype(str) + " dní)</td>"
+            + "<td>📦 " + formatuj_tony(tab['Prijem_celkom']) + "</td>"
+            + "<td>🔥 " + formatuj_tony(tab['Spotreba']) + "</td>"
+            + "<td><span style='color:" + farba + ";font-weight:bold'>"
+            + tab['Zmena'].map('{:+,.2f}'.format) + "</span></td>"
+            + "<td><b>" + formatuj_tony(tab['Zostatok']) + "</b></td></tr>"
+        )
+        hlavicka = "".join(f"<th>{h}</th>" for h in
+                           ["Obdobie", "Príjem [t]", "Spotreba [t]", "Zmena [t]", "Zostatok [t]"])
+        st.markdown(
+            f"<table class='month-table'><thead><tr>{hlavicka}</tr></thead>"
+            f"<tbody>{''.join(riadky)}</tbody></table>",
+            unsafe_allow_html=True)
+
+
+def _suhrny_knih(knihy, zrnitost, od, do):
+    """Príjem a spotreba po obdobiach cez knihy viacerých rokov — obdobie na prelome rokov sa sčíta."""
+    casti = [k.suhrny(zrnitost, od, do)[['Prijem_celkom', 'Spotreba']] for k in knihy]
+    return casti[0] if len(casti) == 1 else pd.concat(casti).groupby(level=0).sum()
+
+
+@meraj('grafy.zostavenie')
+def zostav_grafy(knihy, od, do, zrnitost='mesiac'):
+    """
+    Štyri figúry grafov za obdobie od–do z kníh jeho rokov; stĺpce a koláč
+    sú výrezy z kocky kníh. Rady dlhšie ako MAX_BODOV_GRAFU sa zjednodušia
+    (LTTB) a kreslia cez WebGL, denné stĺpce sa nahradia týždennými — JSON
+    pre prehliadač ostáva ohraničený pri ľubovoľnej histórii. Graf 4 je
+    po `zrnitost`.
+    """
+    import plotly.graph_objects as go   # až pri prvom otvorení Grafov, potom už je načítané
+
+    rozsahy = [k.rozsah(od, do) for k in knihy]
+    datumy = np.concatenate([k.datumy[i:j] for k, (i, j) in zip(knihy, rozsahy)])
+    zostatky = np.concatenate([k.zostatky[i:j] for k, (i, j) in zip(knihy, rozsahy)])
+    poc = knihy[0].poc
 
     farby = {'Bodos':'#F77F00','z Dreva HBP':'#06A77D','Recyklácia':'#2E86AB','Jankula':'#A23B72'}
 
     # Graf 1 – Vývoj zostatku
+    obdobie = 'celé obdobie' if rozsahy[0][0] == 0 else f"{od.strftime('%d.%m.%Y')} – {do.strftime('%d.%m.%Y')}"
+    scatter = go.Scatter
+    if len(datumy) > MAX_BODOV_GRAFU:
+        vyber = lttb_indexy(datumy, zostatky, MAX_BODOV_GRAFU)
+        datumy, zostatky, scatter = datumy[vyber], zostatky[vyber], go.Scattergl
     fig1 = go.Figure()
-    fig1.add_trace(go.Scatter(
-        x=filt['Datum'], y=filt['Zostatok'],
+    fig1.add_trace(scatter(
+        x=datumy, y=zostatky,
         mode='lines+markers',
         name='Zostatok', fill='tozeroy',
         line=dict(color='#2E86AB', width=3),
@@ -393,235 +263,478 @@ def grafy(data, lokalita, datum):
                    annotation_text=f'Počiatočný stav ({poc:,.2f} t)',
                    annotation_position='top right')
     fig1.update_layout(
-        title='📈 Vývoj zostatku na sklade (celé obdobie)',
+        title=f'📈 Vývoj zostatku na sklade ({obdobie})',
         xaxis_title='Dátum', yaxis_title='Tony [t]',
         hovermode='x unified', height=420,
         plot_bgcolor='white', paper_bgcolor='white',
         xaxis=dict(showgrid=True, gridcolor='#f0f0f0'),
         yaxis=dict(showgrid=True, gridcolor='#f0f0f0')
     )
-    st.plotly_chart(fig1, use_container_width=True)
-
-    # Grafy 2 a 3 vedľa seba
-    col1, col2 = st.columns(2)
-
-    with col1:
-        # Graf 2 – Príjem vs Spotreba
-        fig2 = go.Figure()
-        fig2.add_trace(go.Bar(x=filt['Datum'], y=filt['Prijem_celkom'],
-                              name='Príjem', marker_color='#06A77D'))
-        fig2.add_trace(go.Bar(x=filt['Datum'], y=-filt['Spotreba'],
-                              name='Spotreba', marker_color='#D62246'))
-        fig2.update_layout(
-            title='📊 Denný príjem vs. spotreba',
-            barmode='relative', height=360,
-            hovermode='x unified',
-            plot_bgcolor='white', paper_bgcolor='white',
-            xaxis=dict(showgrid=True, gridcolor='#f0f0f0'),
-            yaxis=dict(showgrid=True, gridcolor='#f0f0f0', title='Tony [t]')
-        )
-        st.plotly_chart(fig2, use_container_width=True)
-
-    with col2:
-        # Graf 3 – Koláč dodávateľov
-        labely  = list(farby.keys())
-        hodnoty = [filt[l].sum() for l in labely]
-        fig3 = go.Figure(data=[go.Pie(
-            labels=labely, values=hodnoty, hole=0.45,
-            marker=dict(colors=list(farby.values())),
-            textinfo='label+percent',
-            hovertemplate='%{label}: %{value:.2f} t<extra></extra>'
-        )])
-        fig3.update_layout(
-            title='🥧 Podiel dodávateľov',
-            height=360, paper_bgcolor='white',
-            showlegend=True,
-            legend=dict(orientation='h', y=-0.15)
-        )
-        st.plotly_chart(fig3, use_container_width=True)
 
-    # Graf 4 – Mesačný prehľad (ak viac mesiacov)
-    if filt['Datum'].dt.month.nunique() > 1:
-        st.divider()
-        monthly = filt.copy()
-        monthly['Mesiac'] = monthly['Datum'].dt.month
-        monthly_agg = monthly.groupby('Mesiac').agg(
-            Prijem=('Prijem_celkom', 'sum'),
-            Spotreba=('Spotreba', 'sum')
-        ).reset_index()
-        monthly_agg['Nazov'] = monthly_agg['Mesiac'].map(NAZVY_MESIACOV)
+    # Graf 2 – Príjem vs Spotreba v najjemnejšej zrnitosti, ktorá sa zmestí do grafu
+    for jemnost in ('den', 'tyzden', 'mesiac'):
+        pohyby = _suhrny_knih(knihy, jemnost, od, do)
+        if len(pohyby) <= MAX_BODOV_GRAFU:
+            break
+    # Pre graf stačí TYP_TON — polovičné pole v JSON pre prehliadač
+    fig2 = go.Figure()
+    fig2.add_trace(go.Bar(x=pohyby.index, y=pohyby['Prijem_celkom'].astype(TYP_TON),
+                          name='Príjem', marker_color='#06A77D'))
+    fig2.add_trace(go.Bar(x=pohyby.index, y=-pohyby['Spotreba'].astype(TYP_TON),
+                          name='Spotreba', marker_color='#D62246'))
+    fig2.update_layout(
+        title=f'📊 {PRIVLASTOK_OBDOBIA[jemnost]} príjem vs. spotreba',
+        barmode='relative', height=360,
+        hovermode='x unified',
+        plot_bgcolor='white', paper_bgcolor='white',
+        xaxis=dict(showgrid=True, gridcolor='#f0f0f0'),
+        yaxis=dict(showgrid=True, gridcolor='#f0f0f0', title='Tony [t]')
+    )
 
+    # Graf 3 – Koláč dodávateľov
+    labely  = list(farby.keys())
+    sucty   = [k.sucty(od, do) for k in knihy]
+    hodnoty = [sum(s[l] for s in sucty) for l in labely]
+    fig3 = go.Figure(data=[go.Pie(
+        labels=labely, values=hodnoty, hole=0.45,
+        marker=dict(colors=list(farby.values())),
+        textinfo='label+percent',
+        hovertemplate='%{label}: %{value:.2f} t<extra></extra>'
+    )])
+    fig3.update_layout(
+        title='🥧 Podiel dodávateľov',
+        height=360, paper_bgcolor='white',
+        showlegend=True,
+        legend=dict(orientation='h', y=-0.15)
+    )
+
+    # Graf 4 – Prehľad po obdobiach zrnitosti (ak viac období)
+    suhrny = _suhrny_knih(knihy, zrnitost, od, do)
+    fig4 = None
+    if len(suhrny) > 1:
+        nazvy = [nazov_obdobia(z, zrnitost) for z in suhrny.index]
         fig4 = go.Figure()
         fig4.add_trace(go.Bar(
-            x=monthly_agg['Nazov'], y=monthly_agg['Prijem'],
+            x=nazvy, y=suhrny['Prijem_celkom'].astype(TYP_TON),
             name='Príjem', marker_color='#06A77D'
         ))
         fig4.add_trace(go.Bar(
-            x=monthly_agg['Nazov'], y=monthly_agg['Spotreba'],
+            x=nazvy, y=suhrny['Spotreba'].astype(TYP_TON),
             name='Spotreba', marker_color='#D62246'
         ))
         fig4.update_layout(
-            title='📊 Mesačný príjem vs. spotreba',
+            title=f'📊 {PRIVLASTOK_OBDOBIA[zrnitost]} príjem vs. spotreba',
             barmode='group', height=380,
             plot_bgcolor='white', paper_bgcolor='white',
             xaxis=dict(showgrid=False, title=''),
             yaxis=dict(showgrid=True, gridcolor='#f0f0f0', title='Tony [t]')
         )
-        st.plotly_chart(fig4, use_container_width=True)
 
+    return fig1, fig2, fig3, fig4
 
-def tabulka(data, datum):
-    filt = data[data['Datum'] <= pd.Timestamp(datum)].copy()
-    filt = filt.sort_values('Datum').reset_index(drop=True)
-    filt['Datum'] = filt['Datum'].dt.strftime('%d.%m.%Y')
-    filt = filt.rename(columns={'Prijem_celkom': 'Príjem spolu'})
-    cols = ['Datum','Bodos','z Dreva HBP','Recyklácia','Jankula','Príjem spolu','Spotreba']
-    for c in cols[1:]:
-        filt[c] = filt[c].apply(lambda x: f"{x:,.2f}" if x != 0 else "—")
-    st.dataframe(filt[cols], use_container_width=True, hide_index=True, height=500)
 
+# Figúry sa len čítajú — zdieľajú sa medzi reláciami pre danú verziu dát a obdobie
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _grafy_v_cache(verzia, lokalita, poc, od, do, zrnitost, _knihy):
+    return zostav_grafy(_knihy, od, do, zrnitost)
 
-# ══════════════════════════════════════════════════════
-# HLAVNÁ LOGIKA
-# ══════════════════════════════════════════════════════
 
-# Hlavička
-st.title("🌲 Evidencia skladu štiepky")
-st.caption("Handlovská energetika · BC (Baňa Cigeľ) · BH (Baňa Handlová)")
+@meraj('vykreslenie.grafy')
+def grafy(kniha, datum):
+    od = pd.Timestamp(kniha.datumy[0]).date()
+    knihy, verzia = [kniha], kniha.verzia
+    if PRVY_ROK < datum.year:
+        # Grafy môžu siahnuť aj do predošlých rokov — ich knihy sú v snímkach rokov
+        od, datum = st.slider(
+            "🔍 Obdobie grafov", min_value=date(PRVY_ROK, 1, 1), max_value=datum,
+            value=(od, datum), format="DD.MM.YYYY")
+        if od.year < datum.year:
+            knihy, verzia = knihy_obdobia(kniha.lokalita, od, datum)
+        if sum(j - i for i, j in (k.rozsah(od, datum) for k in knihy)) > MAX_BODOV_GRAFU:
+            st.caption(f"Obdobia s viac ako {MAX_BODOV_GRAFU} záznamami sa kreslia zjednodušene — "
+                       "pre plné rozlíšenie zúž obdobie.")
 
-# Sidebar
-with st.sidebar:
-    st.markdown("## ⚙️ Nastavenia")
+    # Výber zrnitosti stojí nad grafom 4, figúry sa však zostavujú až s ním
+    hore = st.container()
     st.divider()
+    zrnitost = st.radio("Obdobia grafu:", list(ZRNITOSTI_PREHLADU), index=1,
+                        format_func=ZRNITOSTI_PREHLADU.get, horizontal=True,
+                        key="zrnitost_grafu", label_visibility="collapsed")
+    if verzia:
+        fig1, fig2, fig3, fig4 = _grafy_v_cache(verzia, kniha.lokalita, knihy[0].poc, od, datum,
+                                                zrnitost, knihy)
+    else:
+        fig1, fig2, fig3, fig4 = zostav_grafy(knihy, od, datum, zrnitost)
+
+    with hore:
+        st.plotly_chart(fig1, width="stretch")
+
+        # Grafy 2 a 3 vedľa seba
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig2, width="stretch")
+        with col2:
+            st.plotly_chart(fig3, width="stretch")
 
-    lokalita = st.radio(
-        "🏭 Lokalita:",
-        ['BC', 'BH'],
-        format_func=lambda x: f"{'Baňa Cigeľ' if x=='BC' else 'Baňa Handlová'} ({x})"
+    if fig4 is not None:
+        st.plotly_chart(fig4, width="stretch")
+    else:
+        st.caption("V zvolenom období je len jedno obdobie tejto zrnitosti.")
+
+
+def tabulka(kniha, datum, mesiac=None):
+    if mesiac:
+        od = date(datum.year, mesiac, 1)
+        filt = kniha.zaznamy(od, min(pd.Timestamp(od) + pd.offsets.MonthEnd(0), pd.Timestamp(datum)))
+    else:
+        filt = kniha.zaznamy(do=datum)
+    cols = ['Bodos','z Dreva HBP','Recyklácia','Jankula','Prijem_celkom','Spotreba']
+    # Tony z float32 sa formátujú až po zaokrúhlení na kg — 250.005 ostane 250.00 ako v exporte
+    presne = pd.DataFrame({c: presne_tony(filt[c]) for c in cols}, index=filt.index)
+    vystup = presne.apply(formatuj_tony, nula="—").rename(columns={'Prijem_celkom': 'Príjem spolu'})
+    vystup.insert(0, 'Datum', filt['Datum'].dt.strftime('%d.%m.%Y'))
+    st.dataframe(vystup, width="stretch", hide_index=True, height=500)
+
+
+@meraj('vykreslenie.detail')
+def detail(kniha, datum, mesacne_sumare):
+    st.markdown("### 📋 Detailný prehľad pohybov")
+    # Filter pre detail
+    detail_mesiac = st.selectbox(
+        "Filtrovať mesiac:",
+        ["Všetky"] + [s['nazov'] for s in mesacne_sumare]
     )
+    if detail_mesiac != "Všetky":
+        mesiac_num = [k for k, v in NAZVY_MESIACOV.items() if v == detail_mesiac][0]
+        tabulka(kniha, datum, mesiac_num)
+    else:
+        tabulka(kniha, datum)
+
     st.divider()
+    export(kniha.lokalita, datum)
 
-    # Refresh tlačidlo
-    if st.button("🔄 Obnoviť dáta z Google Sheets", use_container_width=True):
-        st.cache_data.clear()
-        st.rerun()
 
-    st.divider()
-    st.markdown("**📊 Počiatočné stavy (1.1.2026)**")
-    st.markdown(f"- **BC:** {POCIATOCNY_STAV['BC']:,.2f} t")
-    st.markdown(f"- **BH:** {POCIATOCNY_STAV['BH']:,.2f} t")
-    st.divider()
-    st.caption("Dáta sa automaticky obnovujú každých 5 minút.")
+def export(lokalita, datum):
+    """
+    Stiahnutie zostáv za zvolené obdobie (aj cez viac rokov). Súbor sa
+    vytvorí až po kliknutí a pre rovnakú verziu dát a obdobie sa berie
+    z cache — opakované stiahnutia ho negenerujú znova.
+    """
+    st.markdown("### ⬇️ Export")
+    c1, c2 = st.columns([2, 1])
+    with c1:
+        obdobie = st.date_input(
+            "Obdobie exportu:",
+            value=(date(datum.year, 1, 1), datum),
+            min_value=date(PRVY_ROK, 1, 1),
+            max_value=date(max(ZOSITY), 12, 31),
+            format="DD.MM.YYYY"
+        )
+    with c2:
+        zostava = st.selectbox("Zostava pre CSV:", list(ZOSTAVY), format_func=ZOSTAVY.get)
+    if len(obdobie) != 2:
+        st.caption("Vyber začiatok aj koniec obdobia.")
+        return
+
+    od, do = obdobie
+    nazov = f"stiepka_{lokalita}_{od:%Y%m%d}-{do:%Y%m%d}"
+    b1, b2 = st.columns(2)
+    with b1:
+        st.download_button(
+            "📊 Excel — všetky zostavy", data=lambda: export_xlsx(lokalita, od, do),
+            file_name=f"{nazov}.xlsx", on_click="ignore", width="stretch",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    with b2:
+        st.download_button(
+            f"📄 CSV — {ZOSTAVY[zostava]}", data=lambda: export_csv(lokalita, od, do, zostava),
+            file_name=f"{nazov}_{zostava}.csv", mime="text/csv", on_click="ignore",
+            width="stretch")
+
+
+@st.fragment
+def zalozky(kniha, stav, lokalita, datum, mesacne_sumare):
+    """
+    Záložky ako fragment — prepnutie záložky alebo zmena filtra či obdobia
+    v nej prekreslí len túto časť, bez načítania dát. Počíta a posiela sa
+    len obsah otvorenej záložky.
+    """
+    tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "📈 Grafy", "📋 Detail"],
+                               key="zalozka", on_change="rerun")
+    if tab1.open:
+        with tab1:
+            dashboard(stav, lokalita, datum, kniha)
+    if tab2.open:
+        with tab2:
+            grafy(kniha, datum)
+    if tab3.open:
+        with tab3:
+            detail(kniha, datum, mesacne_sumare)
 
-# Výber dátumu — ešte pred načítaním, aby sme vedeli aký rozsah mesiacov treba
-st.markdown("### 📅 Výber dátumu")
 
-col_d, col_info = st.columns([1, 2])
-with col_d:
-    # Dnešný dátum orezaný na platný rozsah
+# ══════════════════════════════════════════════════════
+# HLAVNÁ LOGIKA
+# ══════════════════════════════════════════════════════
+
+def zapis_pohybu(lokalita):
+    """
+    Formulár na zápis pohybu do zápisníka. Volá sa pred načítaním snímky —
+    zápis je v nej hneď v tomto behu, bez načítania mesiacov.
+    """
     dnes = date.today()
-    default_datum = max(date(2026, 1, 1), min(dnes, date(2026, 12, 31)))
-
-    vybrany_datum = st.date_input(
-        "📅 Zobraziť stav ku dňu:",
-        value=default_datum,
-        min_value=date(2026, 1, 1),
-        max_value=date(2026, 12, 31),
-        format="DD.MM.YYYY"
-    )
+    with st.expander("📝 Zapísať pohyb"):
+        with st.form("zapis_pohybu", clear_on_submit=True):
+            kde = st.selectbox("Lokalita:", list(LOKALITY), index=list(LOKALITY).index(lokalita),
+                               format_func=lambda x: f"{LOKALITY[x]['nazov']} ({x})")
+            kedy = st.date_input("Dátum:", value=dnes, min_value=date(PRVY_ROK, 1, 1),
+                                 max_value=min(dnes, date(max(ZOSITY), 12, 31)), format="DD.MM.YYYY")
+            polozka = st.selectbox("Položka:", POLOZKY)
+            tony = st.number_input("Tony:", value=0.0, step=1.0, format="%.3f",
+                                   help="Záporné číslo opraví skorší zápis.")
+            odoslat = st.form_submit_button("Zapísať", width="stretch")
+        if odoslat:
+            try:
+                zapis_pohyb(kde, kedy, polozka, tony)
+                st.success(f"✅ {polozka} {tony:,.3f} t ({kde}, {kedy.strftime('%d.%m.%Y')}) zapísané")
+            except (ValueError, OSError) as e:
+                st.error(f"❌ Zápis sa nepodaril: {e}")
+        st.caption(f"Zápisov v zápisníku: {len(zapisnik().zaznamy())} — keď sa objavia v hárku, "
+                   "pri obnove sa z neho vyradia.")
+
+
+@st.cache_resource(show_spinner=False)
+def obnova_na_pozadi():
+    """Jedno obnovovacie vlákno pre celý server — zdieľajú ho všetky relácie."""
+    return Obnova(CACHE_TTL).spusti()
+
+
+@st.cache_resource(show_spinner=False)
+def server_metrik():
+    """Endpoint /metrics pre Prometheus, ak je nastavený METRIKY_PORT (raz pre celý server)."""
+    if not METRIKY_PORT:
+        return None
+    try:
+        return spusti_server_metrik(METRIKY_PORT)
+    except OSError:
+        return None   # port je obsadený — appka beží ďalej bez endpointu
+
 
-# Zistíme, koľko mesiacov treba načítať
-mesiac_vybrany = vybrany_datum.month
-mesiace_na_nacitanie = list(range(1, mesiac_vybrany + 1))
+@st.cache_resource(show_spinner=False)
+def server_api():
+    """JSON API pre ostatné systémy, ak je nastavený API_PORT (raz pre celý server)."""
+    if not API_PORT:
+        return None
+    try:
+        return spusti_api(API_PORT)
+    except OSError:
+        return None
 
-with col_info:
-    mesiace_text = ", ".join([NAZVY_MESIACOV[m] for m in mesiace_na_nacitanie])
+
+def panel_merania():
+    """Časy etáp a zásahy cache od štartu servera — pre ladenie pomalých stránok."""
+    stav = stav_metrik()
+    etapy = pd.DataFrame([
+        {'Etapa': etapa, 'Počet': e['pocet'], 'Posledne [ms]': e['posledne'] * 1000,
+         'Priemer [ms]': e['sucet'] / e['pocet'] * 1000, 'Max [ms]': e['max'] * 1000}
+        for etapa, e in sorted(stav['etapy'].items())
+    ])
+    cache = pd.DataFrame([
+        {'Funkcia': funkcia, 'Zásahy': zasahy, 'Minutia': minutia,
+         'Úspešnosť': f"{zasahy / (zasahy + minutia):.0%}"}
+        for funkcia, (zasahy, minutia) in sorted(stav['cache'].items())
+    ])
+    st.dataframe(etapy, hide_index=True, column_config={
+        c: st.column_config.NumberColumn(format="%.1f") for c in ['Posledne [ms]', 'Priemer [ms]', 'Max [ms]']})
+    st.dataframe(cache, hide_index=True)
+    if METRIKY_PORT:
+        st.caption(f"Prometheus: http://127.0.0.1:{METRIKY_PORT}/metrics")
+    if API_PORT:
+        st.caption(f"JSON API: http://127.0.0.1:{API_PORT}/api/stav")
+
+
+@meraj('vykreslenie.stranka')
+def main():
+    # Hlavička (titulok je vykreslený hneď na začiatku skriptu)
+    st.caption(" · ".join(["Handlovská energetika"] + [f"{k} ({v['nazov']})" for k, v in LOKALITY.items()]))
+
+    obnova = obnova_na_pozadi()
+    server_metrik()
+    server_api()
+
+    # Sidebar
+    with st.sidebar:
+        st.markdown("## ⚙️ Nastavenia")
+        st.divider()
+
+        lokalita = st.radio(
+            "🏭 Lokalita:",
+            list(LOKALITY),
+            format_func=lambda x: f"{LOKALITY[x]['nazov']} ({x})"
+        )
+        st.divider()
+
+        # Výber mesiaca na obnovu a tlačidlo — doplnia sa, keď poznáme vybraný dátum
+        obnova_box = st.container()
+
+        st.divider()
+        # Počiatočné stavy závisia od vybraného roka — doplnia sa nižšie
+        stavy_box = st.container()
+        st.divider()
+        zapis_pohybu(lokalita)
+        st.divider()
+        st.caption("Aktuálny mesiac sa obnovuje na pozadí každých 5 minút, uzavreté mesiace sú uložené na disku.")
+        for ch in obnova.chyby:
+            st.caption(f"⚠️ Posledná obnova: {ch}")
+        # Panel sa vyplní na konci behu, aby ukázal aj časy tohto behu
+        meranie_box = st.container() if st.toggle("🛠️ Meranie výkonu") else None
+
+    # Výber dátumu — ešte pred načítaním, aby sme vedeli aký rozsah mesiacov treba
+    st.markdown("### 📅 Výber dátumu")
+
+    col_d, col_info = st.columns([1, 2])
+    with col_d:
+        # Dnešný dátum orezaný na platný rozsah (roky, pre ktoré máme zošit)
+        dnes = date.today()
+        prvy_den, posledny_den = date(PRVY_ROK, 1, 1), date(max(ZOSITY), 12, 31)
+        default_datum = max(prvy_den, min(dnes, posledny_den))
+
+        vybrany_datum = st.date_input(
+            "📅 Zobraziť stav ku dňu:",
+            value=default_datum,
+            min_value=prvy_den,
+            max_value=posledny_den,
+            format="DD.MM.YYYY"
+        )
+
+    # Zistíme, koľko mesiacov treba načítať — len vybraný rok, staršie roky
+    # prispievajú iba preneseným počiatočným stavom
+    rok = vybrany_datum.year
+    mesiac_vybrany = vybrany_datum.month
+    mesiace_na_nacitanie = list(range(1, mesiac_vybrany + 1))
+
+    with obnova_box:
+        # Predvolene aktuálny mesiac — v praxi sa mení len on
+        predvoleny = dnes.month if rok == dnes.year and dnes.month <= mesiac_vybrany else mesiac_vybrany
+        na_obnovu = st.selectbox(
+            "Obnoviť mesiac:",
+            mesiace_na_nacitanie + [0],
+            index=mesiace_na_nacitanie.index(predvoleny),
+            format_func=lambda m: f"{NAZVY_MESIACOV[m]} {rok}" if m else f"Všetky ({rok} do {NAZVY_MESIACOV[mesiac_vybrany]})",
+        )
+        obnovit = st.button(f"🔄 Obnoviť dáta z {zdroj().nazov}", width="stretch")
+
+    if obnovit:
+        # Stiahne sa len vybraný hárok; ostatné mesiace a výpočty nad nimi
+        # ostávajú v cache. Obnova beží vo vlákne na pozadí — čaká len tento
+        # používateľ, ostatní medzitým dostávajú posledné uložené dáta.
+        mesiace = mesiace_na_nacitanie if na_obnovu == 0 else [na_obnovu]
+        with st.spinner(f"🔄 Obnovujem dáta z {zdroj().nazov}..."):
+            hotovo = obnova.obnov([(rok, m) for m in mesiace], cakat=60)
+        if not hotovo:
+            st.info("ℹ️ Obnova ešte beží na pozadí — zatiaľ zobrazujem posledné uložené dáta.")
+
+    # Zdieľaná snímka roka — jedna na proces pre všetky relácie, len na čítanie.
+    # Z úložiska hneď, aj keď je staršie — obnovu robí vlákno na pozadí a po nej
+    # snímku nahradí novou. Mesiac, ktorý ešte nie je uložený, stiahne tiež ono.
+    with st.spinner(f"📡 Načítavam dáta z {zdroj().nazov} ({len(mesiace_na_nacitanie)} mesiac{'ov' if len(mesiace_na_nacitanie) > 1 else ''})..."):
+        snimka = aktualna_snimka(rok)
+
+    pociatocne = snimka.pociatocne
+    with stavy_box:
+        st.markdown(f"**📊 Počiatočné stavy (1.1.{rok})**")
+        st.markdown("\n".join(f"- **{k}:** {v:,.2f} t" for k, v in pociatocne.items()))
+
+    with col_info:
+        mesiace_text = ", ".join([NAZVY_MESIACOV[m] for m in mesiace_na_nacitanie])
+        st.markdown(f"""
+        <div class="info-box">
+            📡 Načítavam dáta za: <b>{mesiace_text}</b><br>
+            (od 1.1.{rok} do {vybrany_datum.strftime('%d.%m.%Y')} = <b>{len(mesiace_na_nacitanie)}</b> mesiac{'ov' if len(mesiace_na_nacitanie) > 1 else ''})
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.divider()
+
+    for ch in snimka.chyby:
+        st.warning(f"⚠️ Problém s načítaním: {ch}")
+
+    # Kniha drží celý načítaný rok — zobrazuje sa po koniec vybraného mesiaca
+    koniec_mesiaca = (pd.Timestamp(vybrany_datum) + pd.offsets.MonthEnd(0)).date()
+    if not any(k.index(koniec_mesiaca) for k in snimka.knihy.values()):
+        if isinstance(zdroj(), GoogleSheets):
+            st.error("""
+            ❌ **Nepodarilo sa načítať žiadne dáta z Google Sheets.**
+
+            **Riešenie:**
+            1. Otvor Google Sheets
+            2. Klikni **Zdieľať** (vpravo hore)
+            3. Zmeň na **"Ktokoľvek s odkazom"** → Zobrazovateľ
+            4. Klikni **Obnoviť dáta** v ľavom paneli
+            """)
+        else:
+            st.error(f"""
+            ❌ **Nepodarilo sa načítať žiadne dáta z {zdroj().nazov}.**
+
+            Skontroluj, či `{ZDROJ_CESTA}` existuje a má záznamy za vybraný rok
+            (nastavenie STIEPKA_ZDROJ_CESTA), a klikni **Obnoviť dáta** v ľavom paneli.
+            """)
+        st.stop()
+
+    # Kniha pohybov (zoradená, s kumulatívnymi súčtami) — postavená len pri zmene
+    # dát vybranej lokality; zmena v inej lokalite ju nezneplatní
+    kniha = snimka.knihy.get(lokalita)
+    zaznamov = kniha.index(koniec_mesiaca) if kniha else 0
+    if not zaznamov:
+        st.warning("⚠️ Žiadne dáta pre vybranú lokalitu.")
+        st.stop()
+
+    # Obmedzenie na skutočne dostupné dáta
+    min_d = pd.Timestamp(kniha.datumy[0]).date()
+    max_d = pd.Timestamp(kniha.datumy[zaznamov - 1]).date()
+
+    # Ak vybraný dátum presahuje dostupné dáta
+    if vybrany_datum > max_d:
+        st.info(f"ℹ️ Posledný dostupný záznam je z **{max_d.strftime('%d.%m.%Y')}**. Zobrazujem stav k tomuto dátumu.")
+        vybrany_datum = max_d
+
+    if vybrany_datum < min_d:
+        st.warning(f"⚠️ Prvý dostupný záznam je z {min_d.strftime('%d.%m.%Y')}.")
+        st.stop()
+
+    # Info o načítaných dátach
+    overene = aktualnost((rok, 1), (rok, mesiac_vybrany))
+    if overene is None:
+        aktualne_k = "uzavreté mesiace"
+    elif not overene:
+        aktualne_k = "otvorený mesiac chýba — načítava sa na pozadí"
+    else:
+        aktualne_k = datetime.fromtimestamp(overene).strftime('%d.%m.%Y %H:%M')
+    # Mesiace so záznamami priamo z dátumov knihy — bez výpočtu mesačných súhrnov
+    mesiacov = len(pd.unique(kniha.datumy[:zaznamov].astype('datetime64[M]')))
     st.markdown(f"""
     <div class="info-box">
-        📡 Načítavam dáta za: <b>{mesiace_text}</b><br>
-        (od 1.1.2026 do {vybrany_datum.strftime('%d.%m.%Y')} = <b>{len(mesiace_na_nacitanie)}</b> mesiac{'ov' if len(mesiace_na_nacitanie) > 1 else ''})
+        ✅ Dáta k: <b>{aktualne_k}</b> · 
+        Rozsah: <b>{min_d.strftime('%d.%m.%Y')}</b> – <b>{max_d.strftime('%d.%m.%Y')}</b> · 
+        Záznamy: <b>{zaznamov} dní</b> ·
+        Mesiacov: <b>{mesiacov}</b> ·
+        Verzia dát: <code>{kniha.verzia[:8]}</code>
     </div>
     """, unsafe_allow_html=True)
 
-st.divider()
+    st.divider()
 
-# Načítanie dát z Google Sheets — všetky potrebné mesiace
-with st.spinner(f"📡 Načítavam dáta z Google Sheets ({len(mesiace_na_nacitanie)} mesiac{'ov' if len(mesiace_na_nacitanie) > 1 else ''})..."):
-    bc_data, bh_data, chyby = nacitaj_mesiace(1, mesiac_vybrany)
+    # Výpočet a zobrazenie
+    stav = vypocitaj(kniha, vybrany_datum)
+    mesacne_sumare = vypocitaj_mesacne_sumare(kniha, vybrany_datum)
 
-if chyby:
-    for ch in chyby:
-        st.warning(f"⚠️ Problém s načítaním: {ch}")
+    if stav:
+        zalozky(kniha, stav, lokalita, vybrany_datum, mesacne_sumare)
+    else:
+        st.warning("⚠️ Pre vybraný dátum nie sú dáta.")
 
-if bc_data.empty and bh_data.empty:
-    st.error("""
-    ❌ **Nepodarilo sa načítať žiadne dáta z Google Sheets.**
-
-    **Riešenie:**
-    1. Otvor Google Sheets
-    2. Klikni **Zdieľať** (vpravo hore)
-    3. Zmeň na **"Ktokoľvek s odkazom"** → Zobrazovateľ
-    4. Klikni **Obnoviť dáta** v ľavom paneli
-    """)
-    st.stop()
-
-# Vyber dáta podľa lokality
-data = bc_data if lokalita == 'BC' else bh_data
-
-if data.empty:
-    st.warning("⚠️ Žiadne dáta pre vybranú lokalitu.")
-    st.stop()
-
-# Zoradíme podľa dátumu
-data = data.sort_values('Datum').reset_index(drop=True)
-
-# Obmedzenie na skutočne dostupné dáta
-min_d = data['Datum'].min().date()
-max_d = data['Datum'].max().date()
-
-# Ak vybraný dátum presahuje dostupné dáta
-if vybrany_datum > max_d:
-    st.info(f"ℹ️ Posledný dostupný záznam je z **{max_d.strftime('%d.%m.%Y')}**. Zobrazujem stav k tomuto dátumu.")
-    vybrany_datum = max_d
-
-if vybrany_datum < min_d:
-    st.warning(f"⚠️ Prvý dostupný záznam je z {min_d.strftime('%d.%m.%Y')}.")
-    st.stop()
-
-# Info o načítaných dátach
-st.markdown(f"""
-<div class="info-box">
-    ✅ Dáta úspešne načítané · 
-    Rozsah: <b>{min_d.strftime('%d.%m.%Y')}</b> – <b>{max_d.strftime('%d.%m.%Y')}</b> · 
-    Záznamy: <b>{len(data)} dní</b> ·
-    Mesiacov: <b>{data['Datum'].dt.month.nunique()}</b>
-</div>
-""", unsafe_allow_html=True)
-
-st.divider()
-
-# Výpočet a zobrazenie
-stav = vypocitaj(data, lokalita, vybrany_datum)
-mesacne_sumare = vypocitaj_mesacne_sumare(data, lokalita, vybrany_datum)
-
-if stav:
-    tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "📈 Grafy", "📋 Detail"])
-    with tab1:
-        dashboard(stav, lokalita, vybrany_datum, mesacne_sumare)
-    with tab2:
-        grafy(data, lokalita, vybrany_datum)
-    with tab3:
-        st.markdown("### 📋 Detailný prehľad pohybov")
-        # Filter pre detail
-        detail_mesiac = st.selectbox(
-            "Filtrovať mesiac:",
-            ["Všetky"] + [NAZVY_MESIACOV[m] for m in sorted(data[data['Datum'] <= pd.Timestamp(vybrany_datum)]['Datum'].dt.month.unique())]
-        )
-        if detail_mesiac != "Všetky":
-            mesiac_num = [k for k, v in NAZVY_MESIACOV.items() if v == detail_mesiac][0]
-            filtered_data = data[data['Datum'].dt.month == mesiac_num]
-            tabulka(filtered_data, vybrany_datum)
-        else:
-            tabulka(data, vybrany_datum)
-else:
-    st.warning("⚠️ Pre vybraný dátum nie sú dáta.")
+    if meranie_box:
+        with meranie_box:
+            panel_merania()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Overí a zmeria JSON API: správnosť čísel proti vypocitaj, ETag s 304,
+novú verziu po zmene mesiaca v úložisku a čas dotazu pri častom
+dopytovaní (keep-alive, s If-None-Match aj bez neho).
+
+    python benchmarks/bench_api.py [--dotazov 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import requests  # noqa: E402
+
+import evidencia as ev  # noqa: E402
+from syntetika import LokalnyServer, mesiac_csv  # noqa: E402
+
+ROK = 2026
+
+
+def zmeraj(relacia, url, dotazov, hlavicky=None):
+    """Časy dotazov v µs (min, medián) a kódy odpovedí."""
+    casy, kody = [], set()
+    for _ in range(dotazov):
+        start = time.perf_counter()
+        r = relacia.get(url, headers=hlavicky)
+        casy.append((time.perf_counter() - start) * 1e6)
+        kody.add(r.status_code)
+    return min(casy), statistics.median(casy), kody
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dotazov', type=int, default=2000)
+    args = parser.parse_args()
+
+    harky = {gid: mesiac_csv(ROK, m) for m, gid in ev.ZOSITY[ROK]['gids'].items()}
+    datum = min(date.today(), date(ROK, 12, 31))
+
+    with LokalnyServer(harky) as zdroj:
+        ev.EXPORT_URL = zdroj.export_url
+        ev.ULOZISKO_DIR = Path(tempfile.mkdtemp())
+        server = ev.spusti_api(0)
+        zaklad = f"http://127.0.0.1:{server.server_address[1]}"
+        relacia = requests.Session()
+        url = f"{zaklad}/api/stav?lokalita=BC&datum={datum.isoformat()}"
+
+        # Prvý dotaz postaví snímku (stiahne chýbajúce mesiace)
+        start = time.perf_counter()
+        r = relacia.get(url)
+        print(f"prvý dotaz:        {(time.perf_counter() - start) * 1000:8.1f} ms  ({r.status_code})")
+        assert r.status_code == 200, r.text
+        etag = r.headers['ETag']
+
+        # Čísla ako z vypocitaj
+        stavy, _ = ev.stav_ku_dnu(datum, ['BC'])
+        ocakavane = ev.stav_ako_json(stavy['BC'])
+        assert r.json()['stav']['BC'] == ocakavane, "API vracia iné čísla ako vypocitaj"
+        kniha = ev.aktualna_snimka(ROK).knihy['BH']
+        sumare = relacia.get(f"{zaklad}/api/sumare?lokalita=BH&do={datum.isoformat()}").json()
+        assert sumare['sumare']['BH'] == ev.vypocitaj_mesacne_sumare(kniha, datum)
+        assert relacia.get(f"{zaklad}/api/stav?lokalita=XY").status_code == 400
+        assert relacia.get(f"{zaklad}/api/stav?datum=zajtra").status_code == 400
+
+        for nazov, hlavicky in [('bez ETagu', None), ('If-None-Match', {'If-None-Match': etag})]:
+            najmenej, median, kody = zmeraj(relacia, url, args.dotazov, hlavicky)
+            print(f"{nazov + ':':18} min {najmenej:7.0f} µs  medián {median:7.0f} µs  kódy {sorted(kody)}")
+        assert kody == {304}
+
+        # Zmena mesiaca v úložisku → nová snímka, nový ETag, 200
+        zmeneny = mesiac_csv(ROK, datum.month, seed=1)
+        ev.uloz_mesiac_na_disk(ROK, datum.month, ev.spracuj_csv(zmeneny), ev.hash_obsahu(zmeneny),
+                               ev._zdroj_mesiaca(ROK, datum.month))
+        r = relacia.get(url, headers={'If-None-Match': etag})
+        print(f"po zmene mesiaca:  {r.status_code}, ETag {'nový' if r.headers['ETag'] != etag else 'rovnaký'}")
+        assert r.status_code == 200 and r.headers['ETag'] != etag
+        server.shutdown()
+
+    print(f"zdroj: {zdroj.poziadavky} požiadaviek na hárky")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Overí a zmeria export zostáv cez viac rokov: prvé vytvorenie xlsx a CSV,
+opakované stiahnutie z cache a nové vytvorenie po zmene mesiaca.
+
+Kontroluje, že denné pohyby nadväzujú cez hranicu rokov (jedna hlavička,
+zostatok na konci = vypocitaj k poslednému dňu) a že mesačné súhrny
+sedia s vypocitaj_mesacne_sumare.
+
+    python benchmarks/bench_export.py [--roky 3]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd  # noqa: E402
+
+import evidencia as ev  # noqa: E402
+from syntetika import LokalnyServer, mesiac_csv  # noqa: E402
+
+POSLEDNY_ROK = 2025   # celé uzavreté roky — obdobie nezávisí od dnešného dátumu
+
+
+def ms(funkcia):
+    start = time.perf_counter()
+    vysledok = funkcia()
+    return vysledok, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--roky', type=int, default=3)
+    parser.add_argument('--lokalita', choices=list(ev.LOKALITY), default='BC')
+    args = parser.parse_args()
+    warnings.simplefilter('error')   # aj SettingWithCopyWarning je chyba
+
+    roky = list(range(POSLEDNY_ROK - args.roky + 1, POSLEDNY_ROK + 1))
+    ev.ZOSITY = {rok: {'sheet_id': f"export{rok}", 'gids': {m: f"{rok}{m:02d}" for m in range(1, 13)}}
+                 for rok in roky}
+    ev.PRVY_ROK = roky[0]
+    harky = {gid: mesiac_csv(rok, m) for rok, z in ev.ZOSITY.items() for m, gid in z['gids'].items()}
+    od, do = date(roky[0], 3, 15), date(POSLEDNY_ROK, 12, 31)
+
+    with LokalnyServer(harky) as server:
+        ev.EXPORT_URL = server.export_url
+        ev.ULOZISKO_DIR = Path(tempfile.mkdtemp())
+        ev.knihy_obdobia(args.lokalita, od, do)   # načítanie dát sa nemeria
+
+        xlsx, cas_xlsx = ms(lambda: ev.export_xlsx(args.lokalita, od, do))
+        _, cas_cache = ms(lambda: ev.export_xlsx(args.lokalita, od, do))
+        csv, cas_csv = ms(lambda: ev.export_csv(args.lokalita, od, do))
+        print(f"xlsx:             {cas_xlsx:8.1f} ms  {len(xlsx) / 1024:7.1f} kB")
+        print(f"xlsx z cache:     {cas_cache:8.3f} ms")
+        print(f"csv denné:        {cas_csv:8.1f} ms  {len(csv) / 1024:7.1f} kB")
+
+        # Obsah
+        harky_xlsx = pd.read_excel(io.BytesIO(xlsx), sheet_name=None)
+        assert list(harky_xlsx) == list(ev.ZOSTAVY.values())
+        denne = harky_xlsx[ev.ZOSTAVY['denne']]
+        z_csv = pd.read_csv(io.BytesIO(csv), sep=';', decimal=',', encoding='utf-8-sig')
+        dni = (do - od).days + 1
+        assert len(denne) == len(z_csv) == dni, (len(denne), len(z_csv), dni)
+        assert list(z_csv.columns) == ev.STLPCE_DENNE
+
+        kniha = ev.aktualna_snimka(POSLEDNY_ROK).knihy[args.lokalita]
+        zostatok = ev.vypocitaj(kniha, do)['zostatok']
+        assert abs(denne['Zostatok'].iloc[-1] - zostatok) < 1e-6
+        assert abs(z_csv['Zostatok'].iloc[-1] - zostatok) < 1e-6
+
+        mesacne = harky_xlsx[ev.ZOSTAVY['mesacne']]
+        assert len(mesacne) == 12 * args.roky - 2   # január a február prvého roka sú pred obdobím
+        sumare = ev.vypocitaj_mesacne_sumare(kniha, do)
+        assert mesacne['Zostatok [t]'].tail(12).round(6).tolist() == [round(s['zostatok'], 6) for s in sumare]
+        dodavatelia = harky_xlsx[ev.ZOSTAVY['dodavatelia']]
+        assert abs(dodavatelia['Príjem spolu'].iloc[-2] - denne['Príjem spolu'].sum()) < 0.01
+
+        # Zmena mesiaca v úložisku → nová verzia, export sa vytvorí znova
+        zmeneny = mesiac_csv(POSLEDNY_ROK, 6, seed=1)
+        ev.uloz_mesiac_na_disk(POSLEDNY_ROK, 6, ev.spracuj_csv(zmeneny), ev.hash_obsahu(zmeneny),
+                               ev._zdroj_mesiaca(POSLEDNY_ROK, 6))
+        nove, cas_nove = ms(lambda: ev.export_xlsx(args.lokalita, od, do))
+        print(f"po zmene mesiaca: {cas_nove:8.1f} ms  ({'nový súbor' if nove != xlsx else 'ROVNAKÝ súbor'})")
+        assert nove != xlsx
+
+    zasahy, minutia = ev.stav_metrik()['cache']['_zostav_export']
+    print(f"cache exportu:    {zasahy} zásahov, {minutia} vytvorení")
+    assert (zasahy, minutia) == (1, 3)
+
+
+if __name__ == '__main__':
+    main()
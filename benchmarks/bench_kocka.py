@@ -0,0 +1,92 @@
+"""
+Overí kocku súhrnov knihy proti zoskupeniu denných záznamov v pandas
+(resample) pre každú zrnitosť a náhodné obdobia, vrátane orezaných
+krajných období, a zmeria výrez z kocky proti tomuto zoskupeniu.
+
+    python benchmarks/bench_kocka.py [--roky 10] [--obdobi 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import evidencia as ev  # noqa: E402
+from syntetika import mesiac_csv  # noqa: E402
+
+POSLEDNY_ROK = 2025
+# Zrnitosť kocky → frekvencia resample; týždeň pandas označuje nedeľou
+FREKVENCIE = {'den': 'D', 'tyzden': 'W-SUN', 'mesiac': 'MS', 'stvrtrok': 'QS', 'rok': 'YS'}
+
+
+def ms(funkcia, opakovani=20):
+    """Najkratší čas z opakovaní v ms a posledný výsledok."""
+    najlepsi = float('inf')
+    for _ in range(opakovani):
+        start = time.perf_counter()
+        vysledok = funkcia()
+        najlepsi = min(najlepsi, time.perf_counter() - start)
+    return vysledok, najlepsi * 1000
+
+
+def resample(kniha, zrnitost, od, do):
+    """Súčty stĺpcov knihy po obdobiach so záznamami — zoskupením denných riadkov."""
+    denne = kniha.zaznamy(od, do).set_index('Datum')[ev.Kniha.STLPCE].astype(float)
+    skupiny = denne.resample(FREKVENCIE[zrnitost])
+    sucty = skupiny.sum()[skupiny.size() > 0]
+    if zrnitost == 'tyzden':
+        sucty.index = sucty.index - pd.Timedelta(days=6)
+    return sucty
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--roky', type=int, default=10)
+    parser.add_argument('--obdobi', type=int, default=200, help='počet náhodných období na overenie')
+    args = parser.parse_args()
+
+    roky = range(POSLEDNY_ROK - args.roky + 1, POSLEDNY_ROK + 1)
+    casti = [ev.spracuj_csv(mesiac_csv(rok, m)) for rok in roky for m in range(1, 13)]
+    data = pd.concat(casti, ignore_index=True)
+    for stlpec in ('Lokalita', 'Polozka'):
+        data[stlpec] = data[stlpec].astype(casti[0][stlpec].dtype)
+    kniha, cas = ms(lambda: ev.Kniha(data, 'BC', ev.POCIATOCNY_STAV['BC']), 5)
+    print(f"{args.roky} rokov, {len(kniha)} záznamov, kniha aj s kockou {cas:.1f} ms")
+
+    prvy, posledny = pd.Timestamp(kniha.datumy[0]).date(), pd.Timestamp(kniha.datumy[-1]).date()
+    rnd = random.Random(0)
+    for _ in range(args.obdobi):
+        od = prvy + timedelta(rnd.randint(-40, (posledny - prvy).days))
+        do = od + timedelta(rnd.randint(-3, 800))
+        for zrnitost in ev.OBDOBIA:
+            tab, ref = kniha.suhrny(zrnitost, od, do), resample(kniha, zrnitost, od, do)
+            assert (tab.index == ref.index).all(), (zrnitost, od, do)
+            np.testing.assert_allclose(tab[ev.Kniha.STLPCE].to_numpy(), ref.to_numpy(), atol=1e-6)
+            assert tab['Dni'].sum() == len(kniha.zaznamy(od, do))
+            if len(tab):
+                assert tab['Zostatok'].iloc[-1] == kniha.zostatok(do)
+    print(f"{args.obdobi} náhodných období × {len(ev.OBDOBIA)} zrnitostí — rovnaké ako resample")
+
+    # Mesačné súhrny sú výrez z kocky
+    sumare = ev.vypocitaj_mesacne_sumare(kniha, posledny)
+    mesacne = kniha.suhrny('mesiac', do=posledny)
+    assert [s['prijem'] for s in sumare] == mesacne['Prijem_celkom'].tolist()
+    assert [s['zostatok'] for s in sumare] == mesacne['Zostatok'].tolist()
+
+    # výrez = polia z kocky, suhrny = výrez ako DataFrame
+    print(f"{'celá história':16} {'výrez ms':>9} {'suhrny ms':>10} {'resample ms':>12} {'období':>7}")
+    for zrnitost in ev.OBDOBIA:
+        _, cas_vyrez = ms(lambda: kniha.vyrez(zrnitost))
+        tab, cas_suhrny = ms(lambda: kniha.suhrny(zrnitost))
+        _, cas_resample = ms(lambda: resample(kniha, zrnitost, None, None))
+        print(f"{ev.OBDOBIA[zrnitost]:16} {cas_vyrez:9.3f} {cas_suhrny:10.3f} {cas_resample:12.3f} {len(tab):7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Zmeria pamäť pri viacročnej histórii: zdieľané dáta procesu (dlhý formát
+rokov a knihy lokalít) a pamäť na reláciu — koľko pamäte ostane držanej
+po každej ďalšej relácii (AppTest) a špička jedného behu stránky.
+
+Staršia verzia sa zmeria proti jej checkoutu (--koren), dva behy sa
+dajú porovnať:
+
+    git worktree add /tmp/pred HEAD~1
+    python benchmarks/bench_pamat.py --koren /tmp/pred --vystup pred.json
+    python benchmarks/bench_pamat.py --vystup po.json --porovnaj pred.json
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+BENCHMARKY = Path(__file__).resolve().parent
+
+
+def kb(bajty):
+    return round(bajty / 1024, 1)
+
+
+def velkost_knihy(kniha):
+    """Bajty knihy — záznamy, kumulatívne súčty, zostatky a kocka (dátumy sú pohľad do záznamov)."""
+    return (int(kniha.data.memory_usage(deep=True).sum())
+            + sum(a.nbytes for a in kniha.kum.values()) + kniha.zostatky.nbytes
+            + sum(a.nbytes for obdobia in getattr(kniha, 'kocka', {}).values() for a in obdobia))
+
+
+def zdielane(ev, roky):
+    """Dáta, ktoré drží proces raz pre všetky relácie: rok po roku ako v appke."""
+    data_b = knihy_b = 0
+    typy = None
+    for rok in roky:
+        poc = ev.pociatocne_stavy(rok)
+        data, _, _ = ev.nacitaj_mesiace((rok, 1), (rok, 12))
+        data_b += int(data.memory_usage(deep=True).sum())
+        typy = {k: str(v) for k, v in data.dtypes.items()}
+        for lokalita in ev.LOKALITY:
+            knihy_b += velkost_knihy(ev.Kniha(data, lokalita, poc[lokalita]))
+    return {'data_kb': kb(data_b), 'knihy_kb': kb(knihy_b), 'spolu_kb': kb(data_b + knihy_b), 'typy': typy}
+
+
+def relacia(app, datum):
+    """Jedna relácia: načítanie stránky, výber dátumu a otvorenie záložky Detail."""
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(app, default_timeout=120)
+    at.run()
+    at.date_input[0].set_value(datum).run()
+    at.session_state['zalozka'] = '📋 Detail'
+    at.run()
+    if at.exception:
+        raise SystemExit(f"appka skončila chybou: {at.exception[0].message}")
+    return at
+
+
+def na_relaciu(app, roky, pocet):
+    """Držaná pamäť na reláciu a medián špičky jednej relácie (tracemalloc)."""
+    datumy = [date(rok, 12, 31) for rok in roky]
+    tracemalloc.start()
+    for datum in datumy:   # zahriatie — zdieľané cache sa naplnia, nemerajú sa
+        relacia(app, datum)
+    gc.collect()
+    zaciatok = tracemalloc.get_traced_memory()[0]
+    drzane, spicky = [], []
+    for i in range(pocet):
+        pred = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        drzane.append(relacia(app, datumy[i % len(datumy)]))
+        spicky.append(tracemalloc.get_traced_memory()[1] - pred)
+    gc.collect()
+    koniec = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {'drzane_kb': kb((koniec - zaciatok) / pocet), 'spicka_kb': kb(statistics.median(spicky)),
+            'relacii': pocet}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--koren', default=str(BENCHMARKY.parent),
+                        help='checkout s evidencia.py a app_google_sheets.py')
+    parser.add_argument('--roky', type=int, default=5)
+    parser.add_argument('--relacii', type=int, default=5)
+    parser.add_argument('--vystup', help='zapíše výsledok ako JSON do súboru')
+    parser.add_argument('--porovnaj', help='JSON predošlého behu na porovnanie')
+    args = parser.parse_args()
+
+    sys.path.insert(0, args.koren)
+    sys.path.insert(1, str(BENCHMARKY))
+    import streamlit.config
+    import streamlit.logger
+    streamlit.config.get_config_options()
+    streamlit.logger.set_log_level('error')
+    import evidencia as ev
+    from syntetika import LokalnyServer, mesiac_csv
+
+    roky = list(range(2026 - args.roky + 1, 2027))
+    ev.ZOSITY = {rok: {'sheet_id': f"pamat{rok}", 'gids': {m: f"{rok}{m:02d}" for m in range(1, 13)}}
+                 for rok in roky}
+    ev.PRVY_ROK = roky[0]
+    harky = {gid: mesiac_csv(rok, m) for rok, z in ev.ZOSITY.items() for m, gid in z['gids'].items()}
+
+    with LokalnyServer(harky) as server:
+        ev.EXPORT_URL = server.export_url
+        ev.ULOZISKO_DIR = Path(tempfile.mkdtemp())
+        vysledok = {
+            'koren': args.koren,
+            'roky': args.roky,
+            'zdielane': zdielane(ev, roky),
+            'relacia': na_relaciu(os.path.join(args.koren, 'app_google_sheets.py'), roky, args.relacii),
+        }
+
+    predosly = json.loads(Path(args.porovnaj).read_text(encoding='utf-8')) if args.porovnaj else None
+    riadky = [('dlhý formát (zdieľané)', 'zdielane', 'data_kb'), ('knihy lokalít (zdieľané)', 'zdielane', 'knihy_kb'),
+              ('zdieľané spolu', 'zdielane', 'spolu_kb'), ('držané na reláciu', 'relacia', 'drzane_kb'),
+              ('špička jednej relácie', 'relacia', 'spicka_kb')]
+    print(f"{args.roky} rokov, {len(ev.LOKALITY)} lokality, typy {vysledok['zdielane']['typy']}")
+    for nazov, cast, kluc in riadky:
+        riadok = f"{nazov:26} {vysledok[cast][kluc]:10.1f} kB"
+        if predosly:
+            riadok += f"   (predtým {predosly[cast][kluc]:10.1f} kB)"
+        print(riadok)
+    if args.vystup:
+        Path(args.vystup).write_text(json.dumps(vysledok, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
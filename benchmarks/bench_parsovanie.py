@@ -0,0 +1,49 @@
+"""
+Porovná pôvodné parsovanie (pd.read_csv + spracuj_data) s rýchlou cestou
+spracuj_csv na syntetickom viacročnom hárku a overí, že výsledky sú rovnaké.
+
+    python benchmarks/bench_parsovanie.py [--roky 10] [--opakovani 20]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd  # noqa: E402
+
+import evidencia as ev  # noqa: E402
+from syntetika import viacrocny_csv  # noqa: E402
+
+
+def zmeraj(funkcia, opakovani):
+    casy = []
+    for _ in range(opakovani):
+        start = time.perf_counter()
+        vysledok = funkcia()
+        casy.append(time.perf_counter() - start)
+    return min(casy), vysledok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--roky', type=int, default=10)
+    parser.add_argument('--opakovani', type=int, default=20)
+    args = parser.parse_args()
+
+    obsah = viacrocny_csv(2026 - args.roky + 1, args.roky)
+    t_povodne, povodne = zmeraj(lambda: ev.spracuj_data(pd.read_csv(io.BytesIO(obsah))), args.opakovani)
+    t_rychle, rychle = zmeraj(lambda: ev.spracuj_csv(obsah), args.opakovani)
+
+    print(f"hárok: {args.roky} rokov, {len(povodne)} riadkov, {len(obsah) / 1024:.0f} kB")
+    print(f"read_csv + spracuj_data: {t_povodne * 1000:7.2f} ms")
+    print(f"spracuj_csv:             {t_rychle * 1000:7.2f} ms   ({t_povodne / t_rychle:.1f}× rýchlejšie)")
+
+    pd.testing.assert_frame_equal(povodne, rychle)
+    print("OK — výsledky sú zhodné")
+
+
+if __name__ == '__main__':
+    main()
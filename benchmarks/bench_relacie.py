@@ -0,0 +1,140 @@
+"""
+Záťažový test: veľa súčasne otvorených relácií (AppTest) nad jedným
+procesom. Pre rastúci počet relácií zmeria čas opätovného behu (rerun)
+každej z nich a pamäť procesu (RSS). Na konci zmení mesiac v úložisku
+a overí, že všetky relácie dostanú novú verziu dát a stará snímka sa
+uvoľní.
+
+AppTest nie je bezpečný pre vlákna (každý beh mení globálny Runtime),
+relácie sa preto striedajú po jednej — ako fronta požiadaviek, ktoré
+server spracuje za sebou. Staršia verzia sa zmeria proti jej checkoutu:
+
+    python benchmarks/bench_relacie.py [--relacie 1 10 20 40]
+    git worktree add /tmp/pred HEAD~1
+    python benchmarks/bench_relacie.py --koren /tmp/pred
+"""
+import argparse
+import gc
+import json
+import re
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import weakref
+from pathlib import Path
+
+BENCHMARKY = Path(__file__).resolve().parent
+ZALOZKY = ['📊 Dashboard', '📈 Grafy', '📋 Detail']
+
+
+def rss_mb():
+    """Aktuálna pamäť procesu (VmRSS), mimo Linuxu maximum za beh."""
+    try:
+        with open('/proc/self/status') as f:
+            return int(re.search(r'VmRSS:\s+(\d+)', f.read()).group(1)) / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def nova_relacia(app, i):
+    """Relácia s otvorenou stránkou; každá tretia má inú záložku."""
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(app, default_timeout=120)
+    at.run()
+    at.session_state['zalozka'] = ZALOZKY[i % len(ZALOZKY)]
+    at.run()
+    return at
+
+
+def verzia(at):
+    """Verzia dát z informačného boxu stránky."""
+    for prvok in at.markdown:
+        najdene = re.search(r'Verzia dát: <code>(\w+)</code>', prvok.value)
+        if najdene:
+            return najdene.group(1)
+    return None
+
+
+def kolo(relacie):
+    """Jeden rerun každej relácie — časy v ms."""
+    casy = []
+    for at in relacie:
+        start = time.perf_counter()
+        at.run()
+        casy.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise SystemExit(f"relácia skončila chybou: {at.exception[0].message}")
+    return casy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--koren', default=str(BENCHMARKY.parent),
+                        help='checkout s evidencia.py a app_google_sheets.py')
+    parser.add_argument('--relacie', type=int, nargs='+', default=[1, 10, 20, 40])
+    parser.add_argument('--vystup', help='zapíše výsledok ako JSON do súboru')
+    args = parser.parse_args()
+
+    sys.path.insert(0, args.koren)
+    sys.path.insert(1, str(BENCHMARKY))
+    import streamlit.config
+    import streamlit.logger
+    streamlit.config.get_config_options()
+    streamlit.logger.set_log_level('error')
+    import evidencia as ev
+    from syntetika import LokalnyServer, mesiac_csv
+
+    rok = max(ev.ZOSITY)
+    harky = {gid: mesiac_csv(rok, m) for m, gid in ev.ZOSITY[rok]['gids'].items()}
+    app = str(Path(args.koren) / 'app_google_sheets.py')
+    vysledok = {'koren': args.koren, 'urovne': []}
+
+    with LokalnyServer(harky) as server:
+        ev.EXPORT_URL = server.export_url
+        ev.ULOZISKO_DIR = Path(tempfile.mkdtemp())
+        relacie = []
+        rss_start = None
+        print(f"{'relácií':>8} {'medián ms':>10} {'p95 ms':>8} {'RSS MB':>8} {'MB/relácia':>11}")
+        for pocet in sorted(args.relacie):
+            while len(relacie) < pocet:
+                relacie.append(nova_relacia(app, len(relacie)))
+            kolo(relacie)   # zahriatie po pridaní relácií
+            casy = kolo(relacie)
+            gc.collect()
+            rss = rss_mb()
+            rss_start = rss if rss_start is None else rss_start
+            uroven = {
+                'relacii': pocet,
+                'median_ms': round(statistics.median(casy), 1),
+                'p95_ms': round(statistics.quantiles(casy, n=20)[-1] if len(casy) > 1 else casy[0], 1),
+                'rss_mb': round(rss, 1),
+            }
+            vysledok['urovne'].append(uroven)
+            prirastok = (rss - rss_start) / (pocet - args.relacie[0]) if pocet > min(args.relacie) else 0
+            print(f"{pocet:8} {uroven['median_ms']:10.1f} {uroven['p95_ms']:8.1f} {rss:8.1f} {prirastok:11.2f}")
+
+        # Obnova počas záťaže — zmenený mesiac musia dostať všetky relácie
+        pred = {verzia(at) for at in relacie}
+        stara = weakref.ref(ev.aktualna_snimka(rok)) if hasattr(ev, 'aktualna_snimka') else None
+        zmeneny = mesiac_csv(rok, 1, seed=1)
+        oznacenie = ev._zdroj_mesiaca(rok, 1)   # staršie verzie vracajú (sheet_id, gid)
+        ev.uloz_mesiac_na_disk(rok, 1, ev.spracuj_csv(zmeneny), ev.hash_obsahu(zmeneny),
+                               oznacenie if isinstance(oznacenie, str) else "/".join(oznacenie))
+        casy = kolo(relacie)
+        po = {verzia(at) for at in relacie}
+        gc.collect()
+        uvolnena = None if stara is None else stara() is None
+        print(f"po zmene mesiaca: verzie {sorted(pred)} → {sorted(po)}, medián {statistics.median(casy):.1f} ms"
+              + ('' if uvolnena is None else f", stará snímka {'uvoľnená' if uvolnena else 'DRŽANÁ'}"))
+        assert len(po) == 1 and po != pred, "relácie nedostali novú verziu dát"
+        assert uvolnena in (None, True), "stará snímka ostala v pamäti"
+        vysledok['obnova'] = {'median_ms': round(statistics.median(casy), 1), 'stara_uvolnena': uvolnena}
+
+    if args.vystup:
+        Path(args.vystup).write_text(json.dumps(vysledok, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+Sada benchmarkov na syntetických dátach — sťahovanie, parsovanie,
+výpočet a zostavenie grafov v jednom behu.
+
+Hárky majú rozloženie skutočného exportu (BC/BH, `Bodos.1`, riadok
+`Spolu`, desatinné čiarky) a servíruje ich lokálny server namiesto
+Google Sheets. Mierka sa nastavuje počtom rokov, riadkov na mesiac
+a lokalít — nad BC a BH pribudnú bloky syntetických lokalít L3, L4 …
+aj v nastaveniach LOKALITY. Výsledok sa zapíše ako JSON, dva behy sa dajú porovnať:
+
+    python benchmarks/bench_sada.py --roky 3 --vystup pred.json
+    python benchmarks/bench_sada.py --roky 3 --vystup po.json --porovnaj pred.json
+    python benchmarks/bench_sada.py --roky 3 --lokality 20
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd  # noqa: E402
+import streamlit.config  # noqa: E402
+import streamlit.logger  # noqa: E402
+
+# Appka beží mimo `streamlit run` — bez varovaní o chýbajúcom kontexte behu.
+# Konfigurácia sa načíta vopred, inak by pri načítaní úroveň logov prepísala.
+streamlit.config.get_config_options()
+streamlit.logger.set_log_level('error')
+
+import evidencia as ev  # noqa: E402
+import app_google_sheets as app  # noqa: E402
+from syntetika import LokalnyServer, kody_lokalit, mesiac_csv  # noqa: E402
+
+POSLEDNY_ROK = 2026
+
+
+def zmeraj(funkcia, opakovani, priprava=None):
+    """Časy `funkcia()` v ms; `priprava` beží pred každým opakovaním a nemeria sa."""
+    casy = []
+    for _ in range(opakovani):
+        if priprava:
+            priprava()
+        start = time.perf_counter()
+        funkcia()
+        casy.append((time.perf_counter() - start) * 1000)
+    return {'min_ms': round(min(casy), 3), 'median_ms': round(statistics.median(casy), 3),
+            'opakovani': opakovani}
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def nastav_lokality(pocet):
+    """
+    Nastaví `pocet` lokalít — chýbajúce syntetické dostanú názov, limity
+    a počiatočný stav. Slovníky sa menia na mieste, appka ich importuje.
+    """
+    kody = kody_lokalit(pocet)
+    lokality = {k: ev.LOKALITY.get(k, {'nazov': f"Lokalita {k}", 'limity': (200, 80, True)}) for k in kody}
+    stavy = {k: ev.POCIATOCNY_STAV.get(k, 500.0) for k in kody}
+    ev.LOKALITY.clear()
+    ev.LOKALITY.update(lokality)
+    ev.POCIATOCNY_STAV.clear()
+    ev.POCIATOCNY_STAV.update(stavy)
+    return list(kody)
+
+
+def spusti(roky, dni, pocet_lokalit, opakovani):
+    """Spustí všetky etapy a vráti slovník výsledkov."""
+    lokality = nastav_lokality(pocet_lokalit)
+    roky_zoznam = list(range(POSLEDNY_ROK - roky + 1, POSLEDNY_ROK + 1))
+    ev.ZOSITY = {
+        rok: {'sheet_id': f"bench{rok}", 'gids': {m: f"{rok}{m:02d}" for m in range(1, 13)}}
+        for rok in roky_zoznam
+    }
+    ev.PRVY_ROK = roky_zoznam[0]
+    harky = {gid: mesiac_csv(rok, m, dni=dni, lokality=lokality)
+             for rok, zosit in ev.ZOSITY.items() for m, gid in zosit['gids'].items()}
+    od, do = (roky_zoznam[0], 1), (POSLEDNY_ROK, 12)
+    etapy = {}
+
+    with LokalnyServer(harky) as server:
+        ev.EXPORT_URL = server.export_url
+        ev.ULOZISKO_DIR = Path(tempfile.mkdtemp())
+
+        def stiahni_vsetko():
+            for zosit in ev.ZOSITY.values():
+                for gid in zosit['gids'].values():
+                    ev.nacitaj_z_google_sheets(zosit['sheet_id'], gid)
+
+        etapy['stiahnutie'] = zmeraj(stiahni_vsetko, opakovani, ev.nacitaj_z_google_sheets.clear)
+        etapy['parsovanie_spracuj_data'] = zmeraj(
+            lambda: [ev.spracuj_data(pd.read_csv(io.BytesIO(h))) for h in harky.values()], opakovani)
+        etapy['parsovanie_spracuj_csv'] = zmeraj(
+            lambda: [ev.spracuj_csv(h) for h in harky.values()], opakovani)
+
+        def studeny_start():
+            ev.vycisti_cache()
+            ev.zneplatni_ulozisko()
+
+        etapy['nacitaj_mesiace_studene'] = zmeraj(
+            lambda: ev.nacitaj_mesiace(od, do), opakovani, studeny_start)
+        etapy['nacitaj_mesiace_z_uloziska'] = zmeraj(
+            lambda: ev.nacitaj_mesiace(od, do), opakovani, ev.vycisti_cache)
+
+        data, chyby, _ = ev.nacitaj_mesiace(od, do)
+        if chyby:
+            raise SystemExit(f"chyby pri načítaní: {chyby}")
+
+    poc = ev.pociatocne_stavy(roky_zoznam[0])
+    datum = pd.Timestamp(data['Datum'].max()).date()
+    knihy = {}
+
+    def postav():
+        for lokalita in lokality:
+            knihy[lokalita] = ev.Kniha(data, lokalita, poc[lokalita])
+
+    etapy['kniha'] = zmeraj(postav, opakovani)
+    etapy['vypocitaj'] = zmeraj(
+        lambda: [ev.vypocitaj(knihy[l], datum) for l in lokality], opakovani)
+    etapy['sucty_lokalit'] = zmeraj(lambda: ev.sucty_lokalit(data), opakovani)
+    etapy['mesacne_sumare'] = zmeraj(
+        lambda: [ev.vypocitaj_mesacne_sumare(knihy[l], datum) for l in lokality], opakovani)
+    etapy['suhrny_kocky'] = zmeraj(
+        lambda: [knihy[l].suhrny(z, do=datum) for l in lokality for z in ev.OBDOBIA], opakovani)
+
+    # Grafy — st.plotly_chart sa nahradí zberom figúr, meria sa ich zostavenie
+    figury = []
+    povodny_chart = app.st.plotly_chart
+    app.st.plotly_chart = lambda fig, **kwargs: figury.append(fig)
+    try:
+        etapy['grafy'] = zmeraj(
+            lambda: [app.grafy(knihy[l], datum) for l in lokality], opakovani, figury.clear)
+    finally:
+        app.st.plotly_chart = povodny_chart
+
+    return {
+        'cas': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'prostredie': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platforma': platform.platform(),
+        },
+        'mierka': {
+            'roky': roky,
+            'dni_na_mesiac': dni,
+            'lokality': lokality,
+            'harkov': len(harky),
+            'riadkov_na_lokalitu': len(knihy[lokality[0]]),
+            'kb_csv': round(sum(len(h) for h in harky.values()) / 1024, 1),
+        },
+        'etapy': etapy,
+        'grafy_json_kb': round(sum(len(f.to_json()) for f in figury) / 1024, 1),
+    }
+
+
+def vypis(vysledok, predosly=None):
+    m = vysledok['mierka']
+    print(f"mierka: {m['roky']} r., {m['harkov']} hárkov, {m['riadkov_na_lokalitu']} riadkov/lokalitu, "
+          f"{m['kb_csv']} kB CSV, lokality {', '.join(m['lokality'])}")
+    for nazov, e in vysledok['etapy'].items():
+        riadok = f"{nazov:28} min {e['min_ms']:10.2f} ms   medián {e['median_ms']:10.2f} ms"
+        if predosly and nazov in predosly['etapy']:
+            pred = predosly['etapy'][nazov]['min_ms']
+            riadok += f"   (predtým {pred:10.2f} ms, {pred / e['min_ms']:5.2f}×)"
+        print(riadok)
+    print(f"{'grafy JSON':28} {vysledok['grafy_json_kb']:10.1f} kB"
+          + (f"   (predtým {predosly['grafy_json_kb']:.1f} kB)" if predosly else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--roky', type=int, default=1, help='počet rokov histórie')
+    parser.add_argument('--dni', type=int, default=None,
+                        help='riadkov na mesačný hárok (predvolene počet dní mesiaca)')
+    parser.add_argument('--lokality', type=int, default=len(ev.LOKALITY),
+                        help='počet lokalít (nad BC a BH syntetické L3, L4 …)')
+    parser.add_argument('--opakovani', type=int, default=5)
+    parser.add_argument('--vystup', help='zapíše výsledok ako JSON do súboru')
+    parser.add_argument('--porovnaj', help='JSON predošlého behu na porovnanie')
+    args = parser.parse_args()
+
+    vysledok = spusti(args.roky, args.dni, args.lokality, args.opakovani)
+    predosly = json.loads(Path(args.porovnaj).read_text(encoding='utf-8')) if args.porovnaj else None
+    vypis(vysledok, predosly)
+    if args.vystup:
+        Path(args.vystup).write_text(json.dumps(vysledok, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Overí sťahovanie proti lokálnemu serveru, ktorý zlyháva a zasekáva sa.
+
+Scenáre: opakované použitie spojení (keep-alive), dočasné chyby 503
+s opakovaním, zaseknutý hárok s časovým limitom, chyba, ktorá neostane
+v cache, prihlasovacia stránka namiesto CSV, ktorá neprepíše uložený
+mesiac, a istič, ktorý pri nedostupnom zdroji vráti uložené dáta bez
+ďalších požiadaviek.
+
+    python benchmarks/bench_siet.py
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import evidencia as ev  # noqa: E402
+from syntetika import LokalnyServer, mesiac_csv  # noqa: E402
+
+SHEET = ev.ZOSITY[2026]['sheet_id']
+GIDS = ev.ZOSITY[2026]['gids']
+
+
+def od_nuly():
+    """Prázdne cache, úložisko aj ističe."""
+    ev.vycisti_cache()
+    ev.zneplatni_ulozisko()
+    ev._ISTICE.clear()
+
+
+def keep_alive(server):
+    od_nuly()
+    spojenia = server.spojenia
+    start = time.perf_counter()
+    for gid in GIDS.values():
+        _, _, chyba = ev.nacitaj_z_google_sheets(SHEET, gid)
+        assert chyba is None, chyba
+    cas = time.perf_counter() - start
+    nove = server.spojenia - spojenia
+    print(f"keep-alive:      12 hárkov za {cas * 1000:.0f} ms, {nove} nových spojení")
+    assert nove <= 1, "spojenie sa nepoužilo znova"
+
+
+def docasne_chyby(server):
+    od_nuly()
+    server.zlyhania[GIDS[1]] = ev.POKUSOV - 1
+    poziadavky = server.poziadavky
+    _, _, chyba = ev.nacitaj_z_google_sheets(SHEET, GIDS[1])
+    print(f"dočasné 503:     chyba {chyba!r}, {server.poziadavky - poziadavky} požiadaviek")
+    assert chyba is None and server.poziadavky - poziadavky == ev.POKUSOV
+
+
+def zaseknutie(server):
+    od_nuly()
+    server.oneskorenie[GIDS[2]] = 3.0
+    start = time.perf_counter()
+    _, _, chyba = ev.nacitaj_z_google_sheets(SHEET, GIDS[2])
+    cas = time.perf_counter() - start
+    server.oneskorenie.pop(GIDS[2])
+    print(f"zaseknutý hárok: vzdané po {cas:.2f} s ({chyba[:60]}…)")
+    assert chyba and cas < 2.5, "čítanie nemá časový limit"
+
+
+def chyba_sa_neulozi(server):
+    od_nuly()
+    server.zlyhania[GIDS[3]] = ev.POKUSOV
+    _, _, chyba = ev.nacitaj_z_google_sheets(SHEET, GIDS[3])
+    assert chyba
+    obsah, _, chyba = ev.nacitaj_z_google_sheets(SHEET, GIDS[3])
+    print(f"po chybe:        ďalšie volanie {'stiahlo hárok' if obsah else 'vrátilo chybu'}")
+    assert obsah and chyba is None, "chyba ostala v cache"
+
+
+def prihlasenie(server):
+    od_nuly()
+    ulozene, _, chyba = ev.nacitaj_mesiac(2026, 4)
+    assert chyba is None and len(ulozene)
+    csv = server.harky[GIDS[4]]
+    ev._zabudni_stiahnute([(2026, 4)])
+    server.harky[GIDS[4]] = b'<!DOCTYPE html><html><head><title>Sign in - Google Accounts</title></head></html>'
+    data, _, chyba = ev.nacitaj_mesiac(2026, 4, max_vek=0)
+    server.harky[GIDS[4]] = csv
+    print(f"prihlásenie:     {chyba[:60]}…")
+    assert chyba and 'nedá spracovať' in chyba, chyba
+    assert data.equals(ulozene) and ev.nacitaj_mesiac_z_disku(2026, 4)[0].equals(ulozene), "uložený mesiac sa prepísal"
+
+
+def istic(server):
+    od_nuly()
+    ev.nacitaj_mesiace((2026, 1), (2026, 12))
+    server.zlyhania['*'] = 10_000
+    ev.vycisti_cache()
+    poziadavky = server.poziadavky
+    start = time.perf_counter()
+    data, chyby, _ = ev.nacitaj_mesiace((2026, 1), (2026, 12), max_vlakien=1, max_vek=0)
+    cas = time.perf_counter() - start
+    odoslane = server.poziadavky - poziadavky
+    print(f"istič:           {odoslane} požiadaviek na 12 mesiacov za {cas:.2f} s, "
+          f"{data['Datum'].nunique()} uložených dní, chyby {len(chyby)}")
+    assert data['Datum'].nunique() == 365 and len(chyby) == 12
+    assert odoslane == ev.ISTIC_ZLYHANI * ev.POKUSOV, "istič nezastavil požiadavky"
+    assert 'nedostupný' in chyby[-1]
+
+    # Po pauze stačí jedno úspešné skúšobné stiahnutie a istič sa zapne
+    server.zlyhania.clear()
+    time.sleep(ev.ISTIC_PAUZA)
+    _, _, chyba = ev.nacitaj_mesiac(2026, 1, max_vek=0)
+    print(f"istič po pauze:  {'zapnutý' if not chyba else chyba}")
+    assert chyba is None and not ev.istic(server.export_url).vypnuty
+
+
+def main():
+    ev.TIMEOUT = (1, 0.5)
+    ev.CAKANIE_PRED_POKUSOM = 0.05
+    ev.ISTIC_PAUZA = 0.5
+    harky = {gid: mesiac_csv(2026, m) for m, gid in GIDS.items()}
+
+    with LokalnyServer(harky) as server:
+        ev.EXPORT_URL = server.export_url
+        ev.ULOZISKO_DIR = Path(tempfile.mkdtemp())
+        for scenar in (keep_alive, docasne_chyby, zaseknutie, chyba_sa_neulozi, prihlasenie, istic):
+            scenar(server)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Profil studeného štartu: každé meranie je nový proces ako po štarte
+kontajnera. Zmeria import Streamlitu (server pred prvou reláciou), čas
+do prvého prvku stránky a do vykreslenia celej stránky pri prvej relácii,
+opätovný beh po zmene lokality (medián piatich) a prvé otvorenie záložky Grafy. K tomu
+rozpis importov, ktoré zaplatí prvá relácia (python -X importtime).
+
+Dáta ležia v adresári CSV a v úložisku, nič sa nesťahuje. Staršia
+verzia sa zmeria proti jej checkoutu a dva behy sa dajú porovnať:
+
+    git worktree add /tmp/pred HEAD~1
+    python benchmarks/bench_start.py --koren /tmp/pred --vystup pred.json
+    python benchmarks/bench_start.py --vystup po.json --porovnaj pred.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCHMARKY = Path(__file__).resolve().parent
+# Balíky, ktorých import sa rozpíše (kumulatívny čas pri prvom importe)
+BALIKY = ['pandas', 'numpy', 'pyarrow', 'plotly', 'requests', 'evidencia']
+
+
+def beh(app):
+    """Jedno meranie v tomto procese — volá ho main() v novom procese pre každé opakovanie."""
+    zaciatok = time.perf_counter()
+    import streamlit.runtime.forward_msg_queue as fronta
+    prvy_prvok = []
+    povodne = fronta.ForwardMsgQueue.enqueue
+
+    def zarad(self, sprava):
+        # Prvý prvok stránky odchádza do prehliadača hneď, ako sa zaradí
+        if not prvy_prvok and sprava.WhichOneof('type') == 'delta':
+            prvy_prvok.append(time.perf_counter())
+        return povodne(self, sprava)
+
+    fronta.ForwardMsgQueue.enqueue = zarad
+    import streamlit.config
+    import streamlit.logger
+    from streamlit.testing.v1 import AppTest
+    streamlit.config.get_config_options()
+    streamlit.logger.set_log_level('error')
+    server = time.perf_counter()
+
+    at = AppTest.from_file(app, default_timeout=120)
+    at.run()
+    prva = time.perf_counter()
+    if at.exception:
+        raise SystemExit(f"appka skončila chybou: {at.exception[0].message}")
+    casy = []
+    for i in range(1, 6):   # prvé behy prekrýva obnova na pozadí po štarte — medián
+        lokalita = next(r for r in at.radio if 'Lokalita' in r.label)
+        lokalita.set_value(lokalita.options[i % 2])
+        start = time.perf_counter()
+        at.run()
+        casy.append(time.perf_counter() - start)
+    rerun = statistics.median(casy)
+    at.session_state['zalozka'] = '📈 Grafy'
+    start = time.perf_counter()
+    at.run()
+    grafy = time.perf_counter() - start
+    return {
+        'server_ms': (server - zaciatok) * 1000,
+        'prvy_prvok_ms': (prvy_prvok[0] - server) * 1000,
+        'prva_stranka_ms': (prva - server) * 1000,
+        'rerun_ms': rerun * 1000,
+        'prve_grafy_ms': grafy * 1000,
+    }
+
+
+def importy(stderr: str, pred: set) -> dict:
+    """Kumulatívny čas importu BALIKY (ms) z výpisu -X importtime, okrem tých zo štartu servera."""
+    casy = {}
+    for riadok in stderr.splitlines():
+        najdene = re.match(r'import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$', riadok)
+        if najdene and najdene.group(2) in BALIKY and najdene.group(2) not in pred:
+            casy[najdene.group(2)] = int(najdene.group(1)) / 1000
+    return casy
+
+
+def priprav(koren):
+    """Adresár CSV a úložisko so všetkými mesiacmi posledného roka — prostredie pre nové procesy."""
+    sys.path.insert(0, str(koren))
+    sys.path.insert(1, str(BENCHMARKY))
+    import evidencia as ev
+    from syntetika import mesiac_csv
+
+    rok = max(ev.ZOSITY)
+    docasny = Path(tempfile.mkdtemp())
+    env = dict(os.environ, STIEPKA_ZDROJ='adresar', STIEPKA_ZDROJ_CESTA=str(docasny / 'csv'),
+               STIEPKA_ULOZISKO=str(docasny / 'ulozisko'))
+    ev.ZDROJ, ev.ZDROJ_CESTA = env['STIEPKA_ZDROJ'], env['STIEPKA_ZDROJ_CESTA']
+    ev.ULOZISKO_DIR = Path(env['STIEPKA_ULOZISKO'])
+    for mesiac in range(1, 13):
+        obsah = mesiac_csv(rok, mesiac)
+        subor = docasny / 'csv' / str(rok) / f"{mesiac:02d}.csv"
+        subor.parent.mkdir(parents=True, exist_ok=True)
+        subor.write_bytes(obsah)
+        oznacenie = ev._zdroj_mesiaca(rok, mesiac)   # staršie verzie: (sheet_id, gid) zo ZOSITY
+        ev.uloz_mesiac_na_disk(rok, mesiac, ev.spracuj_csv(obsah), ev.hash_obsahu(obsah),
+                               oznacenie if isinstance(oznacenie, str) else "/".join(oznacenie))
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--koren', default=str(BENCHMARKY.parent),
+                        help='checkout s evidencia.py a app_google_sheets.py')
+    parser.add_argument('--opakovani', type=int, default=5)
+    parser.add_argument('--vystup', help='zapíše výsledok ako JSON do súboru')
+    parser.add_argument('--porovnaj', help='JSON predošlého behu na porovnanie')
+    parser.add_argument('--beh', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    app = str(Path(args.koren) / 'app_google_sheets.py')
+
+    if args.beh:   # nový proces jedného merania
+        print(json.dumps(beh(app)))
+        return
+
+    env = priprav(args.koren)
+    # Balíky, ktoré načíta už štart servera (import Streamlitu), sa prvej relácii nepočítajú
+    server = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import streamlit.testing.v1'],
+                            env=env, capture_output=True, text=True)
+    pred = set(importy(server.stderr, set()))
+
+    merania, rozpisy = [], []
+    for _ in range(args.opakovani):
+        vysledok = subprocess.run(
+            [sys.executable, '-X', 'importtime', __file__, '--koren', args.koren, '--beh', '1'],
+            env=env, capture_output=True, text=True, cwd=args.koren)
+        if vysledok.returncode:
+            raise SystemExit(vysledok.stderr[-2000:])
+        merania.append(json.loads(vysledok.stdout.strip().splitlines()[-1]))
+        rozpisy.append(importy(vysledok.stderr, pred))
+
+    vystup = {
+        'koren': args.koren,
+        'casy': {k: round(statistics.median(m[k] for m in merania), 1) for k in merania[0]},
+        'importy': {k: round(statistics.median(r.get(k, 0) for r in rozpisy), 1)
+                    for k in BALIKY if any(k in r for r in rozpisy)},
+        'uz_pri_starte_servera': sorted(pred),
+    }
+    predosly = json.loads(Path(args.porovnaj).read_text(encoding='utf-8')) if args.porovnaj else None
+    popisy = {
+        'server_ms': 'import Streamlitu (server)',
+        'prvy_prvok_ms': 'prvá relácia: prvý prvok',
+        'prva_stranka_ms': 'prvá relácia: celá stránka',
+        'rerun_ms': 'rerun po zmene lokality',
+        'prve_grafy_ms': 'prvé otvorenie Grafov',
+    }
+    print(f"medián z {args.opakovani} nových procesov, balíky už pri štarte servera: "
+          f"{', '.join(vystup['uz_pri_starte_servera']) or '—'}")
+    riadky = [(popis, 'casy', k) for k, popis in popisy.items()]
+    riadky += [(f"  import {k} v prvej relácii", 'importy', k) for k in vystup['importy']]
+    for popis, cast, kluc in riadky:
+        riadok = f"{popis:34} {vystup[cast][kluc]:8.1f} ms"
+        if predosly and kluc in predosly.get(cast, {}):
+            riadok += f"   (predtým {predosly[cast][kluc]:8.1f} ms)"
+        print(riadok)
+    if args.vystup:
+        Path(args.vystup).write_text(json.dumps(vystup, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Porovná postupné a súbežné sťahovanie mesiacov v `nacitaj_mesiace`.
+
+Každý mesiac má na lokálnom serveri iné umelé oneskorenie. Pri súbežnom
+režime má celkový čas zodpovedať najpomalšiemu mesiacu, nie súčtu.
+
+    python benchmarks/bench_subezne_nacitanie.py
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import evidencia as ev  # noqa: E402
+from syntetika import LokalnyServer, mesiac_csv  # noqa: E402
+
+
+def zmeraj(max_vlakien):
+    # Studený štart — bez cache v pamäti aj v úložisku
+    ev.nacitaj_z_google_sheets.clear()
+    ev.spracuj_mesiac.clear()
+    ev.zneplatni_ulozisko()
+    start = time.perf_counter()
+    data, chyby, _ = ev.nacitaj_mesiace((2026, 1), (2026, 12), max_vlakien=max_vlakien)
+    return time.perf_counter() - start, data, chyby
+
+
+def main():
+    harky = {gid: mesiac_csv(2026, m) for m, gid in ev.SHEET_GIDS.items()}
+    oneskorenie = {gid: 0.1 + 0.05 * m for m, gid in ev.SHEET_GIDS.items()}
+    najpomalsi, sucet = max(oneskorenie.values()), sum(oneskorenie.values())
+
+    with LokalnyServer(harky, oneskorenie) as server:
+        ev.EXPORT_URL = server.export_url
+        ev.ULOZISKO_DIR = Path(tempfile.mkdtemp())
+        t_post, data_post, chyby_post = zmeraj(1)
+        t_sub, data_sub, chyby_sub = zmeraj(ev.MAX_SUBEZNYCH_STAHOVANI)
+
+    print(f"najpomalší mesiac: {najpomalsi:.2f} s, súčet oneskorení: {sucet:.2f} s")
+    print(f"postupne:          {t_post:.2f} s")
+    print(f"súbežne:           {t_sub:.2f} s")
+
+    assert not chyby_post and not chyby_sub, (chyby_post, chyby_sub)
+    assert data_post.equals(data_sub), "poradie výsledkov sa líši"
+    assert t_post >= sucet
+    # Rezerva na parsovanie a réžiu vlákien — stále ďaleko pod súčtom oneskorení
+    assert t_sub < najpomalsi + (sucet - najpomalsi) / 4, "súbežný čas nesleduje najpomalší mesiac"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Zmeria vykreslenie appky cez Streamlit AppTest: počet prvkov, veľkosť
+správ posielaných do prehliadača a čas opätovného behu (rerun).
+
+Dáta sú syntetické a ležia v dočasnom úložisku, takže sa nič nesťahuje.
+Prvky sa počítajú pre celú stránku (s prvou záložkou) aj pre každú
+záložku po jej otvorení. Porovnanie so staršou verziou — spustiť proti
+jej checkoutu:
+
+    python benchmarks/bench_vykreslenie.py [--datum 31.12.2026] [--vystup po.json]
+    git worktree add /tmp/pred HEAD~1
+    python benchmarks/bench_vykreslenie.py --app /tmp/pred/app_google_sheets.py --vystup pred.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+KOREN = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(KOREN))
+os.environ['STIEPKA_ULOZISKO'] = tempfile.mkdtemp()   # pred importom evidencia
+
+import evidencia as ev  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from syntetika import LokalnyServer, mesiac_csv  # noqa: E402
+
+
+def priprav_ulozisko(rok):
+    """
+    Uloží syntetické mesiace roka, akoby boli stiahnuté z nastaveného zošita,
+    a vráti ich hárky {gid: CSV} pre lokálny server — obnova na pozadí
+    tak nechodí do Google Sheets a nič nezmení.
+    """
+    zosit = ev.ZOSITY[rok]
+    harky = {}
+    for mesiac, gid in zosit['gids'].items():
+        harky[gid] = mesiac_csv(rok, mesiac)
+        ev.uloz_mesiac_na_disk(rok, mesiac, ev.spracuj_csv(harky[gid]), ev.hash_obsahu(harky[gid]),
+                               f"{zosit['sheet_id']}/{gid}")
+    return harky
+
+
+def prvky(uzol):
+    """Všetky prvky (listy stromu) pod uzlom."""
+    deti = getattr(uzol, 'children', None)
+    if not deti:
+        yield uzol
+        return
+    for dieta in deti.values():
+        yield from prvky(dieta)
+
+
+def statistika(uzol):
+    zoznam = [p for p in prvky(uzol) if getattr(p, 'proto', None) is not None]
+    return {
+        'prvkov': len(zoznam),
+        'bajtov': sum(p.proto.ByteSize() for p in zoznam),
+        'podla_typu': dict(Counter(p.type for p in zoznam).most_common()),
+    }
+
+
+def zmeraj_app(app, datum, opakovani):
+    at = AppTest.from_file(app, default_timeout=120)
+    at.run()
+    at.date_input[0].set_value(datum).run()
+    if at.exception:
+        raise SystemExit(f"appka skončila chybou: {at.exception[0].message}")
+
+    casy = []
+    for _ in range(opakovani):
+        start = time.perf_counter()
+        at.run()
+        casy.append((time.perf_counter() - start) * 1000)
+
+    stranka = statistika(at._tree)
+    # Každá záložka otvorená zvlášť — appka s lenivými záložkami počíta len
+    # otvorenú, staršia verzia bez kľúča 'zalozka' kreslí vždy všetky
+    zalozky = {}
+    for tab in [t.label for t in at.tabs]:
+        at.session_state['zalozka'] = tab
+        at.run()
+        zalozky[tab] = statistika(next(t for t in at.tabs if t.label == tab))
+
+    return {
+        'app': app,
+        'datum': datum.isoformat(),
+        'rerun_ms': {'min': round(min(casy), 2), 'median': round(statistics.median(casy), 2)},
+        'stranka': stranka,
+        'zalozky': zalozky,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--app', default=str(KOREN / 'app_google_sheets.py'))
+    parser.add_argument('--datum', default='31.12.2026', help='DD.MM.RRRR')
+    parser.add_argument('--opakovani', type=int, default=10)
+    parser.add_argument('--vystup', help='zapíše výsledok ako JSON do súboru')
+    args = parser.parse_args()
+
+    datum = datetime.strptime(args.datum, '%d.%m.%Y').date()
+    with LokalnyServer(priprav_ulozisko(datum.year)) as server:
+        ev.EXPORT_URL = server.export_url
+        vysledok = zmeraj_app(args.app, datum, args.opakovani)
+
+    print(f"rerun: min {vysledok['rerun_ms']['min']:.1f} ms, medián {vysledok['rerun_ms']['median']:.1f} ms")
+    for nazov, s in [('celá stránka', vysledok['stranka'])] + list(vysledok['zalozky'].items()):
+        print(f"{nazov:16} {s['prvkov']:5} prvkov  {s['bajtov'] / 1024:8.1f} kB")
+    if args.vystup:
+        Path(args.vystup).write_text(json.dumps(vysledok, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
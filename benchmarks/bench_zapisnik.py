@@ -0,0 +1,193 @@
+"""
+Overí zápisník pohybov: snímka doplnená o zápisy po jednom musí byť
+rovnaká ako snímka postavená odznova (knihy, zostatky, súhrny všetkých
+zrnitostí, stav k dňu), aj po rozpísanom riadku, zhutnení a zosúladení
+s hárkom, ktorý zápisy prevzal. Zmeria cenu jedného zápisu proti stavbe
+snímky roka a proti načítaniu zmeneného mesiaca.
+
+    python benchmarks/bench_zapisnik.py [--zapisov 300]
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import evidencia as ev  # noqa: E402
+from syntetika import HLAVICKA, mesiac_riadky  # noqa: E402
+
+DNI_V_MESIACI = 12   # riadkov na mesiac — zápisy padnú aj na dni, ktoré v knihe ešte nie sú
+
+
+def zapis_csv(cesta: Path, riadky):
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator='\r\n')
+    w.writerow(HLAVICKA)
+    w.writerows(riadky)
+    cesta.parent.mkdir(parents=True, exist_ok=True)
+    cesta.write_bytes(buf.getvalue().encode('utf-8'))
+
+
+def porovnaj(ziva, nova, datum):
+    """Snímka so zápismi po jednom = snímka postavená odznova."""
+    assert set(ziva.knihy) == set(nova.knihy), (set(ziva.knihy), set(nova.knihy))
+    for lokalita, a in ziva.knihy.items():
+        b = nova.knihy[lokalita]
+        assert (a.datumy == b.datumy).all(), lokalita
+        for c in ev.Kniha.STLPCE:
+            np.testing.assert_allclose(a.kum[c], b.kum[c], atol=1e-6)
+        np.testing.assert_allclose(a.zostatky, b.zostatky, atol=1e-6)
+        pd.testing.assert_frame_equal(a.data, b.data, check_exact=False, atol=1e-4)
+        for zrnitost in ev.OBDOBIA:
+            pd.testing.assert_frame_equal(a.suhrny(zrnitost), b.suhrny(zrnitost), check_exact=False, atol=1e-6)
+        stav_a, stav_b = ev.vypocitaj(a, datum), ev.vypocitaj(b, datum)
+        for k, v in stav_a.items():
+            if k != 'data_filtered':
+                assert abs(v - stav_b[k]) < 1e-6, (lokalita, k, v, stav_b[k])
+        sumare_a, sumare_b = ev.vypocitaj_mesacne_sumare(a, datum), ev.vypocitaj_mesacne_sumare(b, datum)
+        assert [(s['rok'], s['mesiac'], s['dni']) for s in sumare_a] == [(s['rok'], s['mesiac'], s['dni']) for s in sumare_b]
+        assert all(abs(x[k] - y[k]) < 1e-6 for x, y in zip(sumare_a, sumare_b) for k in ('prijem', 'spotreba', 'zostatok'))
+
+
+def odznova(rok):
+    """Snímka roka postavená z úložiska a zápisníka bez snímok v pamäti."""
+    ev.snimka_roka.clear()
+    ev._ZIVE.clear()
+    return ev.SnimkaRoka(rok)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--zapisov', type=int, default=300)
+    args = parser.parse_args()
+
+    dnes = date.today()
+    rok = dnes.year
+    assert rok in ev.ZOSITY, f"rok {rok} nie je v ZOSITY"
+    docasny = Path(tempfile.mkdtemp())
+    ev.ZDROJ, ev.ZDROJ_CESTA = 'adresar', str(docasny / 'csv')
+    ev.ULOZISKO_DIR = docasny / 'ulozisko'
+    ev.ZHUTNIT_PO = 10 ** 9   # zhutňuje sa len ručne
+    harky = {m: mesiac_riadky(rok, m, dni=DNI_V_MESIACI) for m in range(1, dnes.month + 1)}
+    for mesiac, riadky in harky.items():
+        zapis_csv(Path(ev.ZDROJ_CESTA) / str(rok) / f"{mesiac:02d}.csv", riadky)
+    data, chyby, _ = ev.nacitaj_mesiace((rok, 1), (rok, dnes.month))   # uloží mesiace do úložiska
+    assert not chyby, chyby
+
+    start = time.perf_counter()
+    snimka = ev.aktualna_snimka(rok)
+    cas_snimky = (time.perf_counter() - start) * 1000
+    print(f"rok {rok}: {len(data)} riadkov, knihy {', '.join(f'{k} {len(v)} dní' for k, v in snimka.knihy.items())}")
+
+    # Zápisy po jednom — každý sa hneď prejaví v snímke
+    rnd = random.Random(0)
+    dni_roka = (dnes - date(rok, 1, 1)).days
+    casy = []
+    for _ in range(args.zapisov):
+        datum = date(rok, 1, 1) + timedelta(rnd.randint(0, dni_roka))
+        polozka = rnd.choice(ev.POLOZKY)
+        tony = round(rnd.uniform(-5, 40), 2) or 1.0
+        start = time.perf_counter()
+        ev.zapis_pohyb(rnd.choice(list(ev.LOKALITY)), datum, polozka, tony)
+        ziva = ev.aktualna_snimka(rok)
+        casy.append((time.perf_counter() - start) * 1000)
+    assert len(ziva.zapisy) == args.zapisov
+    novych = sum(len(ziva.knihy[k]) - len(snimka.knihy.get(k, ())) for k in ziva.knihy)
+    print(f"{args.zapisov} zápisov ({novych} nových dní v knihách), zápis aj so snímkou: "
+          f"medián {statistics.median(casy):.2f} ms, max {max(casy):.2f} ms")
+
+    # Rozpísaný posledný riadok po páde sa preskočí, ďalší zápis sa nestratí
+    with open(ev.zapisnik().subor, 'ab') as f:
+        f.write(b'{"id": "rozpisany", "datum": "20')
+    ev.zapis_pohyb('BC', dnes, 'Spotreba', 1.5)
+    assert [z['id'] for z in ev.Zapisnik(ev.ULOZISKO_DIR).zaznamy()] == [z['id'] for z in ev.zapisnik().zaznamy()]
+    assert len(ev.zapisnik().zaznamy()) == args.zapisov + 1
+
+    ziva = ev.aktualna_snimka(rok)
+    start = time.perf_counter()
+    nova = odznova(rok)
+    cas_odznova = (time.perf_counter() - start) * 1000
+    porovnaj(ziva, nova, dnes)
+    stavy, _ = ev.stav_ku_dnu(dnes)
+    for lokalita, stav in stavy.items():
+        assert abs(stav['zostatok'] - ziva.knihy[lokalita].zostatok(dnes)) < 1e-6
+    print("snímka so zápismi po jednom = snímka postavená odznova (knihy, súhrny, stav k dňu)")
+
+    # Zmenený mesiac sa načíta a spracuje znova (tu z disku, nie zo siete)
+    mesiac = dnes.month
+    harky[mesiac][0][1] = '1,23'
+    zapis_csv(Path(ev.ZDROJ_CESTA) / str(rok) / f"{mesiac:02d}.csv", harky[mesiac])
+    start = time.perf_counter()
+    ev.nacitaj_mesiac(rok, mesiac, max_vek=0)
+    cas_mesiaca = (time.perf_counter() - start) * 1000
+    print(f"{'jeden zápis':34} {statistics.median(casy):8.2f} ms")
+    print(f"{'stavba snímky roka (prvá)':34} {cas_snimky:8.2f} ms")
+    print(f"{'stavba snímky roka so zápismi':34} {cas_odznova:8.2f} ms")
+    print(f"{'zmenený mesiac z adresára CSV':34} {cas_mesiaca:8.2f} ms")
+
+    # Zhutnenie: zápisník je prázdny, výsledky rovnaké
+    pred = ev.aktualna_snimka(rok)
+    zhutnene = ev.zapisnik().zhutni()
+    assert not ev.zapisnik().zaznamy() and ev.zapisnik().subor.stat().st_size == 0
+    po = ev.aktualna_snimka(rok)
+    assert po is not pred and len(po.zapisy) == args.zapisov + 1
+    porovnaj(pred, po, dnes)
+    print(f"zhutnenie {len(zhutnene)} mesiacov — zápisník prázdny, snímka rovnaká")
+
+    # Zosúladenie: hárok prevezme časť zápisov mesiaca (zhutnených aj v zápisníku)
+    mesiac = max(1, dnes.month - 1)
+    riadky = harky[mesiac]
+    ev.zapisnik().vyrad([z for z in ev.zapisnik().mesiaca(rok, mesiac)])
+    datum_riadku = [date(rok, mesiac, int(r[0].split('/')[1])) for r in riadky[:-1]]
+    bunky = [('BC', 0, 'Bodos'), ('BC', 0, 'Bodos'), ('BH', 1, 'Spotreba'),   # hárok ich prevezme
+             ('BC', 2, 'Jankula'),                                            # v hárku chýba
+             ('BH', 3, 'Recyklácia')]                                        # hárok má iné číslo
+    zapisane = []
+    for k, (lokalita, riadok, polozka) in enumerate(bunky):
+        zapisane.append(ev.zapis_pohyb(lokalita, datum_riadku[riadok], polozka, 10.25 + k))
+        if k == 2:
+            ev.zapisnik().zhutni()
+    pred = ev.aktualna_snimka(rok)
+    for (lokalita, riadok, polozka), z in zip(bunky, zapisane):
+        if z is zapisane[3]:
+            continue
+        stlpec = HLAVICKA.index(lokalita) + 1 + ev.POLOZKY.index(polozka)
+        bunka = float((riadky[riadok][stlpec] or '0').replace(',', '.'))
+        navyse = 1.0 if z is zapisane[4] else 0.0
+        riadky[riadok][stlpec] = f"{bunka + z['tony'] + navyse:.2f}".replace('.', ',')
+    zapis_csv(Path(ev.ZDROJ_CESTA) / str(rok) / f"{mesiac:02d}.csv", riadky)
+
+    tabulka, chyba = ev.zosulad_mesiac(rok, mesiac)
+    assert not chyba, chyba
+    assert tabulka['Stav'].tolist() == ['v hárku', 'chýba v hárku', 'v hárku', 'rozdiel'], tabulka
+    assert len(ev.zapisnik().mesiaca(rok, mesiac)) == len(bunky)   # výpis nič nemení
+    print(tabulka.to_string(index=False))
+
+    ev._zabudni_stiahnute([(rok, mesiac)])
+    ev.nacitaj_mesiac(rok, mesiac, max_vek=0)
+    ostali = {z['id'] for z in ev.zapisnik().mesiaca(rok, mesiac)}
+    assert ostali == {zapisane[3]['id'], zapisane[4]['id']}, ostali
+    po = ev.aktualna_snimka(rok)
+    # Prevzaté zápisy sa počítajú raz; zápis s rozdielom ostáva popri novom čísle hárku
+    od, do = date(rok, mesiac, 1), datum_riadku[-1]
+    for lokalita, navyse in [('BC', 0.0), ('BH', zapisane[4]['tony'] + 1.0)]:
+        a, b = pred.knihy[lokalita].sucty(od, do), po.knihy[lokalita].sucty(od, do)
+        assert abs(b['Prijem_celkom'] - a['Prijem_celkom'] - navyse) < 1e-6, (lokalita, a, b)
+        assert abs(b['Spotreba'] - a['Spotreba']) < 1e-6, (lokalita, a, b)
+    porovnaj(po, odznova(rok), dnes)
+    print("zosúladenie: prevzaté zápisy vyradené a počítané raz, ostatné ostali v zápisníku na opravu")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Overí, že všetky zdroje dát (Google Sheets, adresár CSV, SQLite) dajú
+z rovnakých hárkov rovnaký dlhý formát aj rovnaké konečné stavy, a
+zmeria súčty za obdobie: SQL nad indexom (lokalita, datum) proti
+načítaniu mesiacov z úložiska a proti filtrovaniu pandas rámca, ktorý
+už je v pamäti.
+
+    python benchmarks/bench_zdroje.py [--roky 5] [--dni 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd  # noqa: E402
+
+import evidencia as ev  # noqa: E402
+from syntetika import LokalnyServer, mesiac_csv  # noqa: E402
+
+POSLEDNY_ROK = 2025   # celé uzavreté roky — výsledok nezávisí od dnešného dátumu
+
+
+def ms(funkcia, opakovani=20):
+    """Najkratší čas z opakovaní v ms a posledný výsledok."""
+    najlepsi = float('inf')
+    for _ in range(opakovani):
+        start = time.perf_counter()
+        vysledok = funkcia()
+        najlepsi = min(najlepsi, time.perf_counter() - start)
+    return vysledok, najlepsi * 1000
+
+
+def nacitaj_vsetko(nazov, cesta, roky):
+    """Všetky mesiace a konečné stavy cez zdroj `nazov` s prázdnym úložiskom a cache."""
+    ev.ZDROJ, ev.ZDROJ_CESTA = nazov, str(cesta)
+    ev.ULOZISKO_DIR = Path(tempfile.mkdtemp())
+    ev.vycisti_cache()
+    start = time.perf_counter()
+    data, chyby, _ = ev.nacitaj_mesiace((roky[0], 1), (roky[-1], 12))
+    cas = (time.perf_counter() - start) * 1000
+    assert not chyby, chyby
+    return data, ev.konecne_stavy(roky[-1]), cas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--roky', type=int, default=5)
+    parser.add_argument('--dni', type=int, help='riadkov na mesiac (predvolene deň = riadok)')
+    args = parser.parse_args()
+
+    roky = list(range(POSLEDNY_ROK - args.roky + 1, POSLEDNY_ROK + 1))
+    ev.ZOSITY = {rok: {'sheet_id': f"zdroje{rok}", 'gids': {m: f"{rok}{m:02d}" for m in range(1, 13)}}
+                 for rok in roky}
+    ev.PRVY_ROK = roky[0]
+    harky = {(rok, m): mesiac_csv(rok, m, dni=args.dni) for rok in roky for m in range(1, 13)}
+    koren = Path(tempfile.mkdtemp())
+
+    # Adresár CSV s rovnakými hárkami
+    adresar = koren / 'csv'
+    for (rok, m), obsah in harky.items():
+        (adresar / str(rok)).mkdir(parents=True, exist_ok=True)
+        (adresar / str(rok) / f"{m:02d}.csv").write_bytes(obsah)
+
+    vysledky = {}
+    with LokalnyServer({ev.ZOSITY[r]['gids'][m]: obsah for (r, m), obsah in harky.items()}) as server:
+        ev.EXPORT_URL = server.export_url
+        vysledky['csv'] = nacitaj_vsetko('csv', '', roky)
+    databaza = koren / 'stiepka.db'
+    ev.SQLite(databaza).zapis(vysledky['csv'][0])   # ako `evidencia.py --do-sqlite`
+    vysledky['adresar'] = nacitaj_vsetko('adresar', adresar, roky)
+    vysledky['sqlite'] = nacitaj_vsetko('sqlite', databaza, roky)
+
+    data, stav, _ = vysledky['csv']
+    print(f"{args.roky} rokov, {len(data)} riadkov dlhého formátu, databáza {databaza.stat().st_size / 1024:.0f} kB")
+    for nazov, (d, s, cas) in vysledky.items():
+        pd.testing.assert_frame_equal(d, data)
+        assert s == stav, (nazov, s, stav)
+        print(f"zdroj {nazov:8} načítanie všetkých mesiacov {cas:8.1f} ms — rovnaký dlhý formát aj konečné stavy")
+
+    # Dotaz mesiaca ide cez index
+    with ev.SQLite(databaza)._spojenie() as db:
+        plan = db.execute("EXPLAIN QUERY PLAN SELECT * FROM pohyby WHERE lokalita IN ('BC', 'BH') "
+                          "AND datum BETWEEN '2025-06-01' AND '2025-06-31'").fetchall()
+    assert any('pohyby_lokalita_datum' in riadok[-1] for riadok in plan), plan
+
+    # Súčty roka v novom procese (prázdna cache, mesiace v úložisku):
+    # SQLite ich spočíta v databáze, ostatné zdroje čítajú 12 mesiacov
+    rok = (date(POSLEDNY_ROK, 1, 1), date(POSLEDNY_ROK, 12, 31))
+    for nazov, cesta in [('adresar', adresar), ('sqlite', databaza)]:
+        ev.ZDROJ, ev.ZDROJ_CESTA = nazov, str(cesta)
+        casy = []
+        for _ in range(10):
+            ev.vycisti_cache()
+            start = time.perf_counter()
+            sucty, chyby = ev.sucty_obdobia(*rok)
+            casy.append((time.perf_counter() - start) * 1000)
+        assert not chyby
+        print(f"súčty roka bez načítaných mesiacov, zdroj {nazov:8} {min(casy):8.2f} ms")
+
+    # Súčty za obdobie: SQL proti pandas rámcu, ktorý je už v pamäti
+    sqlite = ev.SQLite(databaza)
+    print(f"{'súčty':24} {'SQL ms':>8} {'pandas ms':>10}")
+    for nazov, od, do, po_mesiacoch in [
+            ('mesiac', date(POSLEDNY_ROK, 6, 1), date(POSLEDNY_ROK, 6, 30), False),
+            ('rok', date(POSLEDNY_ROK, 1, 1), date(POSLEDNY_ROK, 12, 31), False),
+            ('rok po mesiacoch', date(POSLEDNY_ROK, 1, 1), date(POSLEDNY_ROK, 12, 31), True),
+            ('všetko po mesiacoch', date(roky[0], 1, 1), date(POSLEDNY_ROK, 12, 31), True)]:
+        z_sql, cas_sql = ms(lambda: sqlite.sucty(od, do, po_mesiacoch))
+        z_pandas, cas_pandas = ms(lambda: ev.sucty_lokalit(data, od, do, po_mesiacoch))
+        pd.testing.assert_frame_equal(z_sql, z_pandas, check_names=False)
+        print(f"{nazov:24} {cas_sql:8.2f} {cas_pandas:10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Porovná načítanie celého roka po hárkoch (CSV, 12 požiadaviek) a jedným
+xlsx exportom celého zošita. Overí, že oba zdroje dajú rovnaké dáta.
+
+Každá požiadavka má na lokálnom serveri rovnaké umelé oneskorenie, ktoré
+predstavuje réžiu jednej cesty ku Google Sheets.
+
+    python benchmarks/bench_zosit.py [--oneskorenie 0.15] [--opakovani 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import evidencia as ev  # noqa: E402
+from syntetika import LokalnyServer, mesiac_csv, zosit_xlsx  # noqa: E402
+
+
+def zmeraj(server, zdroj, max_vlakien):
+    ev.ZDROJ = zdroj
+    ev.nacitaj_z_google_sheets.clear()
+    ev.spracuj_mesiac.clear()
+    ev.nacitaj_zosit.clear()
+    ev._harky_zosita.clear()
+    ev.zneplatni_ulozisko()
+    pred = server.poziadavky
+    start = time.perf_counter()
+    data, chyby, _ = ev.nacitaj_mesiace((2026, 1), (2026, 12), max_vlakien=max_vlakien)
+    cas = time.perf_counter() - start
+    assert not chyby, chyby
+    return cas, server.poziadavky - pred, data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--oneskorenie', type=float, default=0.15)
+    parser.add_argument('--opakovani', type=int, default=3)
+    args = parser.parse_args()
+
+    harky = {gid: mesiac_csv(2026, m) for m, gid in ev.SHEET_GIDS.items()}
+    zosit = zosit_xlsx(2026, nazvy=ev.NAZVY_MESIACOV)
+    oneskorenie = {k: args.oneskorenie for k in list(harky) + ['xlsx']}
+
+    rezimy = [
+        ('csv, postupne', 'csv', 1),
+        ('csv, súbežne', 'csv', ev.MAX_SUBEZNYCH_STAHOVANI),
+        ('xlsx, 1 požiadavka', 'xlsx', ev.MAX_SUBEZNYCH_STAHOVANI),
+    ]
+    with LokalnyServer(harky, oneskorenie, zosit) as server:
+        ev.EXPORT_URL = server.export_url
+        ev.EXPORT_XLSX_URL = server.export_xlsx_url
+        ev.ULOZISKO_DIR = Path(tempfile.mkdtemp())
+
+        vysledky = {}
+        for nazov, zdroj, vlakna in rezimy:
+            behy = [zmeraj(server, zdroj, vlakna) for _ in range(args.opakovani)]
+            vysledky[nazov] = behy
+            cas = min(b[0] for b in behy)
+            print(f"{nazov:20s} požiadaviek: {behy[0][1]:2d}   čas: {cas:.3f} s")
+
+    _, _, data_csv = vysledky['csv, postupne'][0]
+    _, poziadavky, data_xlsx = vysledky['xlsx, 1 požiadavka'][0]
+    assert poziadavky == 1
+    assert data_csv.equals(data_xlsx), "xlsx a CSV dávajú iné dáta"
+    print("OK — xlsx zošit dáva rovnaké dáta ako CSV po hárkoch")
+
+
+if __name__ == '__main__':
+    main()
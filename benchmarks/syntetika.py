@@ -0,0 +1,222 @@
+"""
+Syntetické mesačné hárky a lokálny HTTP server namiesto Google Sheets.
+
+Hárky majú rovnaké rozloženie ako skutočný CSV export: stĺpce BC a BH
+s duplicitnými názvami dodávateľov (pandas z nich robí `Bodos.1` …),
+desatinné čiarky a riadok `Spolu` na konci. Pre väčšiu mierku môžu mať
+ďalšie bloky syntetických lokalít (L3, L4 …).
+"""
+import calendar
+import csv
+import io
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DODAVATELIA = ['Bodos', 'z Dreva HBP', 'Recyklácia', 'Jankula']
+LOKALITY = ('BC', 'BH')
+SPOTREBA = {'BC': 38.0, 'BH': 12.0}   # priemerná denná spotreba, BC spotrebuje viac ako BH
+
+
+def kody_lokalit(pocet: int) -> tuple:
+    """Kódy `pocet` lokalít — BC a BH, za nimi syntetické L3, L4 …"""
+    return (LOKALITY + tuple(f"L{i}" for i in range(len(LOKALITY) + 1, pocet + 1)))[:pocet]
+
+
+def hlavicka(lokality=LOKALITY) -> list:
+    """Hlavička hárku — blok na lokalitu, bloky oddelené prázdnym stĺpcom."""
+    stlpce = []
+    for lokalita in lokality:
+        stlpce += ([''] if stlpce else []) + [lokalita] + DODAVATELIA + ['Spotreba']
+    return stlpce
+
+
+HLAVICKA = hlavicka()
+
+
+def _cislo(x):
+    """Formát ako v exporte — desatinná čiarka, prázdna bunka pre nulu."""
+    return f"{x:.2f}".replace('.', ',') if x else ''
+
+
+def _riadok(prvy: str, hodnoty: list) -> list:
+    """Riadok hárku — `prvy` (dátum alebo 'Spolu') a 5 čísel v bloku každej lokality."""
+    riadok = []
+    for i in range(0, len(hodnoty), 5):
+        riadok += ([''] if riadok else []) + [prvy] + [_cislo(h) for h in hodnoty[i:i + 5]]
+    return riadok
+
+
+def mesiac_riadky(rok: int, mesiac: int, seed: int = 0, dni: int = None, lokality=LOKALITY):
+    """
+    Vráti riadky (bez hlavičky) jedného mesačného hárku s blokmi `lokality`.
+    `dni` je počet riadkov — predvolene jeden na každý deň mesiaca, pri
+    väčšom počte pripadne na jeden deň viac záznamov.
+    """
+    rnd = random.Random(seed * 10_000 + rok * 100 + mesiac)
+    riadky = []
+    sumy = [0.0] * (5 * len(lokality))
+    dni_mesiaca = calendar.monthrange(rok, mesiac)[1]
+    dni = dni or dni_mesiaca
+    for i in range(dni):
+        den = 1 + i * dni_mesiaca // dni
+        hodnoty = []
+        for lokalita in lokality:
+            prijem = [rnd.choice([0, 0, rnd.uniform(5, 40)]) for _ in DODAVATELIA]
+            spotreba = SPOTREBA.get(lokalita, 25.0)
+            hodnoty += [round(p, 2) for p in prijem] + [round(rnd.uniform(0.5, 1.5) * spotreba, 2)]
+        sumy = [s + h for s, h in zip(sumy, hodnoty)]
+        riadky.append(_riadok(f"{mesiac}/{den}/{rok}", hodnoty))
+    riadky.append(_riadok('Spolu', sumy))
+    return riadky
+
+
+def mesiac_csv(rok: int, mesiac: int, seed: int = 0, dni: int = None, lokality=LOKALITY) -> bytes:
+    """Jeden mesačný hárok ako CSV bajty."""
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator='\r\n')
+    w.writerow(hlavicka(lokality))
+    w.writerows(mesiac_riadky(rok, mesiac, seed, dni, lokality))
+    return buf.getvalue().encode('utf-8')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Predvolená fronta 5 spojení pri súbežnom sťahovaní pretečie
+    # a klient čaká sekundu na opakované spojenie
+    request_queue_size = 64
+
+    def handle_error(self, request, client_address):
+        pass   # klient, ktorý po timeoute zavrel spojenie, nie je chyba servera
+
+
+class LokalnyServer:
+    """
+    HTTP server na 127.0.0.1, ktorý odpovedá ako export Google Sheets.
+    `harky` mapuje gid → CSV bajty, `zosit` sú xlsx bajty celého zošita
+    (format=xlsx), `oneskorenie` mapuje gid alebo 'xlsx' → sekundy.
+    `zlyhania` mapuje gid alebo 'xlsx' → koľko najbližších požiadaviek
+    dostane 503, '*' platí pre všetky. Spojenia ostávajú otvorené
+    (HTTP/1.1 keep-alive). Počíta prijaté požiadavky v `poziadavky`
+    a nadviazané spojenia v `spojenia`.
+    """
+
+    def __init__(self, harky: dict, oneskorenie: dict = None, zosit: bytes = None,
+                 zlyhania: dict = None):
+        self.harky = harky
+        self.zosit = zosit
+        self.oneskorenie = oneskorenie or {}
+        self.zlyhania = zlyhania or {}
+        self.poziadavky = 0
+        self.spojenia = 0
+        self._zamok = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Hlavička a telo idú zvlášť — bez toho čaká keep-alive spojenie 40 ms na ACK
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._zamok:
+                    server.spojenia += 1
+
+            def _zlyhat(self, kluc) -> bool:
+                with server._zamok:
+                    for k in (kluc, '*'):
+                        if server.zlyhania.get(k, 0) > 0:
+                            server.zlyhania[k] -= 1
+                            return True
+                return False
+
+            def do_GET(self):
+                with server._zamok:
+                    server.poziadavky += 1
+                query = parse_qs(urlparse(self.path).query)
+                if query.get('format', ['csv'])[0] == 'xlsx':
+                    kluc, obsah, typ = 'xlsx', server.zosit, 'application/vnd.ms-excel'
+                else:
+                    kluc = query.get('gid', [''])[0]
+                    obsah, typ = server.harky.get(kluc), 'text/csv; charset=utf-8'
+                time.sleep(server.oneskorenie.get(kluc, 0))
+                if self._zlyhat(kluc):
+                    self.send_error(503)
+                    return
+                if obsah is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', typ)
+                self.send_header('Content-Length', str(len(obsah)))
+                self.end_headers()
+                self.wfile.write(obsah)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = _Server(('127.0.0.1', 0), Handler)
+
+    @property
+    def export_url(self) -> str:
+        port = self._httpd.server_address[1]
+        return f"http://127.0.0.1:{port}/spreadsheets/d/{{sheet_id}}/export?format=csv&gid={{gid}}"
+
+    @property
+    def export_xlsx_url(self) -> str:
+        port = self._httpd.server_address[1]
+        return f"http://127.0.0.1:{port}/spreadsheets/d/{{sheet_id}}/export?format=xlsx"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _na_hodnotu(bunka: str):
+    """Textová bunka CSV → hodnota bunky v xlsx (dátum, číslo alebo prázdna)."""
+    if not bunka:
+        return None
+    if bunka.count('/') == 2:
+        m, d, r = map(int, bunka.split('/'))
+        return datetime(r, m, d)
+    if bunka[0].isdigit():
+        return float(bunka.replace(',', '.'))
+    return bunka
+
+
+def zosit_xlsx(rok: int, seed: int = 0, nazvy: dict = None) -> bytes:
+    """
+    Celý zošit (12 mesačných hárkov) ako xlsx bajty s rovnakými hodnotami,
+    aké dáva `mesiac_csv`. `nazvy` mapuje mesiac → názov hárku.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.remove(wb.active)
+    for mesiac in range(1, 13):
+        ws = wb.create_sheet((nazvy or {}).get(mesiac, str(mesiac)))
+        ws.append(HLAVICKA)
+        for riadok in mesiac_riadky(rok, mesiac, seed):
+            ws.append([_na_hodnotu(b) for b in riadok])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def viacrocny_csv(od_roku: int, pocet_rokov: int, seed: int = 0) -> bytes:
+    """Jeden dlhý hárok s dennými riadkami za viac rokov a riadkom `Spolu` na konci."""
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator='\r\n')
+    w.writerow(HLAVICKA)
+    for rok in range(od_roku, od_roku + pocet_rokov):
+        for mesiac in range(1, 13):
+            w.writerows(mesiac_riadky(rok, mesiac, seed)[:-1])
+    w.writerow(['Spolu'] + [''] * (len(HLAVICKA) - 1))
+    return buf.getvalue().encode('utf-8')
@@ -0,0 +1,2506 @@
+"""
+Evidencia skladu štiepky — výpočtové jadro bez Streamlitu a Plotly.
+
+Načítanie mesiacov zo zdroja (Google Sheets, adresár CSV alebo SQLite),
+úložisko histórie, kniha pohybov a výpočet stavov. Používa ho Streamlit
+appka (app_google_sheets.py), benchmarky aj príkazový riadok:
+
+    python evidencia.py 15.03.2026
+    python evidencia.py 2026-03-15 --lokalita BC --json
+    python evidencia.py 31.12.2026 --lokalita BC --export stiepka.xlsx --od 1.1.2026
+    python evidencia.py --api 8502
+    python evidencia.py 31.12.2026 --do-sqlite stiepka.db
+    python evidencia.py --zosulad 2026-03
+"""
+import pandas as pd
+import numpy as np
+from datetime import datetime, date
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import abc
+import argparse
+import contextlib
+import copy
+import csv
+import functools
+import hashlib
+import inspect
+import io
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+import types
+import unicodedata
+import uuid
+from urllib.parse import parse_qs, urlsplit
+
+# ══════════════════════════════════════════════════════
+# NASTAVENIA - uprav len toto!
+# ══════════════════════════════════════════════════════
+
+SHEET_ID = "1MB041dTwz-zfGg6u3wM1XpmrS_ynDe1J"
+
+# Adresa CSV exportu jedného hárku
+EXPORT_URL = "https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+
+# Adresa xlsx exportu celého zošita
+EXPORT_XLSX_URL = "https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=xlsx"
+
+# Odkiaľ sa berú dáta (STIEPKA_ZDROJ, cesta v STIEPKA_ZDROJ_CESTA):
+#   "csv"     — Google Sheets, každý mesiac samostatnou požiadavkou (podľa GID v ZOSITY)
+#   "xlsx"    — Google Sheets, celý zošit jednou požiadavkou, mesiace sa rozdelia lokálne
+#   "adresar" — CSV mesiacov v adresári ZDROJ_CESTA (2026/01.csv, tvar ako export hárku)
+#   "sqlite"  — databáza ZDROJ_CESTA s tabuľkou pohyby (sieť bez prístupu na internet)
+# Roky, ktoré appka ponúka, určuje pri každom zdroji ZOSITY.
+ZDROJ = os.environ.get("STIEPKA_ZDROJ", "csv")
+ZDROJ_CESTA = os.environ.get("STIEPKA_ZDROJ_CESTA", "")
+
+# Koľko mesiacov sa sťahuje naraz (1 = postupne, jeden po druhom)
+MAX_SUBEZNYCH_STAHOVANI = 12
+
+# Sťahovanie: časové limity (pripojenie, čítanie) v sekundách, počet pokusov
+# a základ čakania medzi nimi (rastie 2×, náhodne rozptýlený)
+TIMEOUT = (5, 30)
+POKUSOV = 3
+CAKANIE_PRED_POKUSOM = 0.5
+
+# Istič: po toľkých neúspešných sťahovaniach za sebou sa zdroj považuje
+# za nedostupný a ISTIC_PAUZA sekúnd sa naň nechodí — zobrazia sa uložené dáta
+ISTIC_ZLYHANI = 3
+ISTIC_PAUZA = 60
+
+# Lokálne úložisko histórie — Parquet rozdelený po rokoch a mesiacoch
+# (rok=2026/mesiac=01.parquet). Prežije reštart servera, uzavreté mesiace
+# sa zo zdroja znova nesťahujú, aktuálny mesiac sa obnoví po
+# CACHE_TTL sekundách.
+ULOZISKO_DIR = Path(os.environ.get("STIEPKA_ULOZISKO", ".ulozisko_stiepka"))
+CACHE_TTL = 300
+
+# Pohyby zadané v appke idú do zápisníka v úložisku (zapisnik.jsonl, každý
+# zápis hneď na disk) a prirátajú sa k dátam z hárkov. Keď ich je aspoň
+# ZHUTNIT_PO, obnova na pozadí ich presunie do úložiska zápisov
+# (zapisy/rok=2026/mesiac=03.parquet).
+ZHUTNIT_PO = 200
+
+# GID pre každý mesiac (1=január … 12=december)
+SHEET_GIDS = {
+    1:  "2041175941",
+    2:  "996148749",
+    3:  "1052948469",
+    4:  "1742234642",
+    5:  "1522704266",
+    6:  "318756165",
+    7:  "174620779",
+    8:  "1714534272",
+    9:  "2141494448",
+    10: "953926717",
+    11: "1911464342",
+    12: "33776211",
+}
+
+# Zošity po rokoch — nový rok = nový riadok so zošitom a jeho GID
+ZOSITY = {
+    2026: {'sheet_id': SHEET_ID, 'gids': SHEET_GIDS},
+}
+PRVY_ROK = min(ZOSITY)
+
+NAZVY_MESIACOV = {
+    1: "Január", 2: "Február", 3: "Marec", 4: "Apríl",
+    5: "Máj", 6: "Jún", 7: "Júl", 8: "August",
+    9: "September", 10: "Október", 11: "November", 12: "December"
+}
+
+# Zrnitosti súhrnov v kocke knihy (Kniha.suhrny): kľúč → názov
+OBDOBIA = {'den': 'Deň', 'tyzden': 'Týždeň', 'mesiac': 'Mesiac', 'stvrtrok': 'Štvrťrok', 'rok': 'Rok'}
+
+# Lokality (sklady): kód → názov a limity zásob v tonách (zelená nad, hranica
+# žltej, či hranica sama je ešte žltá — BC pri 100 t je červená, BH pri 50 t žltá).
+# Každá lokalita má v hárku blok stĺpcov — dátum s hlavičkou rovnou kódu
+# lokality a za ním POLOZKY v tomto poradí. Nový sklad = nový riadok tu
+# a nový blok v hárku; mesiace bez jeho bloku ho jednoducho nemajú.
+LOKALITY = {
+    'BC': {'nazov': 'Baňa Cigeľ', 'limity': (300, 100, False)},
+    'BH': {'nazov': 'Baňa Handlová', 'limity': (100, 50, True)},
+}
+DODAVATELIA = ['Bodos', 'z Dreva HBP', 'Recyklácia', 'Jankula']
+POLOZKY = DODAVATELIA + ['Spotreba']
+
+# Počiatočné stavy skladu k 1.1. prvého roka (tony).
+# Každý ďalší rok začína konečným stavom predošlého roka, lokalita
+# bez záznamu tu začína nulou.
+POCIATOCNY_STAV = {
+    'BC': 955.94,
+    'BH': 222.42
+}
+
+# Meranie: STIEPKA_LOG_METRIK=1 zapisuje čas každej etapy ako JSON riadok
+# na stderr, STIEPKA_METRIKY_PORT=9108 spustí pri appke endpoint /metrics
+# pre Prometheus (len na 127.0.0.1, 0 = vypnutý)
+LOG_METRIK = os.environ.get("STIEPKA_LOG_METRIK") == "1"
+METRIKY_PORT = int(os.environ.get("STIEPKA_METRIKY_PORT", 0))
+
+# JSON API pre ostatné systémy (/api/stav, /api/sumare): STIEPKA_API_PORT=8502
+# ho spustí pri appke (len na 127.0.0.1, 0 = vypnuté), samostatne
+# `python evidencia.py --api 8502`
+API_PORT = int(os.environ.get("STIEPKA_API_PORT", 0))
+
+# ══════════════════════════════════════════════════════
+
+# ══════════════════════════════════════════════════════
+# MERANIE
+# ══════════════════════════════════════════════════════
+
+# Hranice košov histogramu časov (sekundy)
+HRANICE_KOSOV = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ETAPY = {}   # etapa → {'pocet', 'sucet', 'max', 'posledne', 'kose'}
+_CACHE = {}   # funkcia → [zásahy, minutia]
+_ZAMOK_METRIK = threading.Lock()
+
+log_metrik = logging.getLogger("evidencia.metriky")
+if LOG_METRIK and not log_metrik.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    log_metrik.addHandler(_handler)
+    log_metrik.setLevel(logging.INFO)
+    log_metrik.propagate = False
+
+
+def zaznamenaj(etapa: str, sekundy: float, **udaje):
+    """Pripočíta jedno trvanie etapy; pri zapnutom logu ho zapíše ako JSON riadok."""
+    with _ZAMOK_METRIK:
+        e = _ETAPY.get(etapa)
+        if e is None:
+            e = _ETAPY[etapa] = {'pocet': 0, 'sucet': 0.0, 'max': 0.0, 'posledne': 0.0,
+                                 'kose': [0] * len(HRANICE_KOSOV)}
+        e['pocet'] += 1
+        e['sucet'] += sekundy
+        e['max'] = max(e['max'], sekundy)
+        e['posledne'] = sekundy
+        for i, hranica in enumerate(HRANICE_KOSOV):
+            if sekundy <= hranica:
+                e['kose'][i] += 1
+                break
+    if log_metrik.isEnabledFor(logging.INFO):
+        log_metrik.info(json.dumps({
+            'cas': datetime.now().isoformat(timespec='milliseconds'),
+            'etapa': etapa, 'ms': round(sekundy * 1000, 3),
+            'vlakno': threading.current_thread().name, **udaje,
+        }, ensure_ascii=False, default=str))
+
+
+class meraj(contextlib.ContextDecorator):
+    """
+    Zmeria trvanie etapy — ako dekorátor funkcie aj ako `with meraj('etapa'):`.
+    Pod @pamat meria len skutočné výpočty, zásahy cache počíta pamat.
+    """
+
+    def __init__(self, etapa: str):
+        self.etapa = etapa
+
+    def _recreate_cm(self):
+        return meraj(self.etapa)   # každé volanie dekorovanej funkcie má vlastný začiatok
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, typ, *exc):
+        zaznamenaj(self.etapa, time.perf_counter() - self._start,
+                   **({'chyba': typ.__name__} if typ else {}))
+        return False
+
+
+def _pocitaj_cache(funkcia: str, zasah: bool):
+    with _ZAMOK_METRIK:
+        pocty = _CACHE.setdefault(funkcia, [0, 0])
+        pocty[0 if zasah else 1] += 1
+
+
+def stav_metrik() -> dict:
+    """Kópia nameraných hodnôt: {'etapy': {...}, 'cache': {funkcia: (zásahy, minutia)}}."""
+    with _ZAMOK_METRIK:
+        return {
+            'etapy': {k: dict(v, kose=list(v['kose'])) for k, v in _ETAPY.items()},
+            'cache': {k: tuple(v) for k, v in _CACHE.items()},
+        }
+
+
+def vynuluj_metriky():
+    with _ZAMOK_METRIK:
+        _ETAPY.clear()
+        _CACHE.clear()
+
+
+def metriky_prometheus() -> str:
+    """Namerané hodnoty v textovom formáte Prometheus (histogram etáp, počty cache)."""
+    stav = stav_metrik()
+    riadky = [
+        "# HELP stiepka_etapa_sekundy Trvanie etapy (sťahovanie, parsovanie, výpočet, vykreslenie).",
+        "# TYPE stiepka_etapa_sekundy histogram",
+    ]
+    for etapa, e in sorted(stav['etapy'].items()):
+        stitok = f'etapa="{etapa}"'
+        kumulativne = 0
+        for hranica, pocet in zip(HRANICE_KOSOV, e['kose']):
+            kumulativne += pocet
+            riadky.append(f'stiepka_etapa_sekundy_bucket{{{stitok},le="{hranica}"}} {kumulativne}')
+        riadky.append(f'stiepka_etapa_sekundy_bucket{{{stitok},le="+Inf"}} {e["pocet"]}')
+        riadky.append(f'stiepka_etapa_sekundy_sum{{{stitok}}} {e["sucet"]:.6f}')
+        riadky.append(f'stiepka_etapa_sekundy_count{{{stitok}}} {e["pocet"]}')
+    riadky += [
+        "# HELP stiepka_cache_total Volania funkcií s cache podľa výsledku (zasah/minutie).",
+        "# TYPE stiepka_cache_total counter",
+    ]
+    for funkcia, (zasahy, minutia) in sorted(stav['cache'].items()):
+        riadky.append(f'stiepka_cache_total{{funkcia="{funkcia}",vysledok="zasah"}} {zasahy}')
+        riadky.append(f'stiepka_cache_total{{funkcia="{funkcia}",vysledok="minutie"}} {minutia}')
+    return "\n".join(riadky) + "\n"
+
+
+def spusti_server_metrik(port: int = METRIKY_PORT, adresa: str = "127.0.0.1"):
+    """Spustí vo vlákne HTTP server, ktorý na /metrics vracia metriky_prometheus()."""
+    def metriky(dotaz, hlavicky):
+        return 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}, metriky_prometheus().encode()
+
+    return spusti_http({'/metrics': metriky}, port, adresa, nazov="metriky")
+
+
+def spusti_http(cesty: dict, port: int, adresa: str = "127.0.0.1", nazov: str = "http"):
+    """
+    Spustí vo vlákne malý HTTP server len pre GET. `cesty` mapuje cestu
+    na funkciu(dotaz, hlavičky) → (kód, hlavičky odpovede, telo); dotaz
+    je výsledok parse_qs. Spojenia ostávajú otvorené (HTTP/1.1 keep-alive).
+    Výnimka obsluhy sa vráti ako 500 s JSON chybou, spojenie sa nezhodí.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            obsluha = cesty.get(url.path)
+            if obsluha is None:
+                self.send_error(404)
+                return
+            try:
+                kod, hlavicky, telo = obsluha(parse_qs(url.query), self.headers)
+            except Exception as e:
+                logging.getLogger(__name__).exception("%s %s", nazov, self.path)
+                kod, hlavicky = 500, {'Content-Type': 'application/json; charset=utf-8'}
+                telo = json.dumps({'chyba': f"{type(e).__name__}: {e}"}, ensure_ascii=False).encode()
+            self.send_response(kod)
+            for nazov_hlavicky, hodnota in hlavicky.items():
+                self.send_header(nazov_hlavicky, hodnota)
+            if kod != 304:   # 304 nemá telo
+                self.send_header('Content-Length', str(len(telo)))
+            self.end_headers()
+            if kod != 304:
+                self.wfile.write(telo)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((adresa, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=nazov, daemon=True).start()
+    return server
+
+
+# ══════════════════════════════════════════════════════
+# CACHE V PAMÄTI
+# ══════════════════════════════════════════════════════
+
+_VSETKY_CACHE = []
+
+
+def pamat(ttl=None, max_entries=None, ulozit=None):
+    """
+    Cache výsledkov funkcie v pamäti procesu — náhrada st.cache_data
+    bez závislosti na Streamlite. Kľúčom sú argumenty okrem tých, ktoré
+    začínajú '_' (tie sa nehašujú). Súbežné volania s rovnakým kľúčom
+    počítajú výsledok len raz. Výsledok sa nekopíruje — treba ho brať
+    ako len na čítanie. Ak je zadané `ulozit(vysledok)` a vráti False,
+    výsledok sa vráti, ale neuloží (napr. chyba sťahovania).
+    """
+    def obal(funkcia):
+        podpis = inspect.signature(funkcia)
+        zaznamy = OrderedDict()   # kľúč → (čas výpočtu, výsledok)
+        zamky = {}
+        zamok = threading.Lock()
+
+        def kluc(args, kwargs):
+            argumenty = podpis.bind(*args, **kwargs)
+            argumenty.apply_defaults()
+            return tuple((k, v) for k, v in argumenty.arguments.items() if not k.startswith('_'))
+
+        @functools.wraps(funkcia)
+        def obalena(*args, **kwargs):
+            k = kluc(args, kwargs)
+            with zamok:
+                zamok_kluca = zamky.setdefault(k, threading.Lock())
+            with zamok_kluca:
+                with zamok:
+                    zaznam = zaznamy.get(k)
+                    if zaznam and (ttl is None or time.monotonic() - zaznam[0] < ttl):
+                        zaznamy.move_to_end(k)
+                        _pocitaj_cache(funkcia.__name__, True)
+                        return zaznam[1]
+                _pocitaj_cache(funkcia.__name__, False)
+                vysledok = funkcia(*args, **kwargs)
+                if ulozit and not ulozit(vysledok):
+                    return vysledok
+                with zamok:
+                    zaznamy[k] = (time.monotonic(), vysledok)
+                    zaznamy.move_to_end(k)
+                    while max_entries and len(zaznamy) > max_entries:
+                        zamky.pop(zaznamy.popitem(last=False)[0], None)
+                return vysledok
+
+        def clear():
+            with zamok:
+                zaznamy.clear()
+                zamky.clear()
+
+        def zabudni(*args, **kwargs):
+            """Zahodí výsledok pre jedny argumenty — ďalšie volanie ho vypočíta znova."""
+            k = kluc(args, kwargs)
+            with zamok:
+                zaznamy.pop(k, None)
+                zamky.pop(k, None)
+
+        obalena.clear = clear
+        obalena.zabudni = zabudni
+        _VSETKY_CACHE.append(obalena)
+        return obalena
+    return obal
+
+
+def vycisti_cache():
+    """Vyprázdni všetky cache v pamäti (napr. po tlačidle Obnoviť)."""
+    for cache in _VSETKY_CACHE:
+        cache.clear()
+
+
+def hash_obsahu(*casti) -> str:
+    """Krátky odtlačok obsahu — rovnaké bajty dajú rovnaký hash."""
+    h = hashlib.blake2b(digest_size=16)
+    for cast in casti:
+        h.update(cast if isinstance(cast, bytes) else str(cast).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# ══════════════════════════════════════════════════════
+# SŤAHOVANIE, SPRACOVANIE A ÚLOŽISKO
+# ══════════════════════════════════════════════════════
+
+# Odpovede, pri ktorých má zmysel skúsiť to znova (preťaženie, výpadok)
+_DOCASNE_CHYBY = {429, 500, 502, 503, 504}
+
+
+class ZdrojNedostupny(Exception):
+    """Istič je vypnutý — na zdroj sa zatiaľ nechodí."""
+
+
+class Istic:
+    """
+    Istič (circuit breaker) pre jeden server. Po `zlyhani` neúspešných
+    sťahovaniach za sebou sa vypne a `pauza` sekúnd každé sťahovanie
+    hneď odmietne. Potom pustí jedno skúšobné — úspech istič zapne,
+    zlyhanie ho vypne na ďalšiu pauzu.
+    """
+
+    def __init__(self, zlyhani: int = ISTIC_ZLYHANI, pauza: float = ISTIC_PAUZA):
+        self.zlyhani = zlyhani
+        self.pauza = pauza
+        self._za_sebou = 0
+        self._vypnuty_do = 0.0
+        self._skusa_sa = False
+        self._zamok = threading.Lock()
+
+    @property
+    def vypnuty(self) -> bool:
+        return self._za_sebou >= self.zlyhani
+
+    def over(self):
+        """Vyhodí ZdrojNedostupny, ak sa na server teraz nemá chodiť."""
+        with self._zamok:
+            if not self.vypnuty:
+                return
+            zostava = self._vypnuty_do - time.monotonic()
+            if zostava > 0 or self._skusa_sa:
+                raise ZdrojNedostupny(
+                    f"zdroj je nedostupný, ďalší pokus o {max(0, round(zostava))} s")
+            self._skusa_sa = True
+
+    def uspech(self):
+        with self._zamok:
+            self._za_sebou = 0
+            self._skusa_sa = False
+
+    def zlyhanie(self):
+        with self._zamok:
+            self._za_sebou += 1
+            self._skusa_sa = False
+            if self.vypnuty:
+                self._vypnuty_do = time.monotonic() + self.pauza
+
+
+_ISTICE = {}
+_RELACIA = None
+_ZAMOK_SIETE = threading.Lock()
+
+
+def istic(url: str) -> Istic:
+    """Istič servera, na ktorý ukazuje `url`."""
+    server = urlsplit(url).netloc
+    with _ZAMOK_SIETE:
+        if server not in _ISTICE:
+            _ISTICE[server] = Istic(ISTIC_ZLYHANI, ISTIC_PAUZA)
+        return _ISTICE[server]
+
+
+def _relacia():
+    """
+    Zdieľaná relácia s keep-alive spojeniami — TLS sa nadväzuje raz, nie pre
+    každý hárok. requests sa načíta až pri prvom sťahovaní: zdroje bez siete
+    a stránky čítajúce len úložisko ho pri štarte neplatia.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    global _RELACIA
+    with _ZAMOK_SIETE:
+        if _RELACIA is None:
+            _RELACIA = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=MAX_SUBEZNYCH_STAHOVANI, max_retries=0)
+            _RELACIA.mount('http://', adapter)
+            _RELACIA.mount('https://', adapter)
+        return _RELACIA
+
+
+@meraj('stiahnutie')
+def _stiahni(url: str) -> bytes:
+    """
+    Stiahne URL cez zdieľanú reláciu s časovými limitmi. Výpadok spojenia,
+    timeout, useknutú odpoveď a dočasné chyby servera skúsi znova (najviac
+    POKUSOV-krát, s exponenciálnym čakaním s náhodným rozptylom). Trvalá
+    chyba (404) sa hlási hneď. Pri vypnutom ističi sa nesťahuje vôbec.
+    Každé sťahovanie ističu ohlási úspech alebo zlyhanie — inak by
+    skúšobné sťahovanie ostalo visieť a istič by už nič nepustil.
+    """
+    import requests
+
+    poistka = istic(url)
+    poistka.over()
+    for pokus in range(POKUSOV):
+        if pokus:
+            time.sleep(random.uniform(0, CAKANIE_PRED_POKUSOM * 2 ** pokus))
+        try:
+            odpoved = _relacia().get(url, timeout=TIMEOUT)
+        except requests.RequestException as e:   # spojenie, timeout, useknutá odpoveď, presmerovania …
+            chyba = e
+            continue
+        except Exception:
+            poistka.zlyhanie()
+            raise
+        if odpoved.status_code in _DOCASNE_CHYBY:
+            chyba = requests.HTTPError(f"HTTP {odpoved.status_code}", response=odpoved)
+            continue
+        poistka.uspech()   # server odpovedá, aj keď napr. 404
+        odpoved.raise_for_status()
+        return odpoved.content
+    poistka.zlyhanie()
+    raise chyba
+
+
+@pamat(ttl=CACHE_TTL, ulozit=lambda v: v[2] is None)   # cache 5 minút, chyby sa neukladajú
+def nacitaj_z_google_sheets(sheet_id: str, gid: str):
+    """Stiahne CSV hárku priamo z Google Sheets (verejný link). Vráti (bajty, hash, chyba)"""
+    url = EXPORT_URL.format(sheet_id=sheet_id, gid=gid)
+    try:
+        obsah = _stiahni(url)
+        return obsah, hash_obsahu(obsah), None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def _normalizuj_nazov(text) -> str:
+    """Malé písmená bez diakritiky — 'Január 2026' → 'januar 2026'."""
+    text = unicodedata.normalize('NFKD', str(text))
+    return ''.join(c for c in text if not unicodedata.combining(c)).strip().lower()
+
+
+def rozdel_zosit(harky: dict) -> dict:
+    """
+    Priradí hárky zošita k mesiacom podľa názvu (napr. 'Január', 'Jún 2026', '6').
+    Ak žiadny hárok nemá názov mesiaca, berie sa poradie hárkov.
+    Vráti {mesiac: DataFrame} v rovnakom tvare ako CSV export.
+    """
+    nazvy = {m: _normalizuj_nazov(n) for m, n in NAZVY_MESIACOV.items()}
+    podla_mena = {}
+    for nazov_harku, df in harky.items():
+        nazov = _normalizuj_nazov(nazov_harku)
+        for m, n in nazvy.items():
+            if nazov == str(m) or nazov.startswith(n):
+                podla_mena.setdefault(m, df)
+                break
+    if podla_mena:
+        return podla_mena
+    return {i: df for i, df in enumerate(harky.values(), start=1) if i in NAZVY_MESIACOV}
+
+
+@pamat(ttl=CACHE_TTL, ulozit=lambda v: v[2] is None)   # cache 5 minút, chyby sa neukladajú
+def nacitaj_zosit(sheet_id: str):
+    """Stiahne celý zošit (xlsx) jednou požiadavkou. Vráti (bajty, hash, chyba)"""
+    url = EXPORT_XLSX_URL.format(sheet_id=sheet_id)
+    try:
+        obsah = _stiahni(url)
+        return obsah, hash_obsahu(obsah), None
+    except Exception as e:
+        return None, None, str(e)
+
+
+# Hárky sa len čítajú — zdieľajú sa pre všetky mesiace zošita
+@pamat(max_entries=2)
+def _harky_zosita(zosit_hash: str, _obsah: bytes) -> dict:
+    """Rozparsovaný zošit {mesiac: hárok} — pri nezmenenom zošite sa neparsuje znova."""
+    return rozdel_zosit(pd.read_excel(io.BytesIO(_obsah), sheet_name=None))
+
+
+def stiahni_mesiac(rok: int, mesiac: int):
+    """Vráti (hash obsahu, obsah, chyba) mesiaca z nastaveného zdroja."""
+    return zdroj().stiahni(rok, mesiac)
+
+
+@pamat(max_entries=64)
+@meraj('parsovanie')
+def spracuj_mesiac(obsah_hash: str, _obsah):
+    """Spracuje stiahnutý mesiac — v cache podľa hashu obsahu, nie podľa času."""
+    return zdroj().spracuj(_obsah)
+
+
+@pamat(max_entries=4)
+def _kategorie(lokality: tuple, polozky: tuple):
+    return pd.CategoricalDtype(list(lokality)), pd.CategoricalDtype(list(polozky))
+
+
+def _typy_kategorii():
+    """Kategórie stĺpcov Lokalita a Polozka podľa aktuálnych nastavení."""
+    return _kategorie(tuple(LOKALITY), tuple(POLOZKY))
+
+
+def _bez_pripony(nazov) -> str:
+    """'Bodos.1' → 'Bodos' — pandas číslom odlišuje duplicitné názvy stĺpcov."""
+    nazov = str(nazov)
+    zaklad, bodka, cislo = nazov.rpartition('.')
+    return zaklad if bodka and cislo.isdigit() else nazov
+
+
+def bloky_lokalit(nazvy: list) -> dict:
+    """
+    Nájde v hlavičke hárku blok každej lokality — {lokalita: [stĺpec dátumu,
+    stĺpce POLOZKY]}. Lokalita bez stĺpca so svojím kódom sa vynechá,
+    blok s inými stĺpcami, ako sú POLOZKY, je chyba. Hárok bez jediného
+    bloku (napr. prihlasovacia stránka Google namiesto CSV) je tiež chyba,
+    inak by prázdny mesiac prepísal uložený.
+    """
+    bloky = {}
+    for lokalita in LOKALITY:
+        if lokalita not in nazvy:
+            continue
+        i = nazvy.index(lokalita)
+        blok = nazvy[i:i + 1 + len(POLOZKY)]
+        if [_bez_pripony(n).strip() for n in blok[1:]] != POLOZKY:
+            raise ValueError(f"lokalita {lokalita}: za dátumom čakám stĺpce {', '.join(POLOZKY)}")
+        bloky[lokalita] = blok
+    if not bloky:
+        raise ValueError(f"hárok nemá blok žiadnej lokality ({', '.join(LOKALITY)})")
+    return bloky
+
+
+# Tony sa evidujú na kilogramy. Uložené sú ako float32 (polovičná pamäť),
+# súčty sa počítajú vo float64 z hodnôt zaokrúhlených späť na kg —
+# float32 drží kg presne do 4096 t v jednom zázname.
+DESATINNE_MIESTA = 3
+TYP_TON = np.float32
+
+
+def presne_tony(hodnoty) -> np.ndarray:
+    """Tony z kompaktného typu ako float64 zaokrúhlené na kg — pre súčty bez chyby float32."""
+    return np.round(np.asarray(hodnoty, dtype=np.float64), DESATINNE_MIESTA)
+
+
+def dlhy_format(casti: dict) -> pd.DataFrame:
+    """
+    {lokalita: (dátumy, matica n × POLOZKY)} → dlhý formát s riadkom na
+    každý dátum, lokalitu a položku: Datum, Lokalita, Polozka, Tony.
+    Lokalita a Polozka sú kategórie v poradí nastavení, Tony TYP_TON.
+    """
+    typ_lokality, typ_polozky = _typy_kategorii()
+    k = len(POLOZKY)
+    datumy = [np.repeat(d, k) for d, _ in casti.values()]
+    kody = [np.full(len(d) * k, typ_lokality.categories.get_loc(l)) for l, (d, _) in casti.items()]
+    tony = [np.asarray(m, dtype=TYP_TON).ravel() for _, m in casti.values()]
+    n = sum(len(t) for t in tony)
+    return pd.DataFrame({
+        'Datum': np.concatenate(datumy) if casti else np.array([], dtype='datetime64[us]'),
+        'Lokalita': pd.Categorical.from_codes(
+            np.concatenate(kody) if casti else np.array([], dtype=int), dtype=typ_lokality),
+        'Polozka': pd.Categorical.from_codes(np.tile(np.arange(k), n // k), dtype=typ_polozky),
+        'Tony': np.concatenate(tony) if casti else np.array([], dtype=TYP_TON),
+    })
+
+
+def spracuj_data(df):
+    """Vyčistí hárok (DataFrame ako z pd.read_csv) a vráti ho v dlhom formáte."""
+    casti = {}
+    for lokalita, blok in bloky_lokalit(list(df.columns)).items():
+        d = df[blok]
+        d = d[d[blok[0]] != 'Spolu']
+        datum = pd.to_datetime(d[blok[0]], format='%m/%d/%Y', errors='coerce')
+        platne = datum.notna().to_numpy()
+        hodnoty = d[blok[1:]].apply(lambda c: pd.to_numeric(
+            c.astype(str).str.replace(',', '.').str.strip(), errors='coerce')).fillna(0)
+        casti[lokalita] = (datum.to_numpy()[platne], hodnoty.to_numpy(dtype=float)[platne])
+    return dlhy_format(casti)
+
+
+def _nazvy_ako_pandas(hlavicka: list) -> list:
+    """Názvy stĺpcov tak, ako ich pomenuje pd.read_csv — duplicity dostanú '.1', '.2' …"""
+    pocty = {}
+    nazvy = []
+    for i, nazov in enumerate(hlavicka):
+        nazov = nazov or f"Unnamed: {i}"
+        if nazov in pocty:
+            pocty[nazov] += 1
+            nazov = f"{nazov}.{pocty[nazov]}"
+        else:
+            pocty[nazov] = 0
+        nazvy.append(nazov)
+    return nazvy
+
+
+def spracuj_csv(obsah: bytes):
+    """
+    Rýchla cesta pre CSV export: pyarrow načíta len stĺpce blokov lokalít,
+    čísla rovno ako float s desatinnou čiarkou. Ak niektorá bunka nesedí
+    s formátom (napr. '12.5' alebo text), pyarrow zlyhá a použije sa
+    spracuj_data — výsledok je v oboch prípadoch rovnaký.
+    """
+    prvy_riadok = obsah.split(b"\n", 1)[0].decode("utf-8-sig")
+    nazvy = _nazvy_ako_pandas(next(csv.reader([prvy_riadok])))
+    bloky = bloky_lokalit(nazvy)
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pv
+
+        typy = {c: pa.float64() for blok in bloky.values() for c in blok[1:]}
+        typy.update({blok[0]: pa.string() for blok in bloky.values()})
+        tabulka = pv.read_csv(
+            io.BytesIO(obsah),
+            read_options=pv.ReadOptions(column_names=nazvy, skip_rows=1),
+            parse_options=pv.ParseOptions(newlines_in_values=True),
+            convert_options=pv.ConvertOptions(
+                include_columns=list(typy), column_types=typy, decimal_point=','),
+        )
+    except Exception:
+        return spracuj_data(pd.read_csv(io.BytesIO(obsah)))
+
+    casti = {}
+    rozparsovane = []   # [(surový stĺpec, dátumy)]
+    for lokalita, blok in bloky.items():
+        # Lokality majú zvyčajne rovnaký stĺpec dátumov — parsuje sa raz
+        surove = tabulka.column(blok[0])
+        datum = next((d for s, d in rozparsovane if s.equals(surove)), None)
+        if datum is None:
+            datum = pd.to_datetime(
+                pd.Series(surove.to_numpy(zero_copy_only=False), dtype=object),
+                format='%m/%d/%Y', errors='coerce').to_numpy()
+            rozparsovane.append((surove, datum))
+        platne = ~np.isnat(datum)
+        hodnoty = np.column_stack([tabulka.column(c).to_numpy(zero_copy_only=False) for c in blok[1:]])
+        casti[lokalita] = (datum[platne], np.nan_to_num(hodnoty[platne], nan=0.0))
+    return dlhy_format(casti)
+
+
+def _cesta_mesiaca(rok: int, mesiac: int) -> Path:
+    return ULOZISKO_DIR / f"rok={rok}" / f"mesiac={mesiac:02d}.parquet"
+
+
+def _cesta_zostatku(rok: int) -> Path:
+    return ULOZISKO_DIR / f"rok={rok}" / "zostatok.json"
+
+
+def _zdroj_mesiaca(rok: int, mesiac: int):
+    """Odkiaľ sa mesiac berie (napr. 'sheet_id/gid'), alebo None ak ho zdroj nemá."""
+    return zdroj().oznacenie(rok, mesiac)
+
+
+def _zapis_atomicky(cesta: Path, zapis):
+    """Zapíše súbor cez dočasný súbor a os.replace — čitateľ nikdy nevidí polovičný zápis."""
+    cesta.parent.mkdir(parents=True, exist_ok=True)
+    docasny = cesta.with_suffix(f".{threading.get_ident()}.tmp")
+    zapis(docasny)
+    os.replace(docasny, cesta)
+
+
+@pamat(max_entries=64)
+@meraj('citanie_uloziska')
+def _citaj_parquet(cesta: str, mtime_ns: int, inode: int):
+    """Načíta uložený mesiac; čas a inode súboru sú v kľúči, aby sa nový zápis prejavil."""
+    df = pd.read_parquet(cesta)
+    if 'Tony' not in df:
+        raise ValueError("starší formát úložiska")   # mesiac sa stiahne znova
+    typ_lokality, typ_polozky = _typy_kategorii()
+    data = df.astype({'Lokalita': typ_lokality, 'Polozka': typ_polozky, 'Tony': TYP_TON})
+    return data, df.attrs.get('hash'), df.attrs.get('zdroj')
+
+
+# Kedy bola snímka naposledy overená proti zdroju (bez zmeny obsahu)
+_OVERENE = {}
+
+
+def cas_overenia(rok: int, mesiac: int):
+    """Kedy (epoch) bol uložený mesiac naposledy stiahnutý alebo overený, None ak chýba."""
+    try:
+        zapisane = _cesta_mesiaca(rok, mesiac).stat().st_mtime
+    except OSError:
+        return None
+    return max(zapisane, _OVERENE.get((rok, mesiac), 0))
+
+
+def nacitaj_mesiac_z_disku(rok: int, mesiac: int):
+    """
+    Vráti (dáta, hash obsahu, vek v sekundách, zdroj) z úložiska,
+    alebo None ak mesiac uložený nie je. Zdroj je označenie, odkiaľ
+    mesiac pochádza (_zdroj_mesiaca).
+    """
+    cesta = _cesta_mesiaca(rok, mesiac)
+    try:
+        info = cesta.stat()
+        data, obsah_hash, zdroj = _citaj_parquet(str(cesta), info.st_mtime_ns, info.st_ino)
+    except Exception:
+        return None
+    overene = max(info.st_mtime, _OVERENE.get((rok, mesiac), 0))
+    return data, obsah_hash, time.time() - overene, zdroj
+
+
+def _je_ulozeny(rok: int, mesiac: int) -> bool:
+    """Mesiac je v úložisku z hárku, ktorý mu patrí podľa nastavení."""
+    ulozene = nacitaj_mesiac_z_disku(rok, mesiac)
+    return bool(ulozene) and ulozene[3] == _zdroj_mesiaca(rok, mesiac)
+
+
+def uloz_mesiac_na_disk(rok: int, mesiac: int, data, obsah_hash: str = None, zdroj: str = None):
+    """Uloží spracovaný mesiac (dlhý formát) do úložiska aj s hashom obsahu a zdrojom."""
+    df = data.copy(deep=False)
+    df.attrs['hash'] = obsah_hash
+    df.attrs['zdroj'] = zdroj
+    _zapis_atomicky(_cesta_mesiaca(rok, mesiac), lambda p: df.to_parquet(p, index=False))
+
+
+def zneplatni_ulozisko(rok: int = None, mesiac: int = None):
+    """
+    Zmaže uložené mesiace — jeden mesiac, celý rok, alebo všetko.
+    Spolu s nimi zmaže konečné stavy daného a všetkých ďalších rokov,
+    lebo z nich sa prenášajú počiatočné stavy.
+    """
+    if rok is None:
+        subory = list(ULOZISKO_DIR.glob("rok=*/*.parquet"))
+    elif mesiac is None:
+        subory = list((ULOZISKO_DIR / f"rok={rok}").glob("*.parquet"))
+    else:
+        subory = [_cesta_mesiaca(rok, mesiac)]
+    for subor in subory:
+        subor.unlink(missing_ok=True)
+    _zahod_zostatky(rok)
+
+
+def _zahod_zostatky(od_roku: int = None):
+    """Zmaže uložené konečné stavy roka `od_roku` a všetkých ďalších (None = všetky)."""
+    for subor in ULOZISKO_DIR.glob("rok=*/zostatok.json"):
+        if od_roku is None or int(subor.parent.name[4:]) >= od_roku:
+            subor.unlink(missing_ok=True)
+
+
+def je_uzavrety(rok: int, mesiac: int) -> bool:
+    """Mesiac, ktorý už skončil — jeho hárok sa považuje za nemenný."""
+    dnes = date.today()
+    return (rok, mesiac) < (dnes.year, dnes.month)
+
+
+def nacitaj_mesiac(rok: int, mesiac: int, max_vek: float = None, chybajuce: list = None):
+    """
+    Vráti (dáta v dlhom formáte, hash obsahu, chyba) pre jeden mesiac.
+    Uložená snímka mladšia ako `max_vek` sekúnd sa použije bez sťahovania —
+    predvolene uzavreté mesiace vždy, aktuálny mesiac do CACHE_TTL;
+    float('inf') = stiahnuť len chýbajúci mesiac, 0 = stiahnuť vždy.
+    So zoznamom `chybajuce` sa nesťahuje nikdy: uložený mesiac sa vráti
+    v akomkoľvek veku, neuložený sa pridá do zoznamu a vráti sa chyba.
+    Ak má stiahnutý hárok rovnaký hash ako uložená snímka, nič sa neparsuje.
+    Ak zdroj nie je dostupný, použije sa posledná uložená verzia
+    a chyba sa len oznámi.
+    """
+    if max_vek is None:
+        max_vek = float('inf') if je_uzavrety(rok, mesiac) else CACHE_TTL
+    oznacenie = _zdroj_mesiaca(rok, mesiac)
+    ulozene = nacitaj_mesiac_z_disku(rok, mesiac)
+    if ulozene and oznacenie and ulozene[3] != oznacenie:
+        ulozene = None   # mesiac je v nastaveniach priradený inému hárku či zdroju
+    if ulozene and (not oznacenie or ulozene[2] < max_vek or chybajuce is not None):
+        return ulozene[0], ulozene[1], None
+    if not oznacenie:
+        return None, None, None
+    if chybajuce is not None:
+        chybajuce.append((rok, mesiac))
+        return None, None, "ešte nie je v úložisku — stiahne ho obnova na pozadí"
+
+    obsah_hash, obsah, chyba = stiahni_mesiac(rok, mesiac)
+    if ulozene and not chyba and ulozene[1] == obsah_hash:
+        # Obsah sa nezmenil — snímka ostáva, len si poznačíme čas overenia
+        _OVERENE[(rok, mesiac)] = time.time()
+        return ulozene[0], obsah_hash, None
+    if not chyba:
+        try:
+            data = spracuj_mesiac(obsah_hash, obsah)
+        except ValueError as e:
+            chyba = f"hárok sa nedá spracovať: {e}"
+    if chyba:
+        if ulozene:
+            kedy = datetime.fromtimestamp(time.time() - ulozene[2]).strftime('%d.%m.%Y %H:%M')
+            return ulozene[0], ulozene[1], f"{chyba} — zobrazujem uložené dáta z {kedy}"
+        return None, None, chyba
+
+    if ulozene:
+        # Zápisy z appky, o ktoré hárok presne pribudol, odteraz počíta hárok.
+        # Vyradia sa pred uložením mesiaca — pád medzi tým ich nezapočíta dvakrát.
+        try:
+            zosulad(rok, mesiac, ulozene[0], data, vyradit=True)
+        except Exception:
+            pass   # nezosúladené zápisy ostávajú v zápisníku, výpis ukáže zosulad_mesiac
+    try:
+        uloz_mesiac_na_disk(rok, mesiac, data, obsah_hash, oznacenie)
+        if ulozene:
+            _zahod_zostatky(rok)   # zmenený mesiac mení aj prenesené konečné stavy
+    except Exception:
+        pass   # úložisko je len zrýchlenie, bez neho appka funguje ďalej
+    return data, obsah_hash, None
+
+
+@pamat(max_entries=8)
+def _spoj_mesiace(verzia: str, _casti: list):
+    """Spojené mesiace pre danú verziu dát — concat len pri zmene obsahu."""
+    return pd.concat(_casti, ignore_index=True) if _casti else dlhy_format({})
+
+
+@pamat(max_entries=128)
+def _odtlacky_lokalit(rok: int, mesiac: int, obsah_hash: str, _data) -> dict:
+    """
+    Hash riadkov každej lokality v mesiaci {lokalita: hash} — mení sa,
+    len keď sa zmenia jej riadky. Riadky sa hašujú raz pre všetky lokality.
+    """
+    riadky = pd.util.hash_pandas_object(_data, index=False).to_numpy()
+    kody = _data['Lokalita'].cat.codes.to_numpy()
+    return {lokalita: hash_obsahu(riadky[kody == i].tobytes()) for i, lokalita in enumerate(LOKALITY)}
+
+
+def mesiace_obdobia(od: tuple, do: tuple) -> list:
+    """Zoznam (rok, mesiac) od `od` po `do` vrátane."""
+    rok, mesiac = od
+    vysledok = []
+    while (rok, mesiac) <= tuple(do):
+        vysledok.append((rok, mesiac))
+        rok, mesiac = (rok + 1, 1) if mesiac == 12 else (rok, mesiac + 1)
+    return vysledok
+
+
+@meraj('nacitanie_mesiacov')
+def nacitaj_mesiace(od: tuple, do: tuple, max_vlakien: int = MAX_SUBEZNYCH_STAHOVANI,
+                    max_vek: float = None, chybajuce: list = None):
+    """
+    Načíta a spracuje dáta pre mesiace od–do (vrátane), každý ako (rok, mesiac).
+    Číta sa len z oddielov úložiska, ktorých sa obdobie týka; `max_vek`
+    a `chybajuce` sa odovzdajú nacitaj_mesiac.
+    Mesiace sa načítavajú súbežne (najviac `max_vlakien` naraz), poradie
+    výsledkov aj chýb ostáva podľa mesiacov.
+    Vráti spojené dáta v dlhom formáte, chyby a verzie dát {lokalita: hash}
+    zložené z odtlačkov mesiacov danej lokality — zmena riadkov jednej
+    lokality tak nezneplatní cache postavené nad ostatnými.
+    """
+    casti = []
+    odtlacky = {lokalita: [] for lokalita in LOKALITY}
+    chyby = []
+
+    mesiace = mesiace_obdobia(od, do)
+
+    def nacitaj(rok_mesiac):
+        return nacitaj_mesiac(*rok_mesiac, max_vek=max_vek, chybajuce=chybajuce)
+
+    if max_vlakien > 1 and len(mesiace) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_vlakien, len(mesiace))) as pool:
+            vysledky = list(pool.map(nacitaj, mesiace))
+    else:
+        vysledky = [nacitaj(m) for m in mesiace]
+
+    for (rok, mesiac), (data_m, obsah_hash, chyba) in zip(mesiace, vysledky):
+        if chyba:
+            chyby.append(f"{NAZVY_MESIACOV[mesiac]} {rok}: {chyba}")
+        if data_m is None:
+            continue
+
+        for lokalita, odtlacok in _odtlacky_lokalit(rok, mesiac, obsah_hash, data_m).items():
+            odtlacky[lokalita].append(f"{rok}-{mesiac}:{odtlacok}")
+        if not data_m.empty:
+            casti.append(data_m)
+
+    verzie = {lokalita: hash_obsahu(lokalita, *o) for lokalita, o in odtlacky.items()}
+    data = _spoj_mesiace(hash_obsahu(*verzie.values()), casti)
+
+    return data, chyby, verzie
+
+
+def sucty_lokalit(data, od=None, do=None, po_mesiacoch: bool = False) -> pd.DataFrame:
+    """
+    Súčty položiek za obdobie od–do (vrátane) pre všetky lokality jedným
+    prechodom — riadok na lokalitu (pri po_mesiacoch na lokalitu a mesiac
+    'RRRR-MM'), stĺpce POLOZKY a Prijem_celkom.
+    """
+    if od is not None or do is not None:
+        datumy = data['Datum']
+        maska = np.ones(len(data), dtype=bool)
+        if od is not None:
+            maska &= (datumy >= pd.Timestamp(od)).to_numpy()
+        if do is not None:
+            maska &= (datumy <= pd.Timestamp(do)).to_numpy()
+        data = data[maska]
+    mesiace = data['Datum'].to_numpy().astype('datetime64[M]') if po_mesiacoch else None
+    return tabulka_suctov(data['Lokalita'], data['Polozka'], presne_tony(data['Tony']), mesiace)
+
+
+def tabulka_suctov(lokality, polozky, tony, mesiace=None) -> pd.DataFrame:
+    """
+    Sčíta tony podľa lokality (a mesiaca) a položky do tabuľky s riadkom
+    na každú lokalitu (a mesiac so záznamami), stĺpce POLOZKY a Prijem_celkom.
+    Lokality a položky mimo nastavení sa vynechajú, súčty sú na kg.
+    """
+    lokalita = pd.Index(list(LOKALITY)).get_indexer(lokality)
+    polozka = pd.Index(POLOZKY).get_indexer(polozky)
+    platne = (lokalita >= 0) & (polozka >= 0)
+    riadky, riadok = pd.Index(list(LOKALITY)), lokalita
+    if mesiace is not None:
+        zoznam, mesiac = np.unique(np.asarray(mesiace), return_inverse=True)
+        if np.issubdtype(zoznam.dtype, np.datetime64):
+            zoznam = np.datetime_as_string(zoznam, unit='M')
+        riadky = pd.MultiIndex.from_product([list(LOKALITY), zoznam.astype(str)], names=['Lokalita', 'Mesiac'])
+        riadok = lokalita * len(zoznam) + mesiac.ravel()
+    k = len(POLOZKY)
+    sucty = np.bincount(riadok[platne] * k + polozka[platne], weights=np.asarray(tony, dtype=np.float64)[platne],
+                        minlength=len(riadky) * k).reshape(len(riadky), k)
+    prijem = sucty[:, [POLOZKY.index(d) for d in DODAVATELIA]].sum(axis=1)
+    return pd.DataFrame(np.round(np.column_stack([sucty, prijem]), DESATINNE_MIESTA),
+                        index=riadky, columns=POLOZKY + ['Prijem_celkom'])
+
+
+def sucty_obdobia(od: date, do: date, po_mesiacoch: bool = False, chybajuce: list = None):
+    """
+    Súčty položiek lokalít za obdobie od–do (vrátane) ako sucty_lokalit.
+    Zdroj, ktorý ich vie spočítať sám (SQLite), ich dodá bez načítania
+    mesiacov, inak sa spočítajú z mesiacov úložiska. Vráti (súčty, chyby).
+    """
+    sucty = zdroj().sucty(od, do, po_mesiacoch)
+    if sucty is not None:
+        return sucty, []
+    data, chyby, _ = nacitaj_mesiace((od.year, od.month), (do.year, do.month), chybajuce=chybajuce)
+    return sucty_lokalit(data, od, do, po_mesiacoch), chyby
+
+
+def _ulozeny_zostatok(rok: int):
+    """Uložený konečný stav roka z rok=RRRR/zostatok.json, alebo None."""
+    try:
+        ulozene = json.loads(_cesta_zostatku(rok).read_text(encoding='utf-8'))['stav']
+    except (OSError, ValueError, KeyError):
+        return None
+    return ulozene if set(ulozene) >= set(LOKALITY) else None   # inak pribudla lokalita — prepočíta sa
+
+
+def _spocitaj_konecne_stavy(rok: int, pociatocne: dict, chybajuce: list = None) -> dict:
+    """Stav k 31.12. z počiatočného stavu a pohybov roka; uzavretý rok bez chýb sa uloží."""
+    sucty, chyby = sucty_obdobia(date(rok, 1, 1), date(rok, 12, 31), chybajuce=chybajuce)
+    zmena = sucty['Prijem_celkom'] - sucty['Spotreba']
+    stav = {lokalita: poc + float(zmena[lokalita]) for lokalita, poc in pociatocne.items()}
+    for z in zapisnik().roka(rok):
+        if z['lokalita'] in stav and z['polozka'] in POLOZKY:
+            stav[z['lokalita']] += z['tony'] if z['polozka'] in DODAVATELIA else -z['tony']
+
+    if je_uzavrety(rok, 12) and not chyby:
+        obsah = json.dumps({'rok': rok, 'stav': stav}, ensure_ascii=False)
+        try:
+            _zapis_atomicky(_cesta_zostatku(rok), lambda p: p.write_text(obsah, encoding='utf-8'))
+        except OSError:
+            pass
+    return stav
+
+
+def konecne_stavy(rok: int) -> dict:
+    """
+    Stav skladu k 31.12. daného roka pre každú lokalitu.
+    Uzavretý rok sa spočíta raz a uloží do rok=RRRR/zostatok.json — ďalšie
+    roky ho preberajú ako počiatočný stav bez načítania jeho mesiacov.
+    Započíta aj zápisy z appky (zapis_pohyb).
+    """
+    return _ulozeny_zostatok(rok) or _spocitaj_konecne_stavy(rok, pociatocne_stavy(rok))
+
+
+def pociatocne_stavy(rok: int, chybajuce: list = None) -> dict:
+    """
+    Stav skladu k 1.1. daného roka — prvý rok z POCIATOCNY_STAV, ďalšie
+    prenosom. Prenáša sa cyklom od posledného uloženého konečného stavu;
+    roky po poslednom zošite nemajú pohyby a stav len preberajú.
+    `chybajuce` sa odovzdá nacitaj_mesiac.
+    """
+    stav = {lokalita: float(POCIATOCNY_STAV.get(lokalita, 0.0)) for lokalita in LOKALITY}
+    do = min(rok, max(ZOSITY) + 1)
+    od = PRVY_ROK
+    for predosly in range(do - 1, PRVY_ROK - 1, -1):
+        ulozeny = _ulozeny_zostatok(predosly)
+        if ulozeny:
+            stav, od = ulozeny, predosly + 1
+            break
+    for r in range(od, do):
+        stav = _spocitaj_konecne_stavy(r, stav, chybajuce)
+    return stav
+
+
+# ══════════════════════════════════════════════════════
+# ZDROJE DÁT
+# ══════════════════════════════════════════════════════
+
+class Zdroj(abc.ABC):
+    """
+    Odkiaľ sa berú mesiace. Každý zdroj vracia zo spracuj() dlhý formát
+    ako spracuj_data — úložisko, knihy a výpočty ďalej nevedia, odkiaľ
+    dáta prišli. Zdroj bez oznacenie alebo stiahni sa nedá vytvoriť.
+    """
+
+    nazov = "zdroja"   # do textov appky: "Načítavam dáta z …"
+
+    @abc.abstractmethod
+    def oznacenie(self, rok: int, mesiac: int):
+        """Odkiaľ mesiac pochádza (uloží sa k nemu do úložiska), None ak ho zdroj nemá."""
+
+    @abc.abstractmethod
+    def stiahni(self, rok: int, mesiac: int):
+        """Vráti (hash obsahu, obsah, chyba) — obsah je to, čo spracuje spracuj()."""
+
+    def spracuj(self, obsah) -> pd.DataFrame:
+        return spracuj_csv(obsah)
+
+    def zabudni(self, rok: int, mesiac: int):
+        """Zahodí stiahnutý mesiac z pamäte — ďalšie stiahnutie ide znova do zdroja."""
+
+    def sucty(self, od: date, do: date, po_mesiacoch: bool = False):
+        """Súčty ako sucty_lokalit spočítané priamo v zdroji, None = zdroj to nevie."""
+        return None
+
+
+class GoogleSheets(Zdroj):
+    """Hárky zošitov zo ZOSITY — každý mesiac ako CSV, alebo celý zošit ako xlsx."""
+
+    nazov = "Google Sheets"
+
+    def __init__(self, xlsx: bool = False):
+        self.xlsx = xlsx
+
+    def _harok(self, rok, mesiac):
+        zosit = ZOSITY.get(rok)
+        if not zosit or not zosit['gids'].get(mesiac):
+            return None
+        return zosit['sheet_id'], zosit['gids'][mesiac]
+
+    def oznacenie(self, rok, mesiac):
+        harok = self._harok(rok, mesiac)
+        return "/".join(harok) if harok else None
+
+    def stiahni(self, rok, mesiac):
+        """Obsah sú CSV bajty hárku, pri xlsx surový DataFrame hárku."""
+        sheet_id, gid = self._harok(rok, mesiac)
+        if self.xlsx:
+            obsah, zosit_hash, chyba = nacitaj_zosit(sheet_id)
+            if chyba:
+                return None, None, chyba
+            harky = _harky_zosita(zosit_hash, obsah)
+            if mesiac not in harky:
+                return None, None, "hárok mesiaca chýba v zošite"
+            return hash_obsahu(zosit_hash, mesiac), harky[mesiac], None
+        obsah, obsah_hash, chyba = nacitaj_z_google_sheets(sheet_id, gid)
+        return obsah_hash, obsah, chyba
+
+    def spracuj(self, obsah):
+        if isinstance(obsah, bytes):
+            return spracuj_csv(obsah)
+        return spracuj_data(obsah)
+
+    def zabudni(self, rok, mesiac):
+        harok = self._harok(rok, mesiac)
+        if harok:
+            nacitaj_z_google_sheets.zabudni(*harok)
+            nacitaj_zosit.zabudni(harok[0])
+
+
+class AdresarCSV(Zdroj):
+    """
+    CSV mesiacov v lokálnom adresári (2026/01.csv) v tvare CSV exportu
+    hárku. Súbor sa číta pri každom stiahnutí — nezmenený obsah sa podľa
+    hashu neparsuje ani neukladá znova.
+    """
+
+    nazov = "adresára CSV"
+
+    def __init__(self, adresar):
+        self.adresar = Path(adresar)
+
+    def _subor(self, rok, mesiac) -> Path:
+        return self.adresar / str(rok) / f"{mesiac:02d}.csv"
+
+    def oznacenie(self, rok, mesiac):
+        subor = self._subor(rok, mesiac)
+        return f"subor:{subor}" if subor.is_file() else None
+
+    def stiahni(self, rok, mesiac):
+        try:
+            obsah = self._subor(rok, mesiac).read_bytes()
+        except OSError as e:
+            return None, None, str(e)
+        return hash_obsahu(obsah), obsah, None
+
+
+class SQLite(Zdroj):
+    """
+    Databáza SQLite s tabuľkou pohyby (lokalita, datum 'RRRR-MM-DD',
+    polozka, tony) a indexom (lokalita, datum). Výber obdobia aj súčty
+    po lokalitách a mesiacoch robí databáza — index prečíta len riadky
+    obdobia a do pandas prídu hotové súčty. Viac riadkov s rovnakým dňom
+    a položkou sa sčíta, chýbajúce položky dňa sú nuly.
+    """
+
+    nazov = "databázy SQLite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pohyby (
+            lokalita TEXT NOT NULL,
+            datum    TEXT NOT NULL,
+            polozka  TEXT NOT NULL,
+            tony     REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS pohyby_lokalita_datum ON pohyby (lokalita, datum);
+    """
+
+    def __init__(self, cesta):
+        self.cesta = Path(cesta)
+
+    def _spojenie(self, zapis: bool = False):
+        """Nové spojenie pre každé volanie — sqlite3 spojenie nepatrí viacerým vláknam."""
+        if zapis:
+            spojenie = sqlite3.connect(self.cesta)
+            spojenie.executescript(self.SCHEMA)
+        else:
+            spojenie = sqlite3.connect(f"{self.cesta.resolve().as_uri()}?mode=ro", uri=True)
+        return contextlib.closing(spojenie)
+
+    def _dotaz(self, stlpce: str, od: str, do: str, zoskup: str = None, limit: str = ""):
+        """Riadky pohybov lokalít z LOKALITY medzi dňami od–do (text 'RRRR-MM-DD', vrátane)."""
+        sql = (f"SELECT {stlpce} FROM pohyby "
+               f"WHERE lokalita IN ({','.join('?' * len(LOKALITY))}) AND datum BETWEEN ? AND ?"
+               + (f" GROUP BY {zoskup}" if zoskup else "") + limit)
+        with self._spojenie() as db:
+            return db.execute(sql, (*LOKALITY, od, do)).fetchall()
+
+    @staticmethod
+    def _mesiac(rok, mesiac):
+        # Dátumy sa porovnávajú ako text — deň 31 uzavrie každý mesiac
+        return f"{rok:04d}-{mesiac:02d}-01", f"{rok:04d}-{mesiac:02d}-31"
+
+    def oznacenie(self, rok, mesiac):
+        try:
+            najdene = self._dotaz("1", *self._mesiac(rok, mesiac), limit=" LIMIT 1")
+        except sqlite3.Error:
+            return None
+        return f"sqlite:{self.cesta}" if najdene else None
+
+    def stiahni(self, rok, mesiac):
+        try:
+            riadky = self._dotaz("datum, lokalita, polozka, SUM(tony)", *self._mesiac(rok, mesiac),
+                                 zoskup="lokalita, datum, polozka")
+        except sqlite3.Error as e:
+            return None, None, f"databáza {self.cesta}: {e}"
+        return hash_obsahu(json.dumps(riadky)), riadky, None
+
+    def spracuj(self, riadky):
+        casti = {}
+        if riadky:
+            datum, lokalita, polozka, tony = (np.asarray(s) for s in zip(*riadky))
+            lokalita = pd.Index(list(LOKALITY)).get_indexer(lokalita)
+            polozka = pd.Index(POLOZKY).get_indexer(polozka)
+            for i, nazov in enumerate(LOKALITY):
+                vyber = (lokalita == i) & (polozka >= 0)
+                if not vyber.any():
+                    continue
+                dni, den = np.unique(datum[vyber], return_inverse=True)   # text RRRR-MM-DD sa triedi ako dátum
+                matica = np.zeros((len(dni), len(POLOZKY)))
+                matica[den, polozka[vyber]] = tony[vyber]
+                casti[nazov] = (dni.astype('datetime64[D]').astype('datetime64[us]'), matica)
+        return dlhy_format(casti)
+
+    def sucty(self, od, do, po_mesiacoch=False):
+        kluce = "lokalita, substr(datum, 1, 7), polozka" if po_mesiacoch else "lokalita, polozka"
+        try:
+            riadky = self._dotaz(f"{kluce}, SUM(tony)", od.isoformat(), do.isoformat(), zoskup=kluce)
+        except sqlite3.Error:
+            return None   # spočítajú sa z mesiacov úložiska
+        stlpce = [np.asarray(s) for s in zip(*riadky)] or [np.array([])] * (4 if po_mesiacoch else 3)
+        if po_mesiacoch:
+            lokality, mesiace, polozky, tony = stlpce
+            return tabulka_suctov(lokality, polozky, tony, mesiace)
+        return tabulka_suctov(*stlpce)
+
+    def zapis(self, data):
+        """
+        Zapíše dlhý formát (napr. mesiace z Google Sheets) do databázy —
+        dni lokalít, ktoré dáta obsahujú, sa v nej celé nahradia.
+        """
+        lokality = data['Lokalita'].astype(str).to_numpy()
+        datumy = np.datetime_as_string(data['Datum'].to_numpy(), unit='D')
+        riadky = zip(lokality, datumy, data['Polozka'].astype(str).to_numpy(),
+                     presne_tony(data['Tony']).tolist())
+        with self._spojenie(zapis=True) as db, db:
+            db.executemany("DELETE FROM pohyby WHERE lokalita = ? AND datum = ?",
+                           sorted(set(zip(lokality, datumy))))
+            db.executemany("INSERT INTO pohyby VALUES (?, ?, ?, ?)", riadky)
+
+
+# Názov zdroja v nastavení ZDROJ → zdroj (dostane ZDROJ_CESTA)
+ZDROJE = {
+    'csv': lambda cesta: GoogleSheets(),
+    'xlsx': lambda cesta: GoogleSheets(xlsx=True),
+    'adresar': AdresarCSV,
+    'sqlite': SQLite,
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _zdroj(nazov: str, cesta: str) -> Zdroj:
+    if nazov not in ZDROJE:
+        raise ValueError(f"neznámy ZDROJ '{nazov}' (možnosti: {', '.join(ZDROJE)})")
+    return ZDROJE[nazov](cesta)
+
+
+def zdroj() -> Zdroj:
+    """Zdroj podľa aktuálnych nastavení ZDROJ a ZDROJ_CESTA."""
+    return _zdroj(ZDROJ, ZDROJ_CESTA)
+
+
+# ══════════════════════════════════════════════════════
+# ZÁPISNÍK POHYBOV
+# ══════════════════════════════════════════════════════
+
+class Zapisnik:
+    """
+    Pohyby zadané v appke — zápisník (JSON riadok na pohyb), do ktorého
+    sa len pripája. Zápis je po fsync na disku skôr, ako sa prejaví
+    v snímke; rozpísaný posledný riadok po páde sa pri čítaní preskočí.
+
+    Zhutnenie presunie zápisy do úložiska zápisov (Parquet po mesiacoch)
+    a zápisník vyprázdni. Každý zápis má id — zápis, ktorý po páde
+    ostal v zápisníku aj v úložisku, sa počíta raz.
+    """
+    STLPCE = ['id', 'cas', 'lokalita', 'datum', 'polozka', 'tony']
+
+    def __init__(self, ulozisko):
+        self.subor = Path(ulozisko) / "zapisnik.jsonl"
+        self.adresar = Path(ulozisko) / "zapisy"
+        self.generacia = 0      # zvýši sa, keď sa zoznam zmení inak ako pripojením
+        self._zaznamy = []      # nezhutnené zápisy v poradí zápisu
+        self._subor_info = None   # (inode, veľkosť) súboru, z ktorého je _zaznamy
+        self._zamok = threading.RLock()
+
+    def cesta_mesiaca(self, rok: int, mesiac: int) -> Path:
+        return self.adresar / f"rok={rok}" / f"mesiac={mesiac:02d}.parquet"
+
+    def _aktualizuj(self):
+        """Načíta zápisník znova, ak ho zmenil niekto iný (iný proces, zhutnenie)."""
+        try:
+            info = self.subor.stat()
+            stav = (info.st_ino, info.st_size)
+        except OSError:
+            stav = None
+        if stav == self._subor_info:
+            return
+        zaznamy = []
+        if stav:
+            with open(self.subor, encoding='utf-8') as f:
+                for riadok in f:
+                    try:
+                        zaznamy.append(json.loads(riadok))
+                    except ValueError:
+                        pass   # rozpísaný riadok po páde
+        self._zaznamy, self._subor_info = zaznamy, stav
+        self.generacia += 1
+
+    def zaznamy(self) -> list:
+        """Nezhutnené zápisy v poradí zápisu."""
+        with self._zamok:
+            self._aktualizuj()
+            return list(self._zaznamy)
+
+    def od(self, generacia, pocet: int):
+        """
+        Zápisy pripojené od stavu (generácia, počet) — pri inej generácii
+        všetky. Vráti (generácia, počet, zápisy) naraz pod zámkom.
+        """
+        with self._zamok:
+            self._aktualizuj()
+            if generacia != self.generacia:
+                pocet = 0
+            return self.generacia, len(self._zaznamy), self._zaznamy[pocet:]
+
+    def pridaj(self, lokalita: str, datum: date, polozka: str, tony: float) -> dict:
+        """Overí a zapíše jeden pohyb; vráti zápis, až keď je na disku."""
+        if lokalita not in LOKALITY:
+            raise ValueError(f"neznáma lokalita '{lokalita}' (povolené {', '.join(LOKALITY)})")
+        if polozka not in POLOZKY:
+            raise ValueError(f"neznáma položka '{polozka}' (povolené {', '.join(POLOZKY)})")
+        tony = round(float(tony), DESATINNE_MIESTA)
+        if not np.isfinite(tony) or tony == 0:
+            raise ValueError("tony musia byť nenulové číslo (záporné opravuje skorší zápis)")
+        if not PRVY_ROK <= datum.year <= max(ZOSITY) or datum > date.today():
+            raise ValueError(f"dátum {datum.strftime('%d.%m.%Y')} je mimo evidencie")
+        zaznam = {'id': uuid.uuid4().hex, 'cas': datetime.now().isoformat(timespec='seconds'),
+                  'lokalita': lokalita, 'datum': datum.isoformat(), 'polozka': polozka, 'tony': tony}
+        riadok = (json.dumps(zaznam, ensure_ascii=False) + "\n").encode('utf-8')
+        with self._zamok:
+            self._aktualizuj()
+            self.subor.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.subor, 'a+b') as f:
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        riadok = b"\n" + riadok   # rozpísaný riadok po páde ostane osamote
+                f.write(riadok)
+                f.flush()
+                os.fsync(f.fileno())
+                info = os.fstat(f.fileno())
+            self._zaznamy.append(zaznam)
+            self._subor_info = (info.st_ino, info.st_size)
+        return zaznam
+
+    def zhutnene(self, rok: int, mesiac: int) -> list:
+        """Zápisy mesiaca, ktoré už sú v úložisku zápisov."""
+        try:
+            return pd.read_parquet(self.cesta_mesiaca(rok, mesiac)).to_dict('records')
+        except (OSError, ValueError):
+            return []
+
+    def mesiaca(self, rok: int, mesiac: int) -> list:
+        """Všetky zápisy mesiaca — zhutnené aj v zápisníku, každý raz."""
+        predpona = f"{rok}-{mesiac:02d}-"
+        return self._bez_dvojitych(self.zhutnene(rok, mesiac),
+                                   [z for z in self.zaznamy() if z['datum'].startswith(predpona)])
+
+    def roka(self, rok: int) -> list:
+        """Všetky zápisy roka — zhutnené aj v zápisníku, každý raz."""
+        zhutnene = [z for mesiac in range(1, 13) for z in self.zhutnene(rok, mesiac)]
+        return self._bez_dvojitych(zhutnene, [z for z in self.zaznamy() if z['datum'][:4] == str(rok)])
+
+    @staticmethod
+    def _bez_dvojitych(zhutnene, nezhutnene) -> list:
+        videne = {z['id'] for z in zhutnene}
+        return zhutnene + [z for z in nezhutnene if z['id'] not in videne]
+
+    def _uloz(self, rok: int, mesiac: int, zaznamy: list):
+        cesta = self.cesta_mesiaca(rok, mesiac)
+        if zaznamy:
+            df = pd.DataFrame(zaznamy, columns=self.STLPCE).drop_duplicates('id')
+            _zapis_atomicky(cesta, lambda p: df.to_parquet(p, index=False))
+        else:
+            cesta.unlink(missing_ok=True)
+
+    def _prepis(self, zaznamy: list):
+        """Nahradí zápisník zápismi `zaznamy` (atomicky)."""
+        obsah = "".join(json.dumps(z, ensure_ascii=False) + "\n" for z in zaznamy).encode('utf-8')
+        _zapis_atomicky(self.subor, lambda p: p.write_bytes(obsah))
+        self._aktualizuj()
+
+    def zhutni(self) -> list:
+        """
+        Presunie zápisy zo zápisníka do úložiska zápisov a zápisník
+        vyprázdni. Vráti zhutnené mesiace [(rok, mesiac)].
+        """
+        with self._zamok:
+            self._aktualizuj()
+            mesiace = {}
+            for z in self._zaznamy:
+                mesiace.setdefault((int(z['datum'][:4]), int(z['datum'][5:7])), []).append(z)
+            for (rok, mesiac), nove in mesiace.items():
+                self._uloz(rok, mesiac, self.zhutnene(rok, mesiac) + nove)
+            # Zápisník sa vyprázdni až po uložení — pád medzi tým zápisy nezdvojí (id)
+            if mesiace:
+                self._prepis([])
+            return sorted(mesiace)
+
+    def vyrad(self, zaznamy: list) -> int:
+        """Odstráni zápisy (podľa id) zo zápisníka aj z úložiska zápisov; vráti ich počet."""
+        idcka = {z['id'] for z in zaznamy}
+        if not idcka:
+            return 0
+        with self._zamok:
+            self._aktualizuj()
+            for rok, mesiac in {(int(z['datum'][:4]), int(z['datum'][5:7])) for z in zaznamy}:
+                zhutnene = self.zhutnene(rok, mesiac)
+                ostavaju = [z for z in zhutnene if z['id'] not in idcka]
+                if len(ostavaju) != len(zhutnene):
+                    self._uloz(rok, mesiac, ostavaju)
+            ostavaju = [z for z in self._zaznamy if z['id'] not in idcka]
+            if len(ostavaju) != len(self._zaznamy):
+                self._prepis(ostavaju)
+        return len(idcka)
+
+
+@functools.lru_cache(maxsize=None)
+def _zapisnik(ulozisko: str) -> Zapisnik:
+    return Zapisnik(ulozisko)
+
+
+def zapisnik() -> Zapisnik:
+    """Zápisník v úložisku ULOZISKO_DIR — jeden na proces."""
+    return _zapisnik(str(ULOZISKO_DIR))
+
+
+def pohyby_zapisov(zaznamy: list) -> pd.DataFrame:
+    """Zápisy v dlhom formáte (riadok na zápis a položku) — pripoja sa k mesiacom z hárkov."""
+    casti = {}
+    for lokalita in LOKALITY:
+        vlastne = [z for z in zaznamy if z['lokalita'] == lokalita and z['polozka'] in POLOZKY]
+        if vlastne:
+            matica = np.zeros((len(vlastne), len(POLOZKY)))
+            matica[np.arange(len(vlastne)), [POLOZKY.index(z['polozka']) for z in vlastne]] = \
+                [z['tony'] for z in vlastne]
+            datumy = np.array([z['datum'] for z in vlastne], dtype='datetime64[D]').astype('datetime64[us]')
+            casti[lokalita] = (datumy, matica)
+    return dlhy_format(casti)
+
+
+def so_zapismi(data, verzie: dict, zaznamy: list):
+    """Dáta a verzie lokalít z nacitaj_mesiace doplnené o zápisy — verzia sa mení len lokalitám so zápismi."""
+    if not zaznamy:
+        return data, verzie
+    data = pd.concat([data, pohyby_zapisov(zaznamy)], ignore_index=True)
+    verzie = {lokalita: hash_obsahu(v, *ids) if (ids := [z['id'] for z in zaznamy if z['lokalita'] == lokalita])
+              else v for lokalita, v in verzie.items()}
+    return data, verzie
+
+
+def zapis_pohyb(lokalita: str, datum: date, polozka: str, tony: float) -> dict:
+    """
+    Zapíše pohyb do zápisníka a hneď ho doplní do snímky jeho roka, ak
+    sa rok používa — ostatné relácie ho vidia pri ďalšom behu, bez
+    načítania mesiacov a stavby kníh.
+    """
+    zaznam = zapisnik().pridaj(lokalita, datum, polozka, tony)
+    if je_uzavrety(datum.year, 12):
+        _zahod_zostatky(datum.year)   # mení konečný stav roka aj prenesené stavy ďalších rokov
+    if datum.year in _POSLEDNE_ODTLACKY:
+        aktualna_snimka(datum.year)
+    return zaznam
+
+
+# Rozdiel, ktorý sa pri zosúladení ešte považuje za zhodu (pol kilogramu)
+TOLERANCIA_ZHODY = 0.0005
+STLPCE_ZOSULADENIA = ['Lokalita', 'Datum', 'Polozka', 'Zapisnik', 'Harok', 'Zmena_harku', 'Stav']
+
+
+def _bunky_harku(data) -> dict:
+    """Súčty hárku po bunkách {(lokalita, 'RRRR-MM-DD', položka): tony}."""
+    if data is None or data.empty:
+        return {}
+    kluce = zip(data['Lokalita'].astype(str), np.datetime_as_string(data['Datum'].to_numpy(), unit='D'),
+                data['Polozka'].astype(str))
+    sucty = {}
+    for kluc, tony in zip(kluce, presne_tony(data['Tony']).tolist()):
+        sucty[kluc] = sucty.get(kluc, 0.0) + tony
+    return sucty
+
+
+def zosulad(rok: int, mesiac: int, predtym, harok, vyradit: bool = False) -> pd.DataFrame:
+    """
+    Porovná zápisy mesiaca so zmenou hárku — medzi uloženou kópiou
+    `predtym` a novým exportom `harok` (dlhý formát, None = prázdny) —
+    po bunkách lokalita × deň × položka. Stav bunky: 'v hárku', keď hárok
+    pribudol presne o zápisy, 'chýba v hárku', keď sa nezmenil, inak
+    'rozdiel'. Pri `vyradit` sa zápisy buniek 'v hárku' vyradia —
+    odteraz ich počíta hárok.
+    """
+    bunky = {}
+    for z in zapisnik().mesiaca(rok, mesiac):
+        bunky.setdefault((z['lokalita'], z['datum'], z['polozka']), []).append(z)
+    if not bunky:
+        return pd.DataFrame(columns=STLPCE_ZOSULADENIA)
+    pred, po = _bunky_harku(predtym), _bunky_harku(harok)
+    riadky, potvrdene = [], []
+    for (lokalita, datum, polozka), zaznamy in sorted(bunky.items()):
+        zapisane = round(sum(z['tony'] for z in zaznamy), DESATINNE_MIESTA)
+        v_harku = po.get((lokalita, datum, polozka), 0.0)
+        zmena = round(v_harku - pred.get((lokalita, datum, polozka), 0.0), DESATINNE_MIESTA)
+        if abs(zmena - zapisane) < TOLERANCIA_ZHODY:
+            stav = 'v hárku'
+            potvrdene += zaznamy
+        else:
+            stav = 'chýba v hárku' if abs(zmena) < TOLERANCIA_ZHODY else 'rozdiel'
+        riadky.append([lokalita, date.fromisoformat(datum), polozka, zapisane, v_harku, zmena, stav])
+    if vyradit:
+        zapisnik().vyrad(potvrdene)
+    return pd.DataFrame(riadky, columns=STLPCE_ZOSULADENIA)
+
+
+def zosulad_mesiac(rok: int, mesiac: int):
+    """
+    Zosúladenie zápisov mesiaca s čerstvým exportom hárku proti uloženej
+    kópii — len výpis, nič nemení. Vráti (tabuľka, chyba).
+    """
+    if not _zdroj_mesiaca(rok, mesiac):
+        return None, "mesiac nemá v nastaveniach hárok"
+    ulozene = nacitaj_mesiac_z_disku(rok, mesiac)
+    zdroj().zabudni(rok, mesiac)
+    obsah_hash, obsah, chyba = stiahni_mesiac(rok, mesiac)
+    if chyba:
+        return None, chyba
+    return zosulad(rok, mesiac, ulozene[0] if ulozene else None, spracuj_mesiac(obsah_hash, obsah)), None
+
+
+# ══════════════════════════════════════════════════════
+# OBNOVA NA POZADÍ
+# ══════════════════════════════════════════════════════
+
+def aktualnost(od: tuple, do: tuple):
+    """
+    Odkedy (epoch) sú aktuálne dáta mesiacov od–do — najstarší čas overenia
+    spomedzi neuzavretých mesiacov. 0, ak niektorý z nich ešte nie je
+    v úložisku; None, len ak sú všetky mesiace uzavreté.
+    """
+    casy = [cas_overenia(rok, mesiac) or 0 for rok, mesiac in mesiace_obdobia(od, do)
+            if not je_uzavrety(rok, mesiac)]
+    return min(casy) if casy else None
+
+
+def otvorene_mesiace() -> list:
+    """Mesiace, ktoré sa ešte môžu meniť: aktuálny a neuzavreté mesiace v úložisku."""
+    dnes = date.today()
+    mesiace = {(dnes.year, dnes.month)} if _zdroj_mesiaca(dnes.year, dnes.month) else set()
+    for subor in ULOZISKO_DIR.glob("rok=*/mesiac=*.parquet"):
+        rok, mesiac = int(subor.parent.name.split('=')[1]), int(subor.stem.split('=')[1])
+        if not je_uzavrety(rok, mesiac):
+            mesiace.add((rok, mesiac))
+    return sorted(mesiace)
+
+
+def _zabudni_stiahnute(mesiace):
+    """Zahodí stiahnuté mesiace z pamäte, aby ich ďalšie načítanie stiahlo znova."""
+    for rok, mesiac in mesiace:
+        zdroj().zabudni(rok, mesiac)
+
+
+_OBNOVA = None   # bežiaca obnova na pozadí — snímky jej posielajú chýbajúce mesiace
+
+
+class Obnova:
+    """
+    Jedno vlákno na pozadí, ktoré každých `interval` sekúnd stiahne otvorené
+    mesiace a uloží ich zmeny do úložiska (stale-while-revalidate). Keď
+    zápisník narastie na ZHUTNIT_PO zápisov, zhutní ho.
+
+    Stránky čítajú len z úložiska (max_vek=inf) a na sieť nečakajú — nová
+    verzia mesiaca sa prejaví atomickým prepisom súboru. Pomalý alebo
+    nedostupný hárok zdrží len toto vlákno.
+    """
+
+    def __init__(self, interval: float = CACHE_TTL):
+        self.interval = interval
+        self.naposledy = None   # koniec poslednej obnovy (epoch)
+        self.chyby = []         # chyby poslednej obnovy
+        self._ziadosti = set()
+        self._ziadane = 0       # poradové číslo poslednej žiadosti
+        self._hotovo = 0        # žiadosti vybavené do tohto čísla
+        self._podmienka = threading.Condition()
+        self._vlakno = None
+
+    def spusti(self):
+        """Spustí vlákno (len raz); prvá obnova prebehne hneď."""
+        global _OBNOVA
+        with self._podmienka:
+            if self._vlakno is None:
+                self._vlakno = threading.Thread(target=self._beh, name="obnova-dat", daemon=True)
+                self._vlakno.start()
+        _OBNOVA = self
+        return self
+
+    def obnov(self, mesiace=None, cakat: float = None) -> bool:
+        """
+        Požiada o obnovu hneď — len zadaných `mesiace` (aj uzavretých),
+        bez nich všetkých otvorených. Ostatné mesiace a výsledky nad nimi
+        ostávajú v cache. Pri `cakat` počká najviac toľko sekúnd a vráti,
+        či obnova dobehla.
+        """
+        with self._podmienka:
+            self._ziadosti.update(mesiace or [])
+            self._ziadane += 1
+            cislo = self._ziadane
+            self._podmienka.notify_all()
+            if cakat is None:
+                return False
+            return self._podmienka.wait_for(lambda: self._hotovo >= cislo, cakat)
+
+    def _beh(self):
+        while True:
+            with self._podmienka:
+                mesiace, self._ziadosti = self._ziadosti, set()
+                cislo = self._ziadane
+            try:
+                # Cielená žiadosť obnoví len svoje mesiace, pravidelná všetky otvorené
+                self._obnov(sorted(mesiace) if mesiace else otvorene_mesiace())
+            except Exception as e:
+                self.chyby = [f"obnova zlyhala: {e}"]
+            with self._podmienka:
+                self._hotovo = max(self._hotovo, cislo)
+                self._podmienka.notify_all()
+                self._podmienka.wait_for(lambda: self._ziadane > self._hotovo, self.interval)
+
+    @meraj('obnova_na_pozadi')
+    def _obnov(self, mesiace):
+        _zabudni_stiahnute(mesiace)
+        chyby = []
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_SUBEZNYCH_STAHOVANI, len(mesiace)))) as pool:
+            vysledky = pool.map(lambda m: nacitaj_mesiac(*m, max_vek=0), mesiace)
+            for (rok, mesiac), (_, _, chyba) in zip(mesiace, vysledky):
+                if chyba:
+                    chyby.append(f"{NAZVY_MESIACOV[mesiac]} {rok}: {chyba}")
+        # Zápisník sa zhutní, keď narastie — zhutnené mesiace zmenia odtlačok roka
+        zhutnene = zapisnik().zhutni() if len(zapisnik().zaznamy()) >= ZHUTNIT_PO else []
+        obnov_snimky(rok for rok, _ in [*mesiace, *zhutnene])
+        self.chyby = chyby
+        self.naposledy = time.time()
+
+
+def denne_pohyby(data) -> pd.DataFrame:
+    """
+    Dlhý formát → denné súčty v širokom tvare: riadok na (Lokalita, Datum),
+    stĺpce POLOZKY a Prijem_celkom. Jedno zoradenie a jeden súčet po
+    skupinách pre všetky lokality v `data`.
+    """
+    lokality = data['Lokalita'].cat.codes.to_numpy()
+    datumy = data['Datum'].to_numpy()
+    poradie = np.lexsort((datumy, lokality))
+    lokality, datumy = lokality[poradie], datumy[poradie]
+    nova = np.ones(len(poradie), dtype=bool)
+    nova[1:] = (lokality[1:] != lokality[:-1]) | (datumy[1:] != datumy[:-1])
+    skupiny = np.cumsum(nova) - 1
+
+    matica = np.zeros((int(nova.sum()), len(POLOZKY)))
+    np.add.at(matica, (skupiny, data['Polozka'].cat.codes.to_numpy()[poradie]),
+              presne_tony(data['Tony'].to_numpy()[poradie]))
+    index = pd.MultiIndex.from_arrays(
+        [pd.Categorical.from_codes(lokality[nova], dtype=data['Lokalita'].dtype), datumy[nova]],
+        names=['Lokalita', 'Datum'])
+    denne = pd.DataFrame(matica, index=index, columns=POLOZKY)
+    denne['Prijem_celkom'] = functools.reduce(np.add, (matica[:, i] for i in range(len(DODAVATELIA))))
+    return denne
+
+
+def zaciatok_obdobia(datumy, zrnitost: str):
+    """Prvý deň obdobia zrnitosti (týždeň od pondelka) pre každý dátum — ako datetime64[D]."""
+    if zrnitost not in OBDOBIA:
+        raise ValueError(f"neznáma zrnitosť '{zrnitost}' (povolené {', '.join(OBDOBIA)})")
+    dni = np.asarray(datumy).astype('datetime64[D]')
+    if zrnitost == 'den':
+        return dni
+    if zrnitost == 'tyzden':
+        return dni - (dni.view('int64') + 3) % 7   # 1.1.1970 bol štvrtok
+    if zrnitost == 'rok':
+        return dni.astype('datetime64[Y]').astype('datetime64[D]')
+    mesiace = dni.astype('datetime64[M]')
+    if zrnitost == 'stvrtrok':
+        mesiace = mesiace - mesiace.view('int64') % 3
+    return mesiace.astype('datetime64[D]')
+
+
+def nazov_obdobia(zaciatok, zrnitost: str) -> str:
+    """Popis obdobia podľa jeho prvého dňa, napr. '12. týždeň 2026', 'Marec 2026', '1. štvrťrok 2026'."""
+    d = pd.Timestamp(zaciatok)
+    if zrnitost == 'den':
+        return d.strftime('%d.%m.%Y')
+    if zrnitost == 'tyzden':
+        rok, tyzden, _ = d.isocalendar()
+        return f"{tyzden}. týždeň {rok}"
+    if zrnitost == 'mesiac':
+        return f"{NAZVY_MESIACOV[d.month]} {d.year}"
+    if zrnitost == 'stvrtrok':
+        return f"{(d.month - 1) // 3 + 1}. štvrťrok {d.year}"
+    return str(d.year)
+
+
+class Kniha:
+    """
+    Kniha pohybov jednej lokality, postavená raz pre danú verziu dát.
+
+    Drží denné pohyby zoradené podľa dátumu a kumulatívne súčty každého
+    stĺpca. Súčet za ľubovoľné obdobie je tak binárne vyhľadanie dvoch
+    hraníc a jedno odčítanie — bez filtrovania celého DataFrame.
+
+    Kocka súhrnov drží pre každú zrnitosť z OBDOBIA hotové súčty stĺpcov
+    za obdobia so záznamami — týždenné, mesačné či štvrťročné prehľady
+    sú výrez z nej, nie nové zoskupovanie denných riadkov.
+    """
+    STLPCE = DODAVATELIA + ['Prijem_celkom', 'Spotreba']
+
+    def __init__(self, data, lokalita, poc, verzia=None):
+        self.lokalita = lokalita
+        self.poc = poc   # stav skladu pred prvým záznamom knihy
+        self.verzia = verzia   # verzia dát lokality z nacitaj_mesiace — kľúč pre ďalšie cache
+        # Dáta sú v dlhom formáte pre všetky lokality — kniha si vezme svoju
+        denne = denne_pohyby(data[data['Lokalita'] == lokalita])
+        # kum[c][i] = súčet prvých i záznamov, kum[c][0] = 0 — presne vo float64
+        self.kum = {}
+        for c in self.STLPCE:
+            self.kum[c] = np.concatenate([[0.0], denne[c].to_numpy().cumsum()])
+            self.kum[c].flags.writeable = False
+        # Záznamy pre tabuľky a grafy stačia v kompaktnom type
+        self.data = denne.droplevel('Lokalita').reset_index().astype({c: TYP_TON for c in self.STLPCE})
+        self.datumy = self.data['Datum'].to_numpy()
+        # Zostatok na sklade po každom zázname
+        self.zostatky = self.poc + self.kum['Prijem_celkom'][1:] - self.kum['Spotreba'][1:]
+        self.zostatky.flags.writeable = False
+        # zrnitosť → (začiatky období, hranice období v knihe, súčty stĺpcov)
+        self.kocka = {zrnitost: self._obdobia(zrnitost) for zrnitost in OBDOBIA}
+
+    def _obdobia(self, zrnitost):
+        """Obdobie k = záznamy [hranice[k], hranice[k+1]); súčty z rozdielov kumulatívnych súčtov."""
+        zaciatky = zaciatok_obdobia(self.datumy, zrnitost)
+        nove = np.ones(len(zaciatky), dtype=bool)
+        nove[1:] = zaciatky[1:] != zaciatky[:-1]
+        hranice = np.append(np.flatnonzero(nove), len(zaciatky))
+        sucty = np.column_stack([self.kum[c][hranice[1:]] - self.kum[c][hranice[:-1]]
+                                 for c in self.STLPCE]).reshape(len(hranice) - 1, len(self.STLPCE))
+        zaciatky = zaciatky[nove]
+        for pole in (zaciatky, hranice, sucty):
+            pole.flags.writeable = False
+        return zaciatky, hranice, sucty
+
+    def __len__(self):
+        return len(self.datumy)
+
+    def index(self, datum, vratane=True) -> int:
+        """Počet záznamov s dátumom <= datum (pri vratane=False < datum)."""
+        hranica = pd.Timestamp(datum).to_datetime64().astype(self.datumy.dtype)
+        return int(np.searchsorted(self.datumy, hranica, side='right' if vratane else 'left'))
+
+    def rozsah(self, od=None, do=None):
+        """Pozície [i, j) záznamov s dátumom od ≤ Datum ≤ do (vrátane oboch)."""
+        i = self.index(od, vratane=False) if od is not None else 0
+        j = self.index(do) if do is not None else len(self)
+        return i, max(i, j)
+
+    def sucty(self, od=None, do=None) -> dict:
+        """Súčty všetkých stĺpcov za obdobie od–do (vrátane)."""
+        i, j = self.rozsah(od, do)
+        return {c: float(self.kum[c][j] - self.kum[c][i]) for c in self.STLPCE}
+
+    def zostatok(self, datum, vratane=True) -> float:
+        """Stav skladu na konci dňa `datum` (pri vratane=False na jeho začiatku)."""
+        i = self.index(datum, vratane)
+        return float(self.poc + self.kum['Prijem_celkom'][i] - self.kum['Spotreba'][i])
+
+    def zaznamy(self, od=None, do=None):
+        """Záznamy za obdobie ako pohľad do knihy (bez kópie) — len na čítanie."""
+        i, j = self.rozsah(od, do)
+        return self.data.iloc[i:j]
+
+    def vyrez(self, zrnitost='mesiac', od=None, do=None):
+        """
+        Obdobia zrnitosti so záznamami v od–do ako (začiatky, súčty, hranice):
+        súčty sú riadky STLPCE za obdobie, obdobie k sú záznamy
+        [hranice[k], hranice[k+1]). Celé obdobia sú výrez z kocky, krajné
+        obdobia orezané dátumami od–do sa dopočítajú z kumulatívnych súčtov.
+        """
+        zaciatky, hranice, sucty = self.kocka[zrnitost]
+        i, j = self.rozsah(od, do)
+        a, b = 0, 0
+        if i < j:
+            a = int(np.searchsorted(hranice, i, side='right')) - 1
+            b = int(np.searchsorted(hranice, j, side='left'))
+        h = hranice[a:b + 1].copy()
+        h[0], h[-1] = i, j
+        sucty = sucty[a:b].copy()
+        for k in {0, b - a - 1} if b > a else ():
+            if h[k] != hranice[a + k] or h[k + 1] != hranice[a + k + 1]:
+                sucty[k] = [self.kum[c][h[k + 1]] - self.kum[c][h[k]] for c in self.STLPCE]
+        return zaciatky[a:b], sucty, h
+
+    def suhrny(self, zrnitost='mesiac', od=None, do=None) -> pd.DataFrame:
+        """
+        Súhrny za obdobia zrnitosti so záznamami v od–do: stĺpce STLPCE,
+        Zmena, Zostatok na konci obdobia a Dni (počet záznamov). Index je
+        prvý deň obdobia.
+        """
+        zaciatky, sucty, hranice = self.vyrez(zrnitost, od, do)
+        tab = pd.DataFrame(sucty, index=pd.Index(zaciatky, name='Obdobie'), columns=self.STLPCE)
+        tab['Zmena'] = tab['Prijem_celkom'] - tab['Spotreba']
+        tab['Zostatok'] = self.zostatky[hranice[1:] - 1]
+        tab['Dni'] = np.diff(hranice)
+        return tab
+
+    def s_pohybom(self, datum, polozka, tony, verzia=None):
+        """
+        Nová kniha s jedným pohybom navyše, táto sa nemení (držia ju iné
+        relácie). Kumulatívne súčty sa od dňa pohybu posunú o tony,
+        zostatky a kocka sa z nich prepočítajú — nič sa nenačítava ani
+        nezoskupuje, cena je daná dĺžkou knihy (rok = najviac 366 dní).
+        """
+        den = pd.Timestamp(datum).to_datetime64().astype(self.datumy.dtype)
+        p = self.index(datum, vratane=False)
+        novy_den = p == len(self) or self.datumy[p] != den
+        zmenene = {polozka} | ({'Prijem_celkom'} if polozka in DODAVATELIA else set())
+
+        kniha = copy.copy(self)
+        kniha.verzia = verzia
+        kniha.kum = {}
+        for c in self.STLPCE:
+            kum = self.kum[c]   # nezmenené stĺpce existujúceho dňa sa zdieľajú
+            if novy_den or c in zmenene:
+                kum = np.insert(kum, p + 1, kum[p]) if novy_den else kum.copy()
+                if c in zmenene:
+                    kum[p + 1:] += tony
+                kum.flags.writeable = False
+            kniha.kum[c] = kum
+        stlpce = {'Datum': np.insert(self.datumy, p, den) if novy_den else self.datumy}
+        for c in self.data.columns[1:]:
+            hodnoty = self.data[c].to_numpy()
+            if novy_den or c in zmenene:
+                hodnoty = np.insert(hodnoty, p, 0) if novy_den else hodnoty.copy()
+                hodnoty[p] = kniha.kum[c][p + 1] - kniha.kum[c][p]
+            stlpce[c] = hodnoty
+        kniha.data = pd.DataFrame(stlpce)
+        kniha.datumy = kniha.data['Datum'].to_numpy()
+        kniha.zostatky = kniha.poc + kniha.kum['Prijem_celkom'][1:] - kniha.kum['Spotreba'][1:]
+        kniha.zostatky.flags.writeable = False
+        kniha.kocka = {zrnitost: kniha._obdobia(zrnitost) for zrnitost in OBDOBIA}
+        return kniha
+
+
+@pamat(max_entries=8)
+@meraj('kniha')
+def postav_knihu(verzia: str, lokalita: str, poc: float, _data):
+    """Kniha sa stavia len pri novej verzii dát — zdieľaná, len na čítanie."""
+    return Kniha(_data, lokalita, poc, verzia)
+
+
+def _zaciatok_mesiaca(datum):
+    return date(datum.year, datum.month, 1)
+
+
+@meraj('vypocet')
+def vypocitaj(kniha, datum):
+    """
+    Vypočíta stav skladu k danému dátumu.
+    Rozdeľuje na:
+      - predchádzajúce mesiace → tvoria "počiatočný stav mesiaca"
+      - aktuálny mesiac (do vybraného dátumu) → príjem a spotreba mesiaca
+    """
+    if kniha.index(datum) == 0:
+        return None
+
+    zaciatok = _zaciatok_mesiaca(datum)
+
+    # Počiatočný stav aktuálneho mesiaca = pôvodný + predchádzajúce mesiace
+    poc_mesiac = kniha.zostatok(zaciatok, vratane=False)
+
+    # Aktuálny mesiac (do vybraného dátumu vrátane)
+    aktualny = kniha.sucty(zaciatok, datum)
+    zostatok = poc_mesiac + aktualny['Prijem_celkom'] - aktualny['Spotreba']
+
+    return {
+        'pociatocny_orig':  kniha.poc,
+        'pociatocny':       poc_mesiac,
+        'prijem_celkom':    aktualny['Prijem_celkom'],
+        'prijem_bodos':     aktualny['Bodos'],
+        'prijem_dreva':     aktualny['z Dreva HBP'],
+        'prijem_recyklacia':aktualny['Recyklácia'],
+        'prijem_jankula':   aktualny['Jankula'],
+        'spotreba_celkom':  aktualny['Spotreba'],
+        'zostatok':         zostatok,
+        'mesiac':           datum.month,
+        'data_filtered':    kniha.zaznamy(do=datum)
+    }
+
+
+@meraj('mesacne_sumare')
+def vypocitaj_mesacne_sumare(kniha, do_datumu, od_datumu=None):
+    """
+    Vypočíta súhrn pre každý mesiac (príjem, spotreba, zostatok na konci mesiaca).
+    Pri `od_datumu` začína prvým mesiacom obdobia a ten sa počíta od tohto dňa.
+    Vracia list slovníkov — mesačný výrez z kocky knihy.
+    """
+    zaciatky, sucty, hranice = kniha.vyrez('mesiac', od_datumu, do_datumu)
+    prijem = sucty[:, Kniha.STLPCE.index('Prijem_celkom')]
+    spotreba = sucty[:, Kniha.STLPCE.index('Spotreba')]
+    return [{
+        'rok': zaciatok.year,
+        'mesiac': zaciatok.month,
+        'nazov': NAZVY_MESIACOV[zaciatok.month],
+        'prijem': p,
+        'spotreba': s,
+        'zmena': p - s,
+        'zostatok': z,
+        'dni': d,
+    } for zaciatok, p, s, z, d in zip(zaciatky.tolist(), prijem.tolist(), spotreba.tolist(),
+                                      kniha.zostatky[hranice[1:] - 1].tolist(), np.diff(hranice).tolist())]
+
+
+def lttb_indexy(x, y, pocet: int):
+    """
+    Indexy `pocet` bodov radu vybraných metódou Largest-Triangle-Three-Buckets.
+    Na rozdiel od každého n-tého bodu zachová vrcholy aj prepady krivky.
+    Prvý a posledný bod ostávajú vždy; pri krátkom rade vráti všetky indexy.
+    """
+    n = len(y)
+    if pocet >= n or pocet < 3:
+        return np.arange(n)
+    x = np.asarray(x)
+    x = (x.view('int64') if x.dtype.kind == 'M' else x).astype(float)
+    y = np.asarray(y, dtype=float)
+
+    # pocet-2 košov medzi prvým a posledným bodom
+    hranice = np.linspace(1, n - 1, pocet - 1).astype(int)
+    vyber = np.empty(pocet, dtype=np.int64)
+    vyber[0], vyber[-1] = 0, n - 1
+    a = 0
+    for k in range(pocet - 2):
+        od, do = hranice[k], hranice[k + 1]
+        if k + 2 < len(hranice):
+            cx, cy = x[do:hranice[k + 2]].mean(), y[do:hranice[k + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        # Bod koša, ktorý s predošlým vybraným bodom a priemerom ďalšieho koša
+        # tvorí najväčší trojuholník
+        plochy = np.abs((x[a] - cx) * (y[od:do] - y[a]) - (x[a] - x[od:do]) * (cy - y[a]))
+        a = od + int(np.argmax(plochy))
+        vyber[k + 1] = a
+    return vyber
+
+
+# ══════════════════════════════════════════════════════
+# ZDIEĽANÁ SNÍMKA ROKA
+# ══════════════════════════════════════════════════════
+
+@functools.lru_cache(maxsize=16)
+def _subory_roka(ulozisko: Path, rok: int) -> tuple:
+    zhutnene = tuple(str(_zapisnik(str(ulozisko)).cesta_mesiaca(rok, m)) for m in range(1, 13))
+    return tuple(str(_cesta_mesiaca(rok, m)) for m in range(1, 13)) + zhutnene + (str(_cesta_zostatku(rok - 1)),)
+
+
+def _odtlacok_roka(rok: int) -> tuple:
+    """
+    (mtime, inode) mesiacov roka v úložisku, zhutnených zápisov roka a
+    konečného stavu predošlého roka — zmení sa pri každom zápise, z ktorého
+    sa skladá snímka roka. Zápisy v zápisníku pridáva aktualna_snimka.
+    """
+    odtlacok = []
+    for cesta in _subory_roka(ULOZISKO_DIR, rok):
+        try:
+            info = os.stat(cesta)
+            odtlacok.append((info.st_mtime_ns, info.st_ino))
+        except OSError:
+            odtlacok.append(None)
+    return tuple(odtlacok)
+
+
+MAX_ODPOVEDI_SNIMKY = 1024
+# Snímka, ktorej chýba mesiac, oň po toľkých sekundách znova požiada
+# obnovu na pozadí — ak sa ho predošlý raz nepodarilo stiahnuť
+CHYBNA_SNIMKA_TTL = 30
+
+
+class SnimkaRoka:
+    """
+    Načítaný rok pre jednu verziu úložiska — počiatočné stavy a kniha
+    každej lokality. Jedna inštancia na proces, zdieľaná všetkými
+    reláciami a API, len na čítanie. Pri obnove sa nemení, ale nahradí
+    novou; relácia, ktorá drží starú, ju dopočíta bez zmeny pod rukami.
+    Odpovede API sa z nej počítajú raz a pamätajú si hotové JSON bajty aj ETag.
+    Zápisy z appky, ktoré v nej už sú, drží `zapisy` (množina id).
+
+    Keď beží obnova na pozadí, snímka sa skladá len z uložených mesiacov
+    a na sieť nečaká — neuložené mesiace (aj predošlých rokov, z ktorých
+    sa prenášajú počiatočné stavy) drží `chybajuce` a stiahne ich obnova.
+    Bez nej (príkazový riadok) sa chýbajúci mesiac stiahne hneď.
+    """
+
+    def __init__(self, rok: int):
+        dnes = date.today()
+        do = min((rok, 12), (dnes.year, dnes.month))   # budúce mesiace sa nesťahujú
+        chybajuce = [] if _OBNOVA is not None else None
+        self.rok = rok
+        self.pociatocne = types.MappingProxyType(pociatocne_stavy(rok, chybajuce))
+        data, chyby, verzie = nacitaj_mesiace((rok, 1), do, max_vek=float('inf'), chybajuce=chybajuce)
+        zaznamy = zapisnik().roka(rok)
+        data, verzie = so_zapismi(data, verzie, zaznamy)
+        self.zapisy = frozenset(z['id'] for z in zaznamy)
+        self.chyby = tuple(chyby)
+        self.verzia = hash_obsahu(rok, *verzie.values(), *self.pociatocne.values())
+        pritomne = set(data['Lokalita'].unique())
+        self.knihy = types.MappingProxyType({
+            lokalita: postav_knihu(verzie[lokalita], lokalita, self.pociatocne[lokalita], data)
+            for lokalita in LOKALITY if lokalita in pritomne})
+        self._odpovede = {}   # dotaz → (ETag, telo)
+        self.chybajuce = tuple(sorted(set(chybajuce or ())))
+        self.vyziadane = float('-inf')   # kedy snímka naposledy požiadala o chýbajúce mesiace
+
+    def odpoved(self, dotaz: tuple, vypocet):
+        """(ETag, JSON bajty) pre dotaz — `vypocet(snimka)` sa volá len prvýkrát."""
+        hotova = self._odpovede.get(dotaz)
+        if hotova is None:
+            telo = json.dumps(vypocet(self), ensure_ascii=False).encode()
+            hotova = (f'"{hash_obsahu(self.verzia, *dotaz)}"', telo)
+            if len(self._odpovede) >= MAX_ODPOVEDI_SNIMKY:
+                self._odpovede.clear()
+            self._odpovede[dotaz] = hotova
+        return hotova
+
+    def s_pohybmi(self, zaznamy: list):
+        """
+        Nová snímka so zápismi navyše — knihy lokalít bez zápisov sa
+        zdieľajú, ostatné dostanú pohyby po jednom (Kniha.s_pohybom).
+        """
+        zaznamy = [z for z in zaznamy if z['lokalita'] in LOKALITY and z['polozka'] in POLOZKY]
+        knihy = dict(self.knihy)
+        for z in zaznamy:
+            lokalita = z['lokalita']
+            kniha = knihy.get(lokalita) or Kniha(dlhy_format({}), lokalita, self.pociatocne[lokalita],
+                                                 hash_obsahu(self.verzia, lokalita))
+            knihy[lokalita] = kniha.s_pohybom(date.fromisoformat(z['datum']), z['polozka'], z['tony'],
+                                              hash_obsahu(kniha.verzia, z['id']))
+        snimka = copy.copy(self)
+        snimka.knihy = types.MappingProxyType(knihy)
+        snimka.zapisy = self.zapisy | {z['id'] for z in zaznamy}
+        snimka.verzia = hash_obsahu(self.verzia, *(z['id'] for z in zaznamy))
+        snimka._odpovede = {}
+        return snimka
+
+
+@pamat(max_entries=4)
+@meraj('snimka')
+def snimka_roka(rok: int, odtlacok: tuple) -> SnimkaRoka:
+    """Snímka sa stavia len pri zmene súborov roka v úložisku — súbežní čakajú na jednu."""
+    return SnimkaRoka(rok)
+
+
+_POSLEDNE_ODTLACKY = {}   # rok → odtlačok snímky, ktorú dostávajú relácie
+_ZIVE = {}   # rok → (snímka z úložiska, generácia a počet zápisov zápisníka, snímka so zápismi)
+_ZAMOK_ZIVYCH = threading.Lock()
+
+
+def _so_zapismi_zapisnika(snimka: SnimkaRoka) -> SnimkaRoka:
+    """
+    Snímka z úložiska doplnená o zápisy zápisníka, ktoré pribudli po jej
+    postavení. Nové zápisy sa doplnia do poslednej snímky so zápismi po
+    jednom — bez načítania mesiacov a stavby kníh.
+    """
+    with _ZAMOK_ZIVYCH:
+        zaklad, generacia, pocet, ziva = _ZIVE.get(snimka.rok, (None, None, 0, None))
+        if zaklad is not snimka:
+            generacia = None
+        nova_generacia, pocet, nove = zapisnik().od(generacia, pocet)
+        if nova_generacia != generacia:
+            ziva = snimka   # zápisník sa zmenil inak ako pripojením — znova od snímky z úložiska
+        rok = str(snimka.rok)
+        nove = [z for z in nove if z['datum'][:4] == rok and z['id'] not in snimka.zapisy]
+        if nove:
+            ziva = ziva.s_pohybmi(nove)
+        _ZIVE[snimka.rok] = (snimka, nova_generacia, pocet, ziva)
+        return ziva
+
+
+def aktualna_snimka(rok: int) -> SnimkaRoka:
+    """
+    Aktuálna snímka roka aj so zápismi zápisníka. Po zmene úložiska sa
+    postaví nová a nahradí starú jedným priradením; stará sa zabudne, aby
+    v pamäti neostali dve verzie knihy. O mesiace, ktoré snímke chýbajú,
+    požiada obnovu na pozadí — znova po CHYBNA_SNIMKA_TTL sekundách, ak
+    ich predošlá obnova nestiahla. Nič sa tu nesťahuje.
+    """
+    odtlacok = _odtlacok_roka(rok)
+    snimka = snimka_roka(rok, odtlacok)
+    if any(_je_ulozeny(*m) for m in snimka.chybajuce):
+        # Mesiac predošlého roka odtlačok roka nemení — snímka sa postaví znova
+        snimka_roka.zabudni(rok, odtlacok)
+        snimka = snimka_roka(rok, odtlacok)
+    if snimka.chybajuce and _OBNOVA is not None and time.monotonic() - snimka.vyziadane > CHYBNA_SNIMKA_TTL:
+        snimka.vyziadane = time.monotonic()
+        _OBNOVA.obnov(snimka.chybajuce)
+    stary = _POSLEDNE_ODTLACKY.get(rok)
+    if stary != odtlacok:
+        _POSLEDNE_ODTLACKY[rok] = odtlacok
+        if stary is not None:
+            snimka_roka.zabudni(rok, stary)
+    return _so_zapismi_zapisnika(snimka)
+
+
+def obnov_snimky(roky):
+    """
+    Po obnove úložiska postaví nové snímky rokov, ktoré sa už používajú —
+    relácie ich dostanú hotové. Aj snímky neskorších rokov, ktoré z nich
+    preberajú počiatočné stavy.
+    """
+    roky = set(roky)
+    for rok in sorted(_POSLEDNE_ODTLACKY):
+        if roky and rok >= min(roky):
+            aktualna_snimka(rok)
+
+
+# ══════════════════════════════════════════════════════
+# JSON API
+# ══════════════════════════════════════════════════════
+
+def stav_ako_json(stav):
+    """Výsledok vypocitaj bez tabuľky záznamov — len čísla."""
+    return None if stav is None else {k: v for k, v in stav.items() if k != 'data_filtered'}
+
+
+def _parametre_api(dotaz: dict, nazov_datumu: str):
+    """
+    Lokality a dátum z dotazu (?lokalita=BC&lokalita=BH alebo BC,BH).
+    Dátum je predvolene dnes, najviac však 31.12. posledného zošita —
+    mimo evidencie je chyba len zadaný dátum.
+    """
+    lokality = [l for hodnota in dotaz.get('lokalita', []) for l in hodnota.split(',') if l]
+    nezname = [l for l in lokality if l not in LOKALITY]
+    if nezname:
+        raise ValueError(f"neznáma lokalita {', '.join(nezname)} (povolené {', '.join(LOKALITY)})")
+    texty = dotaz.get(nazov_datumu)
+    if not texty:
+        return tuple(dict.fromkeys(lokality or LOKALITY)), min(date.today(), date(max(ZOSITY), 12, 31))
+    try:
+        datum = _datum(texty[-1])
+    except argparse.ArgumentTypeError as e:
+        raise ValueError(str(e))
+    if not PRVY_ROK <= datum.year <= max(ZOSITY):
+        raise ValueError(f"rok {datum.year} je mimo evidencie ({PRVY_ROK}–{max(ZOSITY)})")
+    return tuple(dict.fromkeys(lokality or LOKALITY)), datum
+
+
+def _api_stav(lokality, datum):
+    def vypocet(snimka):
+        return {
+            'datum': datum.isoformat(),
+            'stav': {l: stav_ako_json(vypocitaj(snimka.knihy[l], datum)) if l in snimka.knihy else None
+                     for l in lokality},
+            'chyby': snimka.chyby,
+        }
+    return vypocet
+
+
+def _api_sumare(lokality, datum):
+    def vypocet(snimka):
+        return {
+            'do': datum.isoformat(),
+            'sumare': {l: vypocitaj_mesacne_sumare(snimka.knihy[l], datum) if l in snimka.knihy else []
+                       for l in lokality},
+            'chyby': snimka.chyby,
+        }
+    return vypocet
+
+
+_API = {
+    '/api/stav': ('datum', _api_stav),
+    '/api/sumare': ('do', _api_sumare),
+}
+
+
+def odpoved_api(cesta: str, dotaz: dict, if_none_match: str = None):
+    """
+    Odpoveď API ako (kód, hlavičky, telo):
+      /api/stav?lokalita=BC&datum=2026-03-15   — vypocitaj pre lokality (predvolene všetky)
+      /api/sumare?lokalita=BC&do=2026-03-15    — vypocitaj_mesacne_sumare roka po dátum
+    Čísla sa berú z predpočítanej snímky roka. Klient, ktorý pošle
+    If-None-Match s aktuálnym ETagom, dostane 304 bez tela.
+    """
+    nazov_datumu, odpoved = _API[cesta]
+    try:
+        lokality, datum = _parametre_api(dotaz, nazov_datumu)
+    except ValueError as e:
+        telo = json.dumps({'chyba': str(e)}, ensure_ascii=False).encode()
+        return 400, {'Content-Type': 'application/json; charset=utf-8'}, telo
+
+    snimka = aktualna_snimka(datum.year)
+    etag, telo = snimka.odpoved((cesta, *lokality, datum.isoformat()), odpoved(lokality, datum))
+    hlavicky = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    zhoda = if_none_match and (if_none_match.strip() == '*' or etag in
+                               (t.strip().removeprefix('W/') for t in if_none_match.split(',')))
+    _pocitaj_cache('api_etag', bool(zhoda))
+    if zhoda:
+        return 304, hlavicky, b''
+    return 200, {'Content-Type': 'application/json; charset=utf-8', **hlavicky}, telo
+
+
+def spusti_api(port: int = API_PORT, adresa: str = "127.0.0.1"):
+    """Spustí vo vlákne HTTP server s JSON API (pozri odpoved_api)."""
+    def obsluha(cesta):
+        @meraj(f'api{cesta[4:].replace("/", ".")}')
+        def obsluz(dotaz, hlavicky):
+            return odpoved_api(cesta, dotaz, hlavicky.get('If-None-Match'))
+        return obsluz
+
+    return spusti_http({cesta: obsluha(cesta) for cesta in _API}, port, adresa, nazov="api")
+
+
+# ══════════════════════════════════════════════════════
+# EXPORT
+# ══════════════════════════════════════════════════════
+
+# Zostavy exportu: kľúč → názov hárku v xlsx (CSV obsahuje jednu z nich)
+ZOSTAVY = {
+    'denne': 'Denné pohyby',
+    'mesacne': 'Mesačné súhrny',
+    'dodavatelia': 'Dodávatelia',
+}
+# CSV pre slovenský Excel: bodkočiarka, desatinná čiarka, UTF-8 s BOM
+CSV_FORMAT = {'sep': ';', 'decimal': ',', 'date_format': '%d.%m.%Y'}
+STLPCE_DENNE = ['Dátum'] + DODAVATELIA + ['Príjem spolu', 'Spotreba', 'Zostatok']
+STLPCE_MESACNE = ['Rok', 'Mesiac', 'Dní', 'Príjem [t]', 'Spotreba [t]', 'Zmena [t]', 'Zostatok [t]']
+STLPCE_DODAVATELIA = ['Rok', 'Mesiac'] + DODAVATELIA + ['Príjem spolu']
+
+
+def knihy_obdobia(lokalita: str, od: date, do: date):
+    """
+    Knihy lokality pre každý rok obdobia od–do (z predpočítaných snímok
+    rokov) a verzia obdobia — mení sa len so zmenou niektorého z rokov.
+    """
+    snimky = [aktualna_snimka(rok) for rok in range(od.year, do.year + 1)]
+    knihy = [s.knihy[lokalita] for s in snimky if lokalita in s.knihy]
+    return knihy, hash_obsahu(*(s.verzia for s in snimky))
+
+
+def _denne_casti(knihy, od, do) -> list:
+    """Denné pohyby obdobia po rokoch — časti sa zapisujú za sebou, bez spájania."""
+    casti = []
+    for kniha in knihy:
+        i, j = kniha.rozsah(od, do)
+        if i < j:
+            zaznamy = kniha.zaznamy(od, do)
+            casti.append(pd.DataFrame({
+                'Dátum': zaznamy['Datum'],
+                **{nazov: presne_tony(zaznamy[c]) for nazov, c in zip(STLPCE_DENNE[1:-1], Kniha.STLPCE)},
+                'Zostatok': kniha.zostatky[i:j],
+            }))
+    return casti or [pd.DataFrame(columns=STLPCE_DENNE)]
+
+
+def _mesacne_tabulky(knihy, od, do):
+    """Mesačné súhrny a príjem podľa dodávateľov po mesiacoch (s riadkami Spolu a Podiel)."""
+    mesacne, dodavatelia = [], []
+    for kniha in knihy:
+        tab = kniha.suhrny('mesiac', od, do)
+        for zaciatok, s in zip(tab.index, tab.to_dict('records')):
+            rok, nazov = zaciatok.year, NAZVY_MESIACOV[zaciatok.month]
+            mesacne.append([rok, nazov, s['Dni'], s['Prijem_celkom'], s['Spotreba'],
+                            s['Zmena'], s['Zostatok']])
+            dodavatelia.append([rok, nazov] + [s[d] for d in DODAVATELIA] + [s['Prijem_celkom']])
+    mesacne = pd.DataFrame(mesacne, columns=STLPCE_MESACNE)
+    dodavatelia = pd.DataFrame(dodavatelia, columns=STLPCE_DODAVATELIA)
+    if len(dodavatelia):
+        spolu = dodavatelia[DODAVATELIA + ['Príjem spolu']].sum()
+        podiel = spolu / (spolu['Príjem spolu'] or 1) * 100
+        dodavatelia.loc[len(dodavatelia)] = ['Spolu', ''] + spolu.round(2).tolist()
+        dodavatelia.loc[len(dodavatelia)] = ['Podiel [%]', ''] + podiel.round(1).tolist()
+    return mesacne, dodavatelia
+
+
+@pamat(max_entries=16)
+@meraj('export')
+def _zostav_export(verzia: str, lokalita: str, od: date, do: date, typ: str, zostava: str, _knihy):
+    """Súbor exportu pre danú verziu dát a parametre — rovnaké stiahnutie sa negeneruje znova."""
+    if typ == 'csv':
+        if zostava == 'denne':
+            casti = _denne_casti(_knihy, od, do)
+        else:
+            casti = [_mesacne_tabulky(_knihy, od, do)[zostava == 'dodavatelia']]
+        buf = io.StringIO()
+        for k, cast in enumerate(casti):
+            cast.to_csv(buf, header=k == 0, index=False, **CSV_FORMAT)
+        return ('\ufeff' + buf.getvalue()).encode('utf-8')
+
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine='openpyxl', date_format='DD.MM.YYYY',
+                        datetime_format='DD.MM.YYYY') as zosit:
+        riadok = 0
+        for cast in _denne_casti(_knihy, od, do):
+            cast.to_excel(zosit, sheet_name=ZOSTAVY['denne'], startrow=riadok,
+                          header=riadok == 0, index=False)
+            riadok += len(cast) + (riadok == 0)
+        mesacne, dodavatelia = _mesacne_tabulky(_knihy, od, do)
+        mesacne.to_excel(zosit, sheet_name=ZOSTAVY['mesacne'], index=False)
+        dodavatelia.to_excel(zosit, sheet_name=ZOSTAVY['dodavatelia'], index=False)
+    return buf.getvalue()
+
+
+def export_xlsx(lokalita: str, od: date, do: date) -> bytes:
+    """Excel so všetkými zostavami (hárok na zostavu) za obdobie od–do, aj cez viac rokov."""
+    knihy, verzia = knihy_obdobia(lokalita, od, do)
+    return _zostav_export(verzia, lokalita, od, do, 'xlsx', None, knihy)
+
+
+def export_csv(lokalita: str, od: date, do: date, zostava: str = 'denne') -> bytes:
+    """Jedna zostava (kľúč zo ZOSTAVY) ako CSV za obdobie od–do."""
+    if zostava not in ZOSTAVY:
+        raise ValueError(f"neznáma zostava '{zostava}' (povolené {', '.join(ZOSTAVY)})")
+    knihy, verzia = knihy_obdobia(lokalita, od, do)
+    return _zostav_export(verzia, lokalita, od, do, 'csv', zostava, knihy)
+
+
+# ══════════════════════════════════════════════════════
+# PRÍKAZOVÝ RIADOK
+# ══════════════════════════════════════════════════════
+
+def _datum(text: str) -> date:
+    for tvar in ('%d.%m.%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, tvar).date()
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"neplatný dátum '{text}' (DD.MM.RRRR alebo RRRR-MM-DD)")
+
+
+def _mesiac(text: str) -> tuple:
+    try:
+        kedy = datetime.strptime(text, '%Y-%m')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"neplatný mesiac '{text}' (RRRR-MM)") from None
+    return kedy.year, kedy.month
+
+
+def stav_ku_dnu(datum, lokality=None):
+    """
+    Stav skladu k dátumu pre každú lokalitu (predvolene všetky) —
+    {lokalita: vypocitaj(...) alebo None} a zoznam chýb pri načítaní.
+    Načíta len mesiace roka po vybraný dátum, spolu so zápismi z appky.
+    """
+    pociatocne = pociatocne_stavy(datum.year)
+    data, chyby, verzie = nacitaj_mesiace((datum.year, 1), (datum.year, datum.month))
+    data, verzie = so_zapismi(data, verzie, zapisnik().roka(datum.year))
+    stavy = {}
+    for lokalita in lokality or LOKALITY:
+        if not (data['Lokalita'] == lokalita).any():
+            stavy[lokalita] = None
+            continue
+        kniha = postav_knihu(verzie[lokalita], lokalita, pociatocne[lokalita], data)
+        stavy[lokalita] = vypocitaj(kniha, datum)
+    return stavy, chyby
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='evidencia.py',
+        description='Vypíše stav skladu štiepky k dátumu.')
+    parser.add_argument('datum', nargs='?', type=_datum, default=date.today(),
+                        help='DD.MM.RRRR alebo RRRR-MM-DD (predvolene dnes)')
+    parser.add_argument('--lokalita', choices=list(LOKALITY), action='append',
+                        help='len vybraná lokalita (dá sa zopakovať)')
+    parser.add_argument('--json', action='store_true', help='výstup ako JSON')
+    parser.add_argument('--metriky', action='store_true',
+                        help='na stderr vypíše časy etáp a zásahy cache (formát Prometheus)')
+    parser.add_argument('--export', metavar='SUBOR',
+                        help='zapíše zostavy lokality do .xlsx alebo jednu zostavu do .csv')
+    parser.add_argument('--od', type=_datum, help='začiatok obdobia exportu (predvolene 1.1. roka dátumu)')
+    parser.add_argument('--zostava', choices=list(ZOSTAVY), default='denne', help='zostava pre CSV export')
+    parser.add_argument('--api', type=int, metavar='PORT',
+                        help='namiesto výpisu spustí JSON API na 127.0.0.1:PORT s obnovou na pozadí')
+    parser.add_argument('--do-sqlite', metavar='DB',
+                        help='skopíruje mesiace roka po dátum z nastaveného zdroja do databázy SQLite')
+    parser.add_argument('--zhutni', action='store_true',
+                        help='presunie zápisy zo zápisníka do úložiska zápisov (keď appka nebeží)')
+    parser.add_argument('--zosulad', type=_mesiac, metavar='RRRR-MM',
+                        help='porovná zápisy mesiaca s aktuálnym hárkom (nič nemení)')
+    args = parser.parse_args(argv)
+
+    if args.zhutni:
+        mesiace = zapisnik().zhutni()
+        print(f"zhutnené mesiace: {', '.join(f'{r}-{m:02d}' for r, m in mesiace) or '—'}", file=sys.stderr)
+        return 0
+
+    if args.zosulad:
+        tabulka, chyba = zosulad_mesiac(*args.zosulad)
+        if chyba:
+            print(f"Problém s načítaním: {chyba}", file=sys.stderr)
+            return 1
+        print(tabulka.to_string(index=False) if len(tabulka) else "bez zápisov")
+        return 0
+
+    if args.do_sqlite:
+        data, chyby, _ = nacitaj_mesiace((args.datum.year, 1), (args.datum.year, args.datum.month))
+        for chyba in chyby:
+            print(f"Problém s načítaním: {chyba}", file=sys.stderr)
+        SQLite(args.do_sqlite).zapis(data)
+        print(f"{args.do_sqlite}: {len(data)} riadkov", file=sys.stderr)
+        return 1 if chyby else 0
+
+    if args.api:
+        Obnova(CACHE_TTL).spusti()
+        server = spusti_api(args.api)
+        print(f"JSON API na http://127.0.0.1:{args.api}/api/stav a /api/sumare", file=sys.stderr)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return 0
+
+    if args.export:
+        od = args.od or date(args.datum.year, 1, 1)
+        subor = Path(args.export)
+        for lokalita in args.lokalita or LOKALITY:
+            # Pri viacerých lokalitách dostane každá vlastný súbor
+            cesta = subor if args.lokalita and len(args.lokalita) == 1 else subor.with_stem(f"{subor.stem}_{lokalita}")
+            obsah = (export_csv(lokalita, od, args.datum, args.zostava) if subor.suffix.lower() == '.csv'
+                     else export_xlsx(lokalita, od, args.datum))
+            cesta.write_bytes(obsah)
+            print(f"{lokalita}: {cesta} ({len(obsah) / 1024:.1f} kB)", file=sys.stderr)
+        return 0
+
+    stavy, chyby = stav_ku_dnu(args.datum, args.lokalita)
+    for chyba in chyby:
+        print(f"Problém s načítaním: {chyba}", file=sys.stderr)
+
+    if args.json:
+        vystup = {lokalita: stav_ako_json(stav) for lokalita, stav in stavy.items()}
+        print(json.dumps({'datum': args.datum.isoformat(), 'stav': vystup}, ensure_ascii=False))
+    else:
+        for lokalita, stav in stavy.items():
+            if stav is None:
+                print(f"{lokalita}  {args.datum.strftime('%d.%m.%Y')}  bez dát")
+            else:
+                print(f"{lokalita}  {args.datum.strftime('%d.%m.%Y')}  "
+                      f"zostatok {stav['zostatok']:,.2f} t  "
+                      f"(príjem {stav['prijem_celkom']:,.2f} t, spotreba {stav['spotreba_celkom']:,.2f} t "
+                      f"za {NAZVY_MESIACOV[stav['mesiac']]})")
+    if args.metriky:
+        print(metriky_prometheus(), end='', file=sys.stderr)
+    return 1 if all(stav is None for stav in stavy.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())